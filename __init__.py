@@ -1,8 +1,8 @@
 # index.py
-from fileSelector import select_files_in_folder, select_single_file
-from validator import validate_path
-from metadata import get_metadata
-from utils import pretty_print_metadata
+from fileManager.fileSelector import select_files_in_folder, select_single_file
+from fileManager.validator import validate_path
+from fileManager.metadata import get_metadata
+from fileManager.utils import pretty_print_metadata
 
 def run_demo():
     # Example: Change these to your test paths
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Page-cache footprint and throughput of the wipe I/O modes.
+
+For each I/O mode (buffered, direct, dontneed) and strategy, a file that
+starts out uncached is overwritten and the benchmark reports MB/s, how
+much of the file is still resident in the page cache afterwards (mincore)
+and how much the host's Cached and Dirty counters grew (/proc/meminfo).
+
+    python benchmarks/bench_page_cache.py                    # 256 MB in the temp dir
+    python benchmarks/bench_page_cache.py --size 2048 --dir /srv/scratch
+    python benchmarks/bench_page_cache.py --durability final --json results.json
+
+Run it on a disk-backed filesystem: tmpfs pages *are* the file, so
+nothing can be dropped there.
+"""
+import argparse
+import contextlib
+import ctypes
+import io
+import json
+import mmap
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+MB = 1024 * 1024
+
+_libc = ctypes.CDLL(None, use_errno=True)
+_libc.mmap.restype = ctypes.c_void_p
+_libc.mmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int,
+                       ctypes.c_int, ctypes.c_long]
+_libc.munmap.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+_libc.mincore.argtypes = [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_void_p]
+
+
+# ------------------- Measuring the cache -------------------
+def resident_bytes(path):
+    """Bytes of `path` currently in the page cache (mincore on a fresh mapping)."""
+    size = os.path.getsize(path)
+    if size == 0:
+        return 0
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        addr = _libc.mmap(None, size, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            raise OSError(ctypes.get_errno(), "mmap failed")
+        try:
+            pages = -(-size // mmap.PAGESIZE)
+            vec = (ctypes.c_ubyte * pages)()
+            if _libc.mincore(addr, size, vec) != 0:
+                raise OSError(ctypes.get_errno(), "mincore failed")
+            return sum(b & 1 for b in vec) * mmap.PAGESIZE
+        finally:
+            _libc.munmap(addr, size)
+    finally:
+        os.close(fd)
+
+
+def meminfo():
+    """Cached and Dirty from /proc/meminfo, in bytes."""
+    values = {}
+    with open("/proc/meminfo") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("Cached", "Dirty"):
+                values[key] = int(rest.split()[0]) * 1024
+    return values
+
+
+def _make_uncached(path, size):
+    """Write `size` bytes, sync them and drop them from the cache."""
+    block = b"\xa5" * MB
+    with open(path, "wb") as f:
+        left = size
+        while left:
+            left -= f.write(block[:min(left, MB)])
+        f.flush()
+        os.fsync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+
+# ------------------- Running a case -------------------
+def run_case(directory, size, strategy, io_mode, passes, durability, chunk_size):
+    from wipeEngine import strategies
+    path = os.path.join(directory, f"page_cache_bench_{os.getpid()}.bin")
+    try:
+        _make_uncached(path, size)
+        before = meminfo()
+        stats = {}
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            ok = getattr(strategies, strategy)(path, passes=passes, delete=False,
+                                               chunk_size=chunk_size, durability=durability,
+                                               io_mode=io_mode, stats=stats)
+        elapsed = time.perf_counter() - start
+        after = meminfo()
+        if not ok:
+            raise RuntimeError(f"{strategy} failed in {io_mode} mode")
+        return {
+            "mb_per_s": stats["bytes_written"] / elapsed / 1e6,
+            "resident_mb": resident_bytes(path) / 1e6,
+            "cached_delta_mb": (after["Cached"] - before["Cached"]) / 1e6,
+            "dirty_delta_mb": (after["Dirty"] - before["Dirty"]) / 1e6,
+            "effective_mode": stats.get("io_mode", io_mode)
+        }
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=256, help="file size in MB")
+    parser.add_argument("--dir", default=tempfile.gettempdir(), help="disk-backed directory to test in")
+    parser.add_argument("--strategy", action="append", choices=["zero_fill", "random_fill"],
+                        help="strategies to run (default both)")
+    parser.add_argument("--passes", type=int, default=1)
+    parser.add_argument("--durability", default="pass", choices=["none", "pass", "range", "final"])
+    parser.add_argument("--chunk-size", type=int, default=4 * MB)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'case':<28} {'MB/s':>9} {'resident MB':>12} {'Cached +MB':>11} {'Dirty +MB':>10}")
+    for strategy in args.strategy or ["zero_fill", "random_fill"]:
+        for io_mode in ("buffered", "direct", "dontneed"):
+            metrics = run_case(args.dir, args.size * MB, strategy, io_mode, args.passes,
+                               args.durability, args.chunk_size)
+            name = f"{strategy}/{io_mode}"
+            if metrics["effective_mode"] != io_mode:
+                name += f"->{metrics['effective_mode']}"
+            results[name] = metrics
+            print(f"{name:<28} {metrics['mb_per_s']:9.1f} {metrics['resident_mb']:12.1f} "
+                  f"{metrics['cached_delta_mb']:11.1f} {metrics['dirty_delta_mb']:10.1f}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"size_mb": args.size, "dir": args.dir, "durability": args.durability,
+                       "results": results}, f, indent=2, sort_keys=True)
+        print(f"💾 Results saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
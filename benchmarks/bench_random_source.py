@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Compare random-data throughput of the original os.urandom path against the
+keystream backends available on this host.
+
+    python benchmarks/bench_random_source.py [--mib 256] [--chunk 1048576]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wipeEngine.randomSource import KeystreamSource, OSRandomSource
+
+
+def measure(source, total, chunk):
+    """Fill `total` bytes in `chunk`-sized pieces; return bytes/s."""
+    buf = memoryview(bytearray(chunk))
+    start = time.perf_counter()
+    done = 0
+    while done < total:
+        source.fill(buf)
+        done += chunk
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mib", type=int, default=256, help="data generated per source")
+    parser.add_argument("--chunk", type=int, default=1024 * 1024, help="chunk size in bytes")
+    args = parser.parse_args()
+    total = args.mib * 1024 * 1024
+
+    sources = [OSRandomSource()]
+    for backend in KeystreamSource.BACKENDS:
+        try:
+            sources.append(KeystreamSource(backend=backend))
+        except ValueError:
+            print(f"⚠️ {backend}: not available on this host")
+
+    baseline = None
+    for source in sources:
+        rate = measure(source, total, args.chunk)
+        baseline = baseline or rate
+        print(f"{source.name:<22} {rate / 1e6:10.1f} MB/s  ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmarks for the wipe strategies and WipeEngine.
+
+Runs a matrix of workloads (tiny files through multi-GB files, chunk sizes,
+pass counts, tmpfs vs. disk) and reports MB/s, files/s, peak RSS and CPU
+time. Each case runs in its own process so peak RSS belongs to that case.
+
+    python benchmarks/bench_wipe.py                       # quick profile
+    python benchmarks/bench_wipe.py --profile full        # adds 1-4 GB files
+    python benchmarks/bench_wipe.py --save benchmarks/baselines/host.json
+    python benchmarks/bench_wipe.py --compare benchmarks/baselines/host.json --threshold 0.15
+
+With --compare the exit status is 1 when any case is slower (MB/s or
+files/s) or uses more memory than the baseline by more than --threshold.
+benchmarks/baselines/reference.json is the quick profile on a 1-CPU VM;
+compare against it for a rough check, or save a baseline for your own host.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+KB = 1024
+MB = 1024 * KB
+GB = 1024 * MB
+
+# ------------------- Matrix -------------------
+# (workload, strategy, file size, file count, chunk size, passes)
+QUICK = [
+    ("engine", "zero_fill", 4 * KB, 500, 1 * MB, 1),
+    ("engine", "random_fill", 256 * KB, 64, 1 * MB, 1),
+    ("file", "zero_fill", 64 * MB, 1, 64 * KB, 1),
+    ("file", "zero_fill", 64 * MB, 1, 1 * MB, 1),
+    ("file", "zero_fill", 64 * MB, 1, 4 * MB, 3),
+    ("file", "random_fill", 64 * MB, 1, 1 * MB, 1),
+    ("file", "random_fill", 64 * MB, 1, 1 * MB, 3),
+    ("file", "doD_wipe", 64 * MB, 1, 1 * MB, 3),
+    ("file", "gutmann_wipe", 16 * MB, 1, 1 * MB, 35),
+]
+FULL = QUICK + [
+    ("engine", "zero_fill", 4 * KB, 10000, 1 * MB, 1),
+    ("engine", "doD_wipe", 16 * MB, 32, 1 * MB, 3),
+    ("file", "zero_fill", 1 * GB, 1, 1 * MB, 1),
+    ("file", "random_fill", 1 * GB, 1, 4 * MB, 1),
+    ("file", "doD_wipe", 1 * GB, 1, 4 * MB, 3),
+    ("file", "zero_fill", 4 * GB, 1, 4 * MB, 1),
+]
+PROFILES = {"quick": QUICK, "full": FULL}
+
+# Metrics where bigger is better / smaller is better
+HIGHER_IS_BETTER = ("mb_per_s", "files_per_s")
+LOWER_IS_BETTER = ("peak_rss_mb",)
+
+
+def default_dirs():
+    """Temp dirs to run in: tmpfs (if present) and the disk-backed temp dir."""
+    dirs = {"disk": tempfile.gettempdir()}
+    if os.path.isdir("/dev/shm"):
+        dirs["tmpfs"] = "/dev/shm"
+    return dirs
+
+
+def case_name(case, fs):
+    workload, strategy, size, count, chunk, passes = case
+    return f"{workload}/{strategy}/{fs}/{_fmt(size)}x{count}/chunk={_fmt(chunk)}/passes={passes}"
+
+
+def _fmt(n):
+    for unit, scale in (("G", GB), ("M", MB), ("K", KB)):
+        if n >= scale and n % scale == 0:
+            return f"{n // scale}{unit}"
+    return str(n)
+
+
+# ------------------- Running a case -------------------
+def _make_files(folder, size, count):
+    """Create `count` files of `size` bytes of real (non-sparse) data."""
+    block = b"\xa5" * min(size, MB)
+    paths = []
+    for i in range(count):
+        path = os.path.join(folder, f"f{i:06d}.bin")
+        with open(path, "wb") as f:
+            left = size
+            while left:
+                n = f.write(block[:min(left, len(block))])
+                left -= n
+        paths.append(path)
+    return paths
+
+
+def run_case(case, base_dir, repeat):
+    """Run one case `repeat` times in this (child) process; keep the fastest."""
+    from wipeEngine import strategies
+    from wipeEngine.engine import WipeEngine
+
+    workload, strategy, size, count, chunk, passes = case
+    func = getattr(strategies, strategy)
+    key = {"zero_fill": "1", "random_fill": "2", "doD_wipe": "3", "gutmann_wipe": "4"}[strategy]
+    best = None
+    for _ in range(repeat):
+        folder = tempfile.mkdtemp(prefix="wipe_bench_", dir=base_dir)
+        try:
+            paths = _make_files(folder, size, count)
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            start = time.perf_counter()
+            # Strategies print one line per pass; keep them out of the timings
+            with contextlib.redirect_stdout(io.StringIO()):
+                if workload == "engine":
+                    # Journal next to the tree, not in the current directory
+                    engine = WipeEngine(key, passes=passes, chunk_size=chunk, generate_report=False,
+                                        journal_file=folder + ".jsonl")
+                    engine.wipe_folder(folder, delete=True)
+                else:
+                    for path in paths:
+                        func(path, passes=passes, delete=True, chunk_size=chunk)
+            elapsed = time.perf_counter() - start
+            after = resource.getrusage(resource.RUSAGE_SELF)
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+            if os.path.exists(folder + ".jsonl"):
+                os.remove(folder + ".jsonl")
+        if best is None or elapsed < best["elapsed"]:
+            cpu = (after.ru_utime - usage.ru_utime) + (after.ru_stime - usage.ru_stime)
+            best = {"elapsed": elapsed, "cpu_s": cpu}
+    written = size * count * passes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        peak //= 1024   # bytes there, KiB on Linux
+    return {
+        "mb_per_s": written / best["elapsed"] / 1e6,
+        "files_per_s": count / best["elapsed"],
+        "peak_rss_mb": peak / 1024,
+        "cpu_s": best["cpu_s"],
+        "elapsed_s": best["elapsed"]
+    }
+
+
+def run_isolated(case, base_dir, repeat):
+    """Run a case in a fresh process so ru_maxrss is its own peak."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_case, case, base_dir, repeat).result()
+
+
+# ------------------- Baselines -------------------
+def compare(results, baseline, threshold):
+    """Return a list of regression messages (empty when everything is within threshold)."""
+    regressions = []
+    for name, metrics in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for key in HIGHER_IS_BETTER:
+            if old.get(key) and metrics[key] < old[key] * (1 - threshold):
+                regressions.append(f"{name}: {key} {metrics[key]:.1f} < baseline {old[key]:.1f}")
+        for key in LOWER_IS_BETTER:
+            if old.get(key) and metrics[key] > old[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {metrics[key]:.1f} > baseline {old[key]:.1f}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--fs", action="append", help="temp dir kind to use: tmpfs, disk (default both)")
+    parser.add_argument("--disk-dir", help="disk-backed directory (default: the system temp dir)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is kept")
+    parser.add_argument("--save", help="write results as a JSON baseline")
+    parser.add_argument("--compare", help="baseline JSON to check the results against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed relative regression before failing (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    dirs = default_dirs()
+    if args.disk_dir:
+        dirs["disk"] = args.disk_dir
+    if args.fs:
+        dirs = {k: v for k, v in dirs.items() if k in args.fs}
+
+    results = {}
+    print(f"{'case':<62} {'MB/s':>9} {'files/s':>9} {'RSS MB':>8} {'CPU s':>7}")
+    for fs, base_dir in dirs.items():
+        for case in PROFILES[args.profile]:
+            name = case_name(case, fs)
+            if args.filter not in name:
+                continue
+            _, _, size, count, _, _ = case
+            if shutil.disk_usage(base_dir).free < size * count * 1.1:
+                print(f"⚠️ {name}: skipped, not enough space in {base_dir}")
+                continue
+            metrics = run_isolated(case, base_dir, args.repeat)
+            results[name] = metrics
+            print(f"{name:<62} {metrics['mb_per_s']:9.1f} {metrics['files_per_s']:9.1f} "
+                  f"{metrics['peak_rss_mb']:8.1f} {metrics['cpu_s']:7.2f}")
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as f:
+            json.dump({
+                "machine": {"host": platform.node(), "python": platform.python_version(),
+                            "cpus": os.cpu_count()},
+                "results": results
+            }, f, indent=2, sort_keys=True)
+        print(f"💾 Baseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for message in regressions:
+            print(f"❌ {message}")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No regression beyond {args.threshold:.0%} against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,33 @@ DEFAULT_CONFIG = {
     "passes": 3,                    # how many times to overwrite
     "logging": True,                # enable/disable logging
     "log_file": "deletion.log",     # default log file
-    "confirmation_required": True   # ask before wiping
+    "confirmation_required": True,  # ask before wiping
+    "workers": 4,                   # global cap on files wiped at once
+    "per_device_workers": None,     # concurrent files per device (null = 1 on HDDs, 4 on SSD/NVMe)
+    "durability": "pass",           # none | pass | range | final (see wipeEngine/durability.py)
+    "verify": "sampled",            # read-back check: full | sampled | tail | null (off)
+    "verify_percent": 10,           # share of chunks checked in "sampled" mode
+    "checkpoint_file": None,        # resume journal for interrupted runs (null = in the state dir)
+    "queue_depth": None,            # random buffers generated ahead of the writer (null = device profile)
+    "extent_policy": "extents",     # extents (skip holes of sparse files) | full
+    "chunk_size": None,             # bytes per write (null = device profile, else 1 MiB)
+    "device_profiles": {},          # calibrated chunk size / queue depth per device (wipeEngine/autotune.py); not measured while I/O limits are set
+    "metrics_sinks": [],            # e.g. ["jsonl:wipe_metrics.jsonl", "prom:/var/lib/node_exporter/wipe.prom"]
+    "profile": None,                # null | cprofile | tracemalloc around each run
+    "progress_interval": 1.0,       # seconds between console progress lines
+    "classification_cache": "classification_cache.json",  # categories memoised by (dev, ino, mtime, size);
+                                    # a relative name lives in the state dir, null disables it
+    "daemon_socket": None,          # wipectl.py socket (null = $XDG_RUNTIME_DIR or temp dir)
+    "symlink_policy": "unlink",     # skip | unlink (remove the link only) | follow (also wipe the target)
+    "custom_scheme": [],            # strategy 5 pass list, e.g. ["0x00", "complement", "random", "verify"]
+    "io_mode": "buffered",          # buffered | direct (O_DIRECT, else dontneed) | dontneed (drop synced pages)
+    "max_bytes_per_sec": None,      # I/O budget shared by all workers, e.g. "50M" (null = unlimited)
+    "max_ops_per_sec": None,        # write/read calls per second (null = unlimited)
+    "io_windows": [],               # only wipe in these daily windows, e.g. ["22:00-06:00"] or
+                                    # [{"time": "09:00-18:00", "bytes_per_sec": "10M"}]
+    "ioprio": None,                 # ionice class: idle | best-effort[:0-7] | realtime[:0-7]
+    "manifest_spill_threshold": 1000000,  # scans of more files keep their manifest in a mapped file
+    "manifest_spill_dir": None      # where that file goes (null = temp dir)
 }
 
 class ConfigManager:
@@ -1,7 +1,7 @@
 # metadata.py
 import os
-import mimetypes
 import time
+from wipeEngine.classifier import classify
 
 def get_metadata(path):
     """
@@ -11,14 +11,17 @@ def get_metadata(path):
         return {"path": path, "exists": False}
 
     stat = os.stat(path)
+    is_file = os.path.isfile(path)
+    category, mime = classify(path) if is_file else ("Directory", "directory")
     info = {
         "path": path,
         "exists": True,
-        "is_file": os.path.isfile(path),
+        "is_file": is_file,
         "is_dir": os.path.isdir(path),
-        "size": os.path.getsize(path) if os.path.isfile(path) else None,
+        "size": stat.st_size if is_file else None,
         "permissions": oct(stat.st_mode)[-3:],  # e.g. '644'
         "last_modified": time.ctime(stat.st_mtime),
-        "type": mimetypes.guess_type(path)[0] if os.path.isfile(path) else "directory"
+        "type": mime,
+        "category": category
     }
     return info
@@ -1,5 +1,11 @@
 # utils.py
-import subprocess, binascii
+import os
+import random
+import zlib
+
+EVIDENCE_WINDOWS = 4        # head + tail + random offsets
+EVIDENCE_WINDOW_SIZE = 64   # bytes per window
+EVIDENCE_BUDGET = 256       # hard cap on bytes read per file
 
 def pretty_print_metadata(meta):
     """
@@ -9,15 +15,44 @@ def pretty_print_metadata(meta):
     for key, value in meta.items():
         print(f"  {key}: {value}")
     print("-" * 40)
+def _pread(fd, length, offset):
+    if hasattr(os, "pread"):
+        return os.pread(fd, length, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.read(fd, length)
+
+def sample_evidence(file_path, windows=EVIDENCE_WINDOWS, window_size=EVIDENCE_WINDOW_SIZE,
+                    budget=EVIDENCE_BUDGET):
+    """
+    Read a few fixed-size windows (head, tail, then random offsets) in-process.
+    Never reads more than `budget` bytes. Random offsets are seeded from the
+    path, so before/after samples of the same file line up.
+    Returns a list of {"label", "offset", "hex"} dicts.
+    """
+    windows = max(0, min(windows, budget // max(1, window_size)))
+    fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        size = os.fstat(fd).st_size
+        span = max(0, size - window_size)
+        offsets = [("head", 0), ("tail", span)]
+        rng = random.Random(zlib.crc32(os.fsencode(file_path)))
+        while len(offsets) < windows:
+            offsets.append(("random", rng.randint(0, span)))
+
+        samples = []
+        seen = set()
+        for label, offset in offsets[:windows]:
+            if offset in seen:
+                continue    # small files: head, tail and randoms overlap
+            seen.add(offset)
+            data = _pread(fd, window_size, offset)
+            samples.append({"label": label, "offset": offset, "hex": data.hex(" ")})
+        return samples
+    finally:
+        os.close(fd)
+
 def hexdump(file_path, label, length=64):
+    """Print sampled windows of a file (bounded; no external xxd)"""
     print(f"\n--- {label} ---")
-    try:
-        output = subprocess.check_output(["xxd", file_path]).decode()
-        print(output)
-    except Exception:
-        with open(file_path, "rb") as f:
-            data = f.read(length)
-            hex_data = binascii.hexlify(data).decode()
-            print(" ".join(hex_data[i:i+2] for i in range(0, len(hex_data), 2)))
-            if len(data) == length:
-                print("... (truncated)")
\ No newline at end of file
+    for sample in sample_evidence(file_path, window_size=length):
+        print(f"{sample['offset']:08x} [{sample['label']}] {sample['hex']}")
@@ -3,10 +3,15 @@ import os
 import platform
 import sys
 from configManager.configManager import ConfigManager
-from fileManager.utils import hexdump
+from fileManager.utils import sample_evidence
 from wipeEngine.engine import WipeEngine
-from wipeEngine.strategies import AVAILABLE_STRATEGIES
-from wipeEngine.reportGenerator import PDFReport
+from wipeEngine.autotune import profile_for
+from wipeEngine.metrics import Metrics, make_sinks
+from wipeEngine.governor import make_governor
+from wipeEngine.checkpoint import CheckpointJournal
+from wipeEngine.stateDir import state_path
+from wipeEngine.strategies import AVAILABLE_STRATEGIES, register_custom
+from wipeEngine.reportGenerator import PDFReport, row_status
 
 # ------------------- Helpers -------------------
 def normalize_path(user_path: str) -> str:
@@ -58,14 +63,107 @@ def main():
     print(f"   Selected path for cleaning: {target_path}")
     return target_path
 
+def write_report(final_report, strategy_name, target_path, journal_file):
+    """Print each result row and render the PDF from the run's journal"""
+    failed = 0
+    for f in final_report:
+        status = row_status(f)
+        failed += status == "Failed"
+        print(f"[{status}] {f['category']} | {f['path']} | {f['size']} bytes | sync {f['sync_time']:.3f}s"
+              + (f" | verified {f['verify_rate'] / 1e6:.0f} MB/s" if f["verified"] else ""))
+
+    PDFReport(output_file="wipe_report.pdf", journal_file=journal_file).finalize(
+        strategy=strategy_name, target_path=target_path)
+    if failed:
+        print(f"\n⚠️ Wiping finished with {failed} failed file(s); see the report")
+    else:
+        print("\n✅ Wiping completed successfully!")
+    print("📄 PDF report generated: wipe_report.pdf")
+
+def governor_from(cfg):
+    """IOGovernor from the I/O budget settings, or None to wipe at full speed"""
+    return make_governor(cfg.get_option("max_bytes_per_sec"), cfg.get_option("max_ops_per_sec"),
+                         cfg.get_option("io_windows"), cfg.get_option("ioprio"))
+
+def calibrate_devices(engine, manifest, cfg):
+    """Calibrate every device in the manifest that has no saved profile yet"""
+    if engine.governor is not None:
+        # Calibration writes flat out; a throttled or windowed host keeps the defaults
+        print("⏱️ I/O limits configured: skipping device calibration")
+        return
+    seen = set()
+    for f in manifest:
+        if f["dev"] in seen:
+            continue
+        seen.add(f["dev"])
+        if profile_for(engine.device_profiles, f["dev"]) is not None:
+            continue
+        try:
+            engine.calibrate(os.path.dirname(f["path"]) or ".")
+        except OSError as e:
+            print(f"⚠️ Calibration skipped: {e}")
+            continue
+        cfg.update_option("device_profiles", engine.device_profiles)
+
+def cache_path(cfg):
+    """Classification cache file; relative names live in the per-user state dir"""
+    name = cfg.get_option("classification_cache")
+    if not name or os.path.isabs(name):
+        return name
+    return state_path(name)
+
+def checkpoint_path(cfg):
+    """Configured checkpoint file, else one in the per-user state dir"""
+    return cfg.get_option("checkpoint_file") or state_path("wipe_checkpoint.jsonl")
+
+def offer_resume(cfg):
+    """If the last run was interrupted, offer to continue it. True if resumed."""
+    checkpoint_file = checkpoint_path(cfg)
+    if not os.path.exists(checkpoint_file):
+        return False
+    state = CheckpointJournal.load(checkpoint_file)
+    if state["settings"] is None or state["complete"]:
+        return False
+    settings = state["settings"]
+    print(f"\n♻️ An interrupted wipe of {settings['root']} was found "
+          f"({len(state['done'])} files finished).")
+    if input("Resume it? (y/n): ").strip().lower() != "y":
+        return False
+    engine = WipeEngine(
+        settings["strategy_key"],
+        workers=cfg.get_option("workers"),
+        per_device_workers=cfg.get_option("per_device_workers"),
+        verify=cfg.get_option("verify"),
+        verify_percent=cfg.get_option("verify_percent"),
+        queue_depth=cfg.get_option("queue_depth"),
+        device_profiles=dict(cfg.get_option("device_profiles") or {}),
+        metrics=Metrics(make_sinks(cfg.get_option("metrics_sinks"))),
+        profile=cfg.get_option("profile"),
+        progress_interval=cfg.get_option("progress_interval"),
+        classification_cache=cache_path(cfg),
+        manifest_spill_threshold=cfg.get_option("manifest_spill_threshold"),
+        manifest_spill_dir=cfg.get_option("manifest_spill_dir"),
+        governor=governor_from(cfg),
+        generate_report=False
+    )
+    final_report = engine.resume(checkpoint_file, evidence_func=sample_evidence)
+    write_report(final_report, engine.strategy_name, settings["root"], engine.last_journal)
+    return True
+
 # ------------------- Main Execution -------------------
 if __name__ == "__main__":
     try:
+        # 0️⃣ Load Config and offer to resume an interrupted run
+        cfg = ConfigManager()
+        if cfg.get_option("custom_scheme"):
+            register_custom(cfg.get_option("custom_scheme"))
+        if offer_resume(cfg):
+            sys.exit(0)
+
         # 1️⃣ Get target path
         target_path = main()
 
-        # 2️⃣ Load Config
-        cfg = ConfigManager()
+        # 2️⃣ Show Config
         print("\n📂 Current Configuration:")
         print(cfg.config)
 
@@ -75,7 +173,7 @@ if __name__ == "__main__":
             print(f"  {key}. {name}")
 
         while True:
-            choice = input("Enter your choice [1-3]: ").strip()
+            choice = input(f"Enter your choice [1-{len(AVAILABLE_STRATEGIES)}]: ").strip()
             if choice in AVAILABLE_STRATEGIES:
                 strategy_name, strategy_func = AVAILABLE_STRATEGIES[choice]
                 print(f"✅ Selected: {strategy_name}")
@@ -83,8 +181,9 @@ if __name__ == "__main__":
             else:
                 print("❌ Invalid choice. Try again.")
 
-        # 4️⃣ Ask for number of passes if not DoD
-        if strategy_name != "DoD Wipe (3-pass)":
+        # 4️⃣ Ask for number of passes unless the scheme fixes them (DoD, Gutmann, custom)
+        fixed = getattr(strategy_func, "patterns", None)
+        if not fixed:
             while True:
                 try:
                     passes = int(input("🔢 Enter number of passes (default 3): ").strip() or 3)
@@ -96,55 +195,79 @@ if __name__ == "__main__":
                 except ValueError:
                     print("❌ Invalid number, try again")
         else:
-            passes = 3  # DoD is fixed
-            cfg.update_option("passes", passes)
+            passes = len(fixed)
+            print(f"🔢 {strategy_name} always writes {passes} passes")
 
-        chunk_size = cfg.get_option("chunk_size") or 1024*1024
+        chunk_size = cfg.get_option("chunk_size")  # None: per-device profile
 
         print("\n📂 Updated Configuration:")
         print(cfg.config)
         print("\nOverwrite method:", strategy_name)
-        print(f"Passes: {passes}, Chunk size: {chunk_size} bytes")
+        print(f"Passes: {passes}, Chunk size: {chunk_size or 'auto'} bytes, "
+              f"Durability: {cfg.get_option('durability')}, I/O: {cfg.get_option('io_mode') or 'buffered'}")
 
-        # 5️⃣ Initialize WipeEngine with passes and chunk_size
-        engine = WipeEngine(choice, passes=passes, chunk_size=chunk_size)
+        # 5️⃣ Initialize WipeEngine with passes, chunk_size and worker pool
+        engine = WipeEngine(
+            choice,
+            passes=passes,
+            chunk_size=chunk_size,
+            workers=cfg.get_option("workers"),
+            per_device_workers=cfg.get_option("per_device_workers"),
+            durability=cfg.get_option("durability"),
+            verify=cfg.get_option("verify"),
+            verify_percent=cfg.get_option("verify_percent"),
+            queue_depth=cfg.get_option("queue_depth"),
+            extent_policy=cfg.get_option("extent_policy") or "extents",
+            device_profiles=dict(cfg.get_option("device_profiles") or {}),
+            metrics=Metrics(make_sinks(cfg.get_option("metrics_sinks"))),
+            profile=cfg.get_option("profile"),
+            progress_interval=cfg.get_option("progress_interval"),
+            classification_cache=cache_path(cfg),
+            manifest_spill_threshold=cfg.get_option("manifest_spill_threshold"),
+            manifest_spill_dir=cfg.get_option("manifest_spill_dir"),
+            symlink_policy=cfg.get_option("symlink_policy"),
+            io_mode=cfg.get_option("io_mode") or "buffered",
+            governor=governor_from(cfg),
+            generate_report=False  # PDFReport below renders the report once
+        )
 
         # 6️⃣ Scan folder and show files
         report = engine.scan_folder(target_path)
         print("\n📊 Files detected for wiping:")
         for f in report:
-            print(f"[{f['category']}] {f['path']} - {f['size']} bytes")
+            sparse = f" ({f['allocated']} allocated)" if f["allocated"] < f["size"] else ""
+            print(f"[{f['category']}] {f['path']} - {f['size']} bytes{sparse}")
+            for alias in f.get("aliases", ()):
+                print(f"    🔗 {alias['path']} ({alias['link']}, overwritten once)")
+        for link in report.symlinks:
+            print(f"[Symlink] {link['path']} -> {link['target']} ({report.symlink_policy})")
+        print(f"Total: {report.total_size} bytes, {report.total_allocated} allocated on disk")
+        if report.spilled:
+            print(f"🗂️ Manifest of {len(report)} files is kept in a memory-mapped file")
+        if report.alias_count:
+            print(f"Inode index: {report.alias_count} extra links, "
+                  f"{report.bytes_saved * passes} bytes not rewritten")
 
         # 7️⃣ Confirm wipe
         confirm = input("\nDo you want to proceed with wiping? (y/n): ").lower()
-        pdf_report = PDFReport(output_file="wipe_report.pdf")
 
         if confirm == "y":
+            if chunk_size is None:
+                calibrate_devices(engine, report, cfg)
+            # Reuse the scan manifest: no second walk, same files as listed
             final_report = engine.wipe_folder(
-                target_path,
+                report,
                 strategy_func=strategy_func,
                 delete=False,  # keep file for after-wipe check
-                hexdump_func=hexdump
+                evidence_func=sample_evidence,  # bounded before/after samples for the report
+                checkpoint_file=checkpoint_path(cfg)
             )
-
-            # Log each file to PDFReport
-            for f in final_report:
-                status = "Success" if f["deleted"] else "Wiped (Kept)"
-                pdf_report.log_file(
-                    file_path=f['path'],
-                    size=f['size'],
-                    status=status,
-                    strategy=strategy_name
-                )
-                print(f"[{status}] {f['category']} | {f['path']} | {f['size']} bytes")
-
-            pdf_report.finalize(strategy=strategy_name, target_path=target_path)
-            print("\n✅ Wiping completed successfully!")
-            print("📄 PDF report generated: wipe_report.pdf")
+            write_report(final_report, strategy_name, target_path, engine.last_journal)
 
         else:
             print("\n⚠️ Wipe canceled by user.")
 
     except KeyboardInterrupt:
         print("\n\n⚠️ Interrupted by user. Exiting safely...")
+        print("♻️ Progress is checkpointed; run again to resume.")
         sys.exit(0)
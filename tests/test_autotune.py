@@ -0,0 +1,28 @@
+import os
+from wipeEngine.engine import WipeEngine
+
+
+def test_calibrated_profile_is_used(tmp_path):
+    engine = WipeEngine("1", generate_report=False)
+    st_dev = os.stat(tmp_path).st_dev
+    assert engine.tuning(st_dev) == (1024 * 1024, 3)
+
+    key, profile = engine.calibrate(str(tmp_path), sample_bytes=2 * 1024 * 1024,
+                                    chunk_sizes=(64 * 1024, 256 * 1024), queue_depths=(1, 2))
+    assert os.listdir(tmp_path) == []
+    assert profile["chunk_size"] in (64 * 1024, 256 * 1024)
+
+    # A later run only gets the saved profiles (e.g. from config.json)
+    later = WipeEngine("1", generate_report=False, device_profiles={key: profile})
+    assert later.tuning(st_dev) == (profile["chunk_size"], profile["queue_depth"])
+    pinned = WipeEngine("1", chunk_size=4096, generate_report=False, device_profiles={key: profile})
+    assert pinned.tuning(st_dev)[0] == 4096
+
+
+def test_calibration_leaves_stdout_alone(tmp_path, capsys):
+    import sys
+    from wipeEngine.autotune import calibrate
+    stdout = sys.stdout
+    calibrate(str(tmp_path), sample_bytes=256 * 1024, chunk_sizes=(64 * 1024,), queue_depths=(1,))
+    # No process-wide redirect: other threads keep printing to the real stream
+    assert sys.stdout is stdout and capsys.readouterr().out == ""
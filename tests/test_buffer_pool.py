@@ -0,0 +1,81 @@
+import mmap
+import os
+import threading
+import time
+from wipeEngine import bufferPool, strategies
+from wipeEngine.bufferPool import BufferPool, tile_pattern
+
+
+def test_tile_pattern_repeats_multi_byte_patterns():
+    buf = bytearray(10)
+    tile_pattern(memoryview(buf), b"\x01\x02\x03")
+    assert bytes(buf) == b"\x01\x02\x03" * 3 + b"\x01"
+
+
+def test_filled_buffer_is_reused_without_refilling(monkeypatch):
+    pool = BufferPool(buffer_size=1000, max_buffers=4)
+    assert pool.buffer_size == mmap.PAGESIZE
+    filled = pool.acquire(b"\xff")
+    assert filled[:4] == b"\xff" * 4
+    random_buf = pool.acquire()
+    pool.release(random_buf)    # holds random data: untagged
+    pool.release(filled, b"\xff")
+
+    fills = []
+    monkeypatch.setattr(bufferPool, "tile_pattern", lambda view, pattern: fills.append(pattern))
+    assert pool.acquire(b"\xff") is filled and fills == []
+    # Another pattern takes a free buffer and fills it
+    other = pool.acquire(b"\x00")
+    assert other is random_buf and fills == [b"\x00"]
+    assert pool._created == 2
+
+
+def test_acquire_blocks_at_max_buffers():
+    pool = BufferPool(buffer_size=4096, max_buffers=2)
+    held = [pool.acquire(), pool.acquire()]
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(b"\x00")))
+    waiter.start()
+    time.sleep(0.05)
+    assert got == [] and waiter.is_alive()
+    released = held.pop()
+    pool.release(released)
+    waiter.join(timeout=2)
+    assert got == [released] and pool._created == 2
+
+
+def test_acquire_many_takes_the_whole_set_at_once():
+    pool = BufferPool(buffer_size=4096, max_buffers=3)
+    single = pool.acquire()
+    taken = []
+    waiter = threading.Thread(target=lambda: taken.extend(pool.acquire_many(3)))
+    waiter.start()
+    time.sleep(0.05)
+    # Two buffers could be created, but none is taken until all three are available
+    assert taken == [] and pool._created == 1
+    pool.release(single)
+    waiter.join(timeout=2)
+    assert len(taken) == 3 and len({id(b) for b in taken}) == 3
+    assert pool._created == 3 and pool._free == []
+    # Requests beyond the pool size are capped instead of waiting forever
+    for buf in taken:
+        pool.release(buf)
+    assert len(pool.acquire_many(10)) == 3
+
+
+def test_tail_view_writes_exact_size_and_is_released(tmp_path):
+    target = tmp_path / "data.bin"
+    target.write_bytes(b"S" * 10000)
+    pool = BufferPool(buffer_size=4096, max_buffers=1)
+    fd = os.open(target, os.O_WRONLY)
+    try:
+        with pool.buffer(b"\xaa") as buf:
+            view = buf[:4096]
+            calls = strategies._write_pass(fd, 10000, view)
+            view.release()    # would raise BufferError if the tail view were still exported
+    finally:
+        os.close(fd)
+    assert calls == 3
+    assert target.read_bytes() == b"\xaa" * 10000
+    # The buffer went back to the pool and is handed out again
+    assert len(pool._free) == 1 and pool.acquire(b"\xaa")[:1] == b"\xaa"
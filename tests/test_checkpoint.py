@@ -0,0 +1,102 @@
+import os
+import pytest
+from wipeEngine import strategies
+from wipeEngine.checkpoint import CheckpointJournal
+from wipeEngine.engine import WipeEngine
+
+
+def make_tree(tmp_path):
+    root = tmp_path / "tree"
+    root.mkdir()
+    for i in range(3):
+        (root / f"f{i}.txt").write_bytes(b"SECRET" * 1000)
+    return root
+
+
+def test_interrupted_run_resumes(tmp_path):
+    root = make_tree(tmp_path)
+    checkpoint = str(tmp_path / "checkpoint.jsonl")
+    engine = WipeEngine("1", passes=2, workers=1, generate_report=False,
+                        journal_file=str(tmp_path / "journal.jsonl"))
+    calls = []
+
+    def flaky(path, **options):
+        calls.append(path)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        return strategies.zero_fill(path, **options)
+
+    with pytest.raises(KeyboardInterrupt):
+        engine.wipe_folder(str(root), strategy_func=flaky, delete=False, checkpoint_file=checkpoint)
+
+    state = CheckpointJournal.load(checkpoint)
+    assert state["done"] == {str(root / "f0.txt")}
+    assert state["partial"] == {}
+    assert not state["complete"]
+
+    rows = WipeEngine("2", workers=1, generate_report=False,
+                      journal_file=str(tmp_path / "journal.jsonl")).resume(checkpoint)
+    assert sorted(r["path"] for r in rows) == [str(root / "f1.txt"), str(root / "f2.txt")]
+    assert all(r["wiped"] for r in rows)
+    for i in range(3):
+        assert (root / f"f{i}.txt").read_bytes() == bytes(6000)
+    # A run that completed without failures leaves no checkpoint behind
+    assert not os.path.exists(checkpoint)
+
+
+def test_pass_resumes_at_durable_offset(tmp_path):
+    target = tmp_path / "big.bin"
+    seen = []
+
+    # Durable prefix already holds the pass pattern: only the rest is written
+    target.write_bytes(bytes(8192) + b"SECRET" * 2000)
+    assert strategies.zero_fill(str(target), passes=2, delete=False, chunk_size=4096,
+                                start_pass=1, start_offset=8192,
+                                progress=lambda p, o: seen.append((p, o)))
+    assert target.read_bytes() == bytes(20192)
+    assert seen[-1] == (2, 0)
+
+    # Prefix does not match the pass pattern: the pass restarts at offset 0
+    stats = {}
+    target.write_bytes(b"\xff" * 8192 + b"SECRET" * 2000)
+    assert strategies.zero_fill(str(target), passes=2, delete=False, chunk_size=4096,
+                                start_pass=1, start_offset=8192, stats=stats)
+    assert target.read_bytes() == bytes(20192)
+    assert stats["bytes_written"] == 20192
+
+
+def test_default_policy_records_mid_pass_offsets(tmp_path, monkeypatch):
+    from wipeEngine import durability
+    monkeypatch.setattr(durability, "DURABLE_WINDOW", 8192)
+    target = tmp_path / "big.bin"
+    target.write_bytes(b"SECRET" * 5000)
+    seen = []
+    assert strategies.zero_fill(str(target), passes=2, delete=False, chunk_size=4096,
+                                durability="pass", progress=lambda p, o: seen.append((p, o)))
+    # Every synced window is a resume point, then the pass end
+    assert seen == [(0, 8192), (0, 16384), (0, 24576), (1, 0),
+                    (1, 8192), (1, 16384), (1, 24576), (2, 0)]
+
+    # Without a checkpoint the pass is synced once at its end, as before
+    syncs = []
+    monkeypatch.setattr(durability, "_sync_file_range", lambda *args: syncs.append(args) or 0)
+    assert strategies.zero_fill(str(target), passes=2, delete=False, chunk_size=4096,
+                                durability="pass")
+    assert syncs == []
+
+
+def test_checkpoint_kept_only_when_files_failed(tmp_path):
+    root = make_tree(tmp_path)
+    checkpoint = str(tmp_path / "ckpt.jsonl")
+    engine = WipeEngine("1", workers=1, generate_report=False, small_file_limit=0,
+                        journal_file=str(tmp_path / "journal.jsonl"))
+
+    def failing(path, **options):
+        return not path.endswith("f1.txt") and strategies.zero_fill(path, **options)
+
+    engine.wipe_folder(str(root), strategy_func=failing, delete=False, checkpoint_file=checkpoint)
+    state = CheckpointJournal.load(checkpoint)
+    assert state["complete"] and str(root / "f1.txt") not in state["done"]
+
+    engine.wipe_folder(str(root), delete=False, checkpoint_file=checkpoint)
+    assert not os.path.exists(checkpoint)
@@ -0,0 +1,28 @@
+import os
+from wipeEngine import classifier
+from wipeEngine.classifier import ClassificationCache
+from wipeEngine.manifest import build_manifest
+
+
+def test_magic_beats_extension_and_cache_skips_sniffing(tmp_path, monkeypatch):
+    cache_file = str(tmp_path / "cache.json")
+    tree = tmp_path / "tree"
+    tree.mkdir()
+    (tree / "photo.dat").write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 32)
+    (tree / "report.docx").write_bytes(b"PK\x03\x04" + b"\x00" * 32)
+    (tree / "notes").write_bytes("plain text, ünïcode".encode())
+    (tree / "blob").write_bytes(b"\x00\x01\x02\x03")
+    (tree / "script.py").write_text("print('hi')\n")
+
+    manifest = build_manifest(str(tree), workers=2, cache=ClassificationCache(cache_file))
+    got = {os.path.basename(e["path"]): e["category"] for e in manifest}
+    assert got == {"photo.dat": "Image", "report.docx": "Document", "notes": "Text",
+                   "blob": "Other", "script.py": "Code"}
+    assert manifest[2]["mime"] == "image/png"   # sorted: blob, notes, photo.dat, ...
+
+    # Unchanged files come from the cache without opening them again
+    monkeypatch.setattr(classifier, "_read_header", lambda path: 1 / 0)
+    cache = ClassificationCache(cache_file)
+    manifest = build_manifest(str(tree), workers=2, cache=cache)
+    assert {os.path.basename(e["path"]): e["category"] for e in manifest} == got
+    assert cache.hits == 5 and cache.misses == 0
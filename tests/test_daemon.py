@@ -0,0 +1,127 @@
+import os
+import threading
+import time
+from wipeEngine.daemon import RPCError, WipeClient, WipeDaemon
+from wipeEngine.governor import IOGovernor
+
+
+def _tree(path, files, size=6000):
+    path.mkdir()
+    for i in range(files):
+        (path / f"f{i}.txt").write_bytes(b"s" * size)
+    return path
+
+
+def _start(daemon):
+    daemon._dispatcher = threading.Thread(target=daemon._dispatch, daemon=True)
+    daemon._dispatcher.start()
+    return daemon
+
+
+def test_submit_and_wait_over_socket(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    for i in range(3):
+        (data / f"f{i}.txt").write_bytes(b"secret" * 1000)
+    sock = str(tmp_path / "d.sock")
+    daemon = WipeDaemon(socket_path=sock, workers=2, defaults={"durability": "none"})
+    server = threading.Thread(target=daemon.serve_forever, daemon=True)
+    server.start()
+    while not os.path.exists(sock):
+        time.sleep(0.01)
+    assert oct(os.stat(sock).st_mode & 0o777) == "0o600"
+
+    with WipeClient(sock, timeout=30) as client:
+        job = client.submit(str(data), strategy="2", passes=2, verify="full", delete=True)
+        events = []
+        result = client.wait(job["job_id"], on_event=events.append)
+        assert result["state"] == "done" and result["files_done"] == 3
+        assert result["bytes_written"] == 3 * 2 * 6000
+        kinds = [e.get("state") or e["event"] for e in events]
+        assert kinds == ["queued", "running", "scanned", "file", "file", "file", "done"]
+        assert os.listdir(data) == []
+        try:
+            client.submit(str(data), options_typo=True)
+        except RPCError as e:
+            assert "Unknown options" in str(e)
+        else:
+            raise AssertionError("bad option accepted")
+        assert client.call("throttle", bytes_per_sec="20M")["limits"] == {
+            "bytes_per_sec": 20 * 1024 * 1024, "ops_per_sec": None}
+        assert daemon.governor.bytes.rate == 20 * 1024 * 1024
+        assert client.call("shutdown") is True
+    server.join(10)
+    assert not server.is_alive() and not os.path.exists(sock)
+    # The temp state dir the daemon made for job journals goes with it
+    assert not os.path.exists(daemon.state_dir)
+
+
+def test_files_kept_by_default_and_finished_jobs_pruned(tmp_path):
+    state = tmp_path / "state"
+    state.mkdir()
+    daemon = _start(WipeDaemon(workers=1, state_dir=str(state), max_finished=1,
+                               defaults={"durability": "none"}))
+    first = daemon.submit(str(_tree(tmp_path / "a", 3)), passes=1)
+    events = []
+    assert daemon._wait(daemon.jobs[first["job_id"]], events.append)["state"] == "done"
+    assert sum(e["params"]["event"] == "file" for e in events) == 3
+    assert sorted(os.listdir(tmp_path / "a")) == ["f0.txt", "f1.txt", "f2.txt"]
+
+    # Finished and unwatched: only the state events are kept, counters stay
+    job = daemon.jobs[first["job_id"]]
+    assert [e["event"] for e in job.events] == ["state", "state", "scanned", "state"]
+    assert job.summary()["files_done"] == 3
+    assert os.listdir(state) == [f"job-{job.id}.jsonl"]
+
+    second = daemon.submit(str(_tree(tmp_path / "b", 1)), passes=1, options={"delete": True})
+    daemon._wait(daemon.jobs[second["job_id"]], lambda message: None)
+    daemon.stop()
+    assert list(daemon.jobs) == [second["job_id"]]
+    assert os.listdir(state) == [f"job-{second['job_id']}.jsonl"]
+    assert os.listdir(tmp_path / "b") == []
+
+
+def test_cancel_stops_running_job(tmp_path):
+    data = _tree(tmp_path / "data", 20)
+    daemon = _start(WipeDaemon(workers=1, state_dir=str(tmp_path), governor=IOGovernor(ops_per_sec=20),
+                               defaults={"durability": "none", "small_file_limit": 0}))
+    job = daemon.submit(str(data), passes=1, options={"delete": True})
+
+    def send(message):
+        if message["params"]["event"] == "file":
+            assert daemon.cancel(job["job_id"]) is True
+
+    result = daemon._wait(daemon.jobs[job["job_id"]], send)
+    daemon.stop()
+    assert result["state"] == "cancelled" and 1 <= result["files_done"] < 20
+    assert len(os.listdir(data)) == 20 - result["files_done"]
+    assert daemon.cancel(job["job_id"]) is False
+
+
+def test_symlink_policy_from_defaults_and_per_job(tmp_path):
+    outside = tmp_path / "outside.txt"
+    outside.write_bytes(b"keep me")
+    daemon = _start(WipeDaemon(workers=1, state_dir=str(tmp_path),
+                               defaults={"durability": "none", "symlink_policy": "skip"}))
+    for name, options, kept in (("a", {}, True), ("b", {"symlink_policy": "unlink"}, False)):
+        data = _tree(tmp_path / name, 1)
+        (data / "link").symlink_to(outside)
+        job = daemon.submit(str(data), passes=1, options=dict(options, delete=True))
+        assert daemon._wait(daemon.jobs[job["job_id"]], lambda message: None)["state"] == "done"
+        assert os.listdir(data) == (["link"] if kept else [])
+    daemon.stop()
+    assert outside.read_bytes() == b"keep me"
+
+
+def test_cancel_only_reaches_the_run_in_progress(tmp_path):
+    from wipeEngine.engine import WipeEngine
+    engine = WipeEngine("1", passes=1, generate_report=False, durability="none",
+                        journal_file=str(tmp_path / "j.jsonl"))
+    # Sent while idle (e.g. racing a job's end): the next run is unaffected
+    assert engine.cancel() is False
+    assert len(engine.wipe_folder(str(_tree(tmp_path / "a", 3)), delete=False)) == 3
+    # A caller-owned event set before the run starts stops every file
+    stop = threading.Event()
+    stop.set()
+    assert len(engine.wipe_folder(str(tmp_path / "a"), delete=False, cancel_event=stop)) == 0
+    assert len(engine.wipe_folder(str(tmp_path / "a"), delete=False)) == 3
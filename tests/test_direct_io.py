@@ -0,0 +1,33 @@
+import pytest
+from wipeEngine import strategies
+
+SIZE = 5 * 4096 + 123   # the tail is not block-aligned
+
+
+@pytest.mark.parametrize("io_mode", ["buffered", "direct", "dontneed"])
+def test_io_modes_write_every_byte(tmp_path, io_mode):
+    target = tmp_path / "secret.bin"
+    target.write_bytes(b"S" * SIZE)
+    stats = {}
+    assert strategies.zero_fill(str(target), passes=2, delete=False, chunk_size=8192,
+                                verify="full", io_mode=io_mode, stats=stats)
+    assert target.read_bytes() == bytes(SIZE)
+    assert stats["verified"] is True
+    if io_mode == "direct":
+        # Filesystems without O_DIRECT fall back to dropping synced pages
+        assert stats["io_mode"] in ("direct", "dontneed")
+        if stats["io_mode"] == "direct":
+            assert stats["unaligned_bytes"] == 2 * 123
+    else:
+        assert stats["io_mode"] == io_mode
+
+
+def test_direct_multi_byte_pattern(tmp_path):
+    target = tmp_path / "secret.bin"
+    target.write_bytes(b"S" * SIZE)
+    func = strategies.scheme_strategy("Test", ["random", "0x924924", "verify"])
+    stats = {}
+    assert func(str(target), delete=False, chunk_size=16384, io_mode="direct",
+                queue_depth=2, stats=stats)
+    assert stats["verified"] is True
+    assert target.read_bytes() == (b"\x92\x49\x24" * SIZE)[:SIZE]
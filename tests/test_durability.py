@@ -0,0 +1,79 @@
+import os
+import time
+import pytest
+from wipeEngine import durability, strategies
+from wipeEngine.durability import FINAL, NONE, PER_PASS, RANGE, Syncer
+from wipeEngine.engine import WipeEngine
+
+
+@pytest.fixture
+def syncs(monkeypatch):
+    """Count fdatasync/fsync and sync_file_range calls instead of making them."""
+    calls = {"datasync": 0, "range": []}
+
+    def fake_datasync(fd):
+        time.sleep(0.001)   # so sync_time is measurably non-zero
+        calls["datasync"] += 1
+
+    monkeypatch.setattr(os, "fdatasync", fake_datasync, raising=False)
+    monkeypatch.setattr(os, "fsync", fake_datasync)
+    monkeypatch.setattr(durability, "_sync_file_range",
+                        lambda fd, offset, length, flags: calls["range"].append((offset, length)) or 0)
+    return calls
+
+
+@pytest.mark.parametrize("policy, datasyncs", [(NONE, 0), (PER_PASS, 3), (FINAL, 1), (RANGE, 3)])
+def test_policies_sync_as_documented(tmp_path, syncs, policy, datasyncs):
+    target = tmp_path / "f.bin"
+    target.write_bytes(b"S" * 10000)
+    stats = {}
+    assert strategies.zero_fill(str(target), passes=3, delete=False, chunk_size=4096,
+                                durability=policy, stats=stats)
+    assert syncs["datasync"] == datasyncs
+    # The 64 MiB window is never reached: RANGE flushes the written range at each pass end
+    assert syncs["range"] == ([(0, 10000)] * 3 if policy == RANGE else [])
+    assert (stats["sync_time"] > 0) == (policy != NONE)
+
+
+def test_range_windows_and_fallback(tmp_path, syncs, monkeypatch):
+    fd = os.open(tmp_path / "f.bin", os.O_CREAT | os.O_WRONLY)
+    try:
+        syncer = Syncer(fd, RANGE, window=4096)
+        for offset in range(0, 10000, 2048):
+            syncer.wrote(offset, min(2048, 10000 - offset))
+        syncer.end_pass()
+        assert syncs["range"] == [(0, 4096), (4096, 4096), (8192, 1808)]
+        assert syncs["datasync"] == 1
+        assert syncer.syncs == 4 and len(syncer.latencies) == 4
+
+        # Recorded resume points are flushed past the drive cache: fdatasync
+        durable = []
+        syncer = Syncer(fd, RANGE, window=4096, on_durable=durable.append)
+        for offset in range(0, 10000, 2048):
+            syncer.wrote(offset, min(2048, 10000 - offset))
+        syncer.end_pass()
+        assert durable == [4096, 8192, 10000] and len(syncs["range"]) == 3
+        assert syncs["datasync"] == 1 + 3 + 1
+
+        # Without sync_file_range (non-Linux) each window becomes a datasync
+        monkeypatch.setattr(durability, "_sync_file_range", None)
+        syncer = Syncer(fd, RANGE, window=4096)
+        for offset in range(0, 10000, 2048):
+            syncer.wrote(offset, min(2048, 10000 - offset))
+        syncer.end_pass()
+        assert syncs["datasync"] == 5 + 3 + 1
+    finally:
+        os.close(fd)
+    with pytest.raises(ValueError):
+        Syncer(0, "sometimes")
+
+
+def test_sync_time_reaches_report_rows(tmp_path, syncs):
+    folder = tmp_path / "tree"
+    folder.mkdir()
+    (folder / "a.bin").write_bytes(b"S" * 300000)
+    engine = WipeEngine("1", passes=2, durability=PER_PASS, generate_report=False,
+                        small_file_limit=0, journal_file=str(tmp_path / "j.jsonl"))
+    rows = list(engine.wipe_folder(str(folder), delete=False))
+    assert syncs["datasync"] == 2
+    assert rows[0]["sync_time"] > 0
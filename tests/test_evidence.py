@@ -0,0 +1,68 @@
+from fileManager.utils import EVIDENCE_BUDGET, hexdump, sample_evidence
+
+
+def _read(samples):
+    return sum(len(bytes.fromhex(s["hex"])) for s in samples)
+
+
+def test_budget_caps_bytes_read(tmp_path):
+    target = tmp_path / "big.bin"
+    target.write_bytes(bytes(range(256)) * 64)
+    samples = sample_evidence(str(target), windows=10, window_size=100)
+    assert len(samples) == EVIDENCE_BUDGET // 100 and _read(samples) <= EVIDENCE_BUDGET
+    assert [s["label"] for s in samples] == ["head", "tail"]
+    assert samples[1]["offset"] == 16384 - 100
+    assert sample_evidence(str(target), window_size=EVIDENCE_BUDGET + 1) == []
+
+
+def test_small_file_is_read_once(tmp_path):
+    target = tmp_path / "small.txt"
+    target.write_bytes(b"tiny secret")
+    samples = sample_evidence(str(target))
+    assert samples == [{"label": "head", "offset": 0, "hex": b"tiny secret".hex(" ")}]
+    (tmp_path / "empty").write_bytes(b"")
+    assert sample_evidence(str(tmp_path / "empty")) == [{"label": "head", "offset": 0, "hex": ""}]
+
+
+def test_random_windows_are_seeded_by_path(tmp_path):
+    a, b = tmp_path / "a.bin", tmp_path / "b.bin"
+    for path in (a, b):
+        path.write_bytes(bytes(1024 * 1024))
+    first = sample_evidence(str(a))
+    assert [s["label"] for s in first] == ["head", "tail", "random", "random"]
+    # Same path, same windows: before/after samples line up even after a rewrite
+    a.write_bytes(b"\xff" * (1024 * 1024))
+    again = sample_evidence(str(a))
+    assert [s["offset"] for s in again] == [s["offset"] for s in first]
+    assert all(set(bytes.fromhex(s["hex"])) == {0xff} for s in again)
+    assert [s["offset"] for s in sample_evidence(str(b))] != [s["offset"] for s in first]
+
+
+def test_hexdump_format(tmp_path, capsys):
+    target = tmp_path / "f.txt"
+    target.write_bytes(b"0123456789abcdef" * 8)
+    hexdump(str(target), "Before wipe", length=16)
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[:3] == ["", "--- Before wipe ---",
+                         "00000000 [head] " + b"0123456789abcdef".hex(" ")]
+    assert lines[3] == "00000070 [tail] " + b"0123456789abcdef".hex(" ")
+    # Random windows that land on the head or tail are read only once
+    assert len(lines) <= 2 + 4 and all(" [random] " in line for line in lines[4:])
+
+
+def test_file_gone_before_wipe_fails_its_row_only(tmp_path):
+    from wipeEngine.engine import WipeEngine
+    folder = tmp_path / "tree"
+    folder.mkdir()
+    for name in ("a.txt", "b.txt", "big.bin"):
+        (folder / name).write_bytes(b"secret" * 20000)
+    engine = WipeEngine("1", passes=1, generate_report=False, journal_file=str(tmp_path / "j.jsonl"))
+    for limit in (0, 1024 * 1024):    # single-file path and small-file batches
+        engine.small_file_limit = limit
+        manifest = engine.scan_folder(str(folder))
+        (folder / "b.txt").unlink()
+        rows = {r["path"].rsplit("/", 1)[-1]: r for r in
+                engine.wipe_folder(manifest, delete=False, evidence_func=sample_evidence)}
+        assert not rows["b.txt"]["wiped"] and rows["b.txt"]["evidence_before"] is None
+        assert rows["a.txt"]["wiped"] and rows["a.txt"]["evidence_before"]
+        (folder / "b.txt").write_bytes(b"secret")
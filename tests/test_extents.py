@@ -0,0 +1,56 @@
+import os
+from wipeEngine import strategies
+from wipeEngine.extents import allocated_size, data_extents
+
+MB = 1024 * 1024
+
+
+def make_sparse(tmp_path):
+    """1 MiB of data, a 6 MiB hole, then 1 MiB of data."""
+    path = str(tmp_path / "sparse.img")
+    with open(path, "wb") as f:
+        f.write(b"A" * MB)
+        f.seek(7 * MB)
+        f.write(b"B" * MB)
+    return path
+
+
+def test_extent_wipe_keeps_holes(tmp_path):
+    path = make_sparse(tmp_path)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        extents = data_extents(fd, 8 * MB)
+    finally:
+        os.close(fd)
+    assert extents[0][0] == 0 and extents[-1][1] == 8 * MB
+
+    stats = {}
+    assert strategies.random_fill(path, passes=2, delete=False, chunk_size=256 * 1024,
+                                  extent_policy="extents", verify="full", stats=stats)
+    assert stats["verified"] is True
+    data = open(path, "rb").read()
+    assert b"A" * 64 not in data and b"B" * 64 not in data
+    if len(extents) > 1:
+        # Filesystem reports holes: they must not have been filled in
+        assert stats["bytes_written"] < 2 * 8 * MB
+        assert allocated_size(os.stat(path)) < 8 * MB
+
+    assert strategies.zero_fill(path, delete=False, extent_policy="full", verify="full", stats=stats)
+    assert stats["bytes_written"] == 8 * MB
+
+
+def test_progress_counts_allocated_data_of_sparse_files(tmp_path, capsys):
+    from wipeEngine.engine import WipeEngine
+    folder = tmp_path / "tree"
+    folder.mkdir()
+    make_sparse(folder)
+    (folder / "plain.bin").write_bytes(b"P" * MB)
+    engine = WipeEngine("1", passes=2, generate_report=False, progress_interval=float("inf"),
+                        journal_file=str(tmp_path / "j.jsonl"))
+    manifest = engine.scan_folder(str(folder))
+    assert manifest.total_data == sum(min(e["size"], e["allocated"]) for e in manifest)
+    assert manifest.total_data <= manifest.total_size
+    engine.wipe_folder(manifest, delete=False)
+    last = capsys.readouterr().out.strip().splitlines()[-1]
+    if manifest.total_data < manifest.total_size:
+        assert "(100.0%)" in last
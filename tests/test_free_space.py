@@ -0,0 +1,40 @@
+import os
+import shutil
+import subprocess
+import pytest
+from wipeEngine.engine import WipeEngine
+from wipeEngine.freeSpace import FILLER_DIR
+
+
+def test_fills_down_to_reserve_and_cleans_up(tmp_path):
+    engine = WipeEngine("1", passes=1, workers=2, chunk_size=64*1024, generate_report=False)
+    # Reserve all but ~4 MiB so the test only writes a few megabytes
+    reserve = shutil.disk_usage(tmp_path).free - 4 * 1024 * 1024
+    result = engine.wipe_free_space(str(tmp_path), reserve_bytes=reserve,
+                                    filler_size=1024 * 1024)
+    assert result["fillers"] >= 1
+    assert result["bytes_written"] > 0
+    assert not [p for p in os.listdir(tmp_path) if p.startswith(FILLER_DIR)]
+
+
+@pytest.mark.skipif(os.geteuid() != 0 or not shutil.which("mkfs.ext4"),
+                    reason="needs root and mkfs.ext4 for a loopback mount")
+def test_loopback_image(tmp_path):
+    image, mount = tmp_path / "disk.img", tmp_path / "mnt"
+    mount.mkdir()
+    with open(image, "wb") as f:
+        f.truncate(32 * 1024 * 1024)
+    subprocess.run(["mkfs.ext4", "-q", "-F", str(image)], check=True)
+    if subprocess.run(["mount", "-o", "loop", str(image), str(mount)]).returncode != 0:
+        pytest.skip("loop mount not permitted here")
+    try:
+        (mount / "secret.txt").write_bytes(b"SECRET" * 1000)
+        os.remove(mount / "secret.txt")
+        engine = WipeEngine("1", passes=1, workers=2, chunk_size=256*1024, generate_report=False)
+        result = engine.wipe_free_space(str(mount), reserve_bytes=1024 * 1024,
+                                        filler_size=8 * 1024 * 1024)
+        assert shutil.disk_usage(mount).free > 16 * 1024 * 1024
+        assert result["bytes_written"] > 16 * 1024 * 1024
+    finally:
+        subprocess.run(["umount", str(mount)], check=True)
+    assert b"SECRET" not in image.read_bytes()
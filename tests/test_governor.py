@@ -0,0 +1,73 @@
+import threading
+import time
+from wipeEngine.engine import WipeEngine
+from wipeEngine.governor import IOGovernor, TokenBucket, Window, io_priority, parse_rate
+
+KB = 1024
+MB = 1024 * KB
+
+
+def test_engine_stays_within_budget(tmp_path):
+    folder = tmp_path / "tree"
+    folder.mkdir()
+    for i in range(4):
+        (folder / f"f{i}.bin").write_bytes(b"S" * (512 * KB))
+    governor = IOGovernor(bytes_per_sec="4M")
+    engine = WipeEngine("1", passes=2, workers=2, durability="none", generate_report=False,
+                        small_file_limit=0, governor=governor,
+                        journal_file=str(tmp_path / "j.jsonl"))
+    assert engine.tuning(0)[0] == 384 * KB   # a tenth of a second's budget, in 64 KiB units
+    start = time.monotonic()
+    rows = engine.wipe_folder(str(folder), delete=True)
+    elapsed = time.monotonic() - start
+    assert all(r["wiped"] for r in rows)
+    # 4 MiB through a 4 MiB/s bucket holding a 1 MiB burst: at least 0.75 s
+    assert elapsed >= 0.7
+    assert governor.waited > 0
+    assert engine.metrics.histograms["throttle_wait_seconds"].sum > 0
+
+
+def test_limits_change_at_runtime():
+    bucket = TokenBucket(rate=1000, burst_seconds=1)
+    assert bucket.reserve(1000) == 0
+    assert 0.4 < bucket.reserve(500) <= 0.5
+    bucket.set_rate(None)
+    assert bucket.reserve(10 ** 9) == 0
+
+    governor = IOGovernor(bytes_per_sec=MB, ops_per_sec=100)
+    assert governor.set_limits(bytes_per_sec=None) == {"bytes_per_sec": None, "ops_per_sec": 100}
+    assert governor.chunk_cap(4 * MB) == 4 * MB
+    assert parse_rate("50M") == 50 * MB and parse_rate("none") is None
+
+
+def test_windows_and_ioprio():
+    night = Window({"time": "22:00-06:00", "bytes_per_sec": "100M"})
+    assert night.contains(23 * 60) and night.contains(5 * 60) and not night.contains(12 * 60)
+    assert night.limits == {"bytes_per_sec": 100 * MB}
+    # An always-open window applies its own limits on the first throttle
+    governor = IOGovernor(bytes_per_sec=MB, windows=[{"time": "00:00-24:00", "bytes_per_sec": None}])
+    assert governor.throttle(10 * MB) == 0
+    assert governor.bytes.rate is None
+    with io_priority("idle"):
+        pass
+
+
+def test_lowered_limit_applies_within_a_chunk(tmp_path):
+    from wipeEngine.strategies import _write_chunk
+    governor = IOGovernor(bytes_per_sec=640 * KB)
+    target = tmp_path / "f.bin"
+    target.write_bytes(bytes(256 * KB))
+    with open(target, "r+b") as f:
+        # A 256 KiB chunk sized for an earlier, higher limit goes out in 64 KiB writes
+        assert _write_chunk(f.fileno(), memoryview(b"S" * (256 * KB)), 0, governor=governor) == 4
+    assert target.read_bytes() == b"S" * (256 * KB)
+
+
+def test_large_request_follows_limit_changes():
+    governor = IOGovernor(bytes_per_sec=MB)
+    threading.Timer(0.1, governor.set_limits, kwargs={"bytes_per_sec": None}).start()
+    start = time.monotonic()
+    # 2 MiB at 1 MiB/s would sleep ~1.75 s in one go; paid in slices it ends
+    # soon after the limit is lifted
+    governor.throttle(2 * MB)
+    assert time.monotonic() - start < 0.5
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Report dependencies must only load when a report is actually rendered
+HEAVY_MODULES = ("reportlab", "matplotlib", "numpy", "PIL")
+# Cumulative import budget in microseconds (generous for slow CI hosts)
+BUDGET_US = 150_000
+
+
+def importtime(module):
+    """Return {module: cumulative_us} from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def check_module(module):
+    times = importtime(module)
+    heavy = [name for name in times if name.split(".")[0] in HEAVY_MODULES]
+    assert not heavy, f"{module} imports report dependencies: {heavy}"
+    assert times[module] < BUDGET_US, f"{module} took {times[module]} us to import"
+
+
+def test_engine_import_is_report_free():
+    check_module("wipeEngine.engine")
+
+
+def test_cli_import_is_report_free():
+    check_module("index")
@@ -0,0 +1,48 @@
+import os
+import pytest
+from wipeEngine.engine import WipeEngine
+from wipeEngine.manifest import build_manifest
+
+
+def _tree(tmp_path):
+    folder = tmp_path / "tree"
+    folder.mkdir()
+    (folder / "a.bin").write_bytes(b"secret" * 1000)
+    os.link(folder / "a.bin", folder / "b.bin")
+    outside = tmp_path / "outside.txt"
+    outside.write_bytes(b"keep me")
+    os.symlink(outside, folder / "link.txt")
+    os.symlink(folder / "a.bin", folder / "z_link.bin")
+    return folder, outside
+
+
+def test_hardlinks_are_overwritten_once(tmp_path):
+    folder, outside = _tree(tmp_path)
+    manifest = build_manifest(str(folder), symlink_policy="follow")
+    assert len(manifest) == 2   # a.bin (with its aliases) and the followed outside.txt
+    assert manifest.alias_count == 3
+    a = next(e for e in manifest if e["path"].endswith("a.bin"))
+    assert {x["link"] for x in a["aliases"]} == {"hardlink", "symlink"}
+
+    engine = WipeEngine("1", passes=2, generate_report=False, symlink_policy="unlink",
+                        journal_file=str(tmp_path / "j.jsonl"))
+    rows = engine.wipe_folder(str(folder), delete=True)
+    # Every inode written once per pass, every path reported and removed
+    assert engine.metrics.counters["bytes_written"] == 6000 * 2
+    assert {os.path.basename(r["path"]) for r in rows} == {"a.bin", "b.bin", "link.txt", "z_link.bin"}
+    assert [r for r in rows if r.get("alias_of")][0]["path"].endswith("b.bin")
+    assert os.listdir(folder) == []
+    assert outside.read_bytes() == b"keep me"
+
+
+@pytest.mark.parametrize("policy", ["skip", "unlink"])
+def test_symlink_policy(tmp_path, policy):
+    folder, outside = _tree(tmp_path)
+    engine = WipeEngine("1", passes=1, generate_report=False, symlink_policy=policy,
+                        journal_file=str(tmp_path / "j.jsonl"))
+    rows = engine.wipe_folder(str(folder), delete=True)
+    links = [r for r in rows if r.get("skipped")]
+    assert sorted(os.path.basename(r["path"]) for r in links) == ["link.txt", "z_link.bin"]
+    assert all(r["deleted"] == (policy == "unlink") for r in links)
+    assert os.path.lexists(folder / "link.txt") == (policy == "skip")
+    assert outside.read_bytes() == b"keep me"
@@ -0,0 +1,67 @@
+import os
+import pytest
+from wipeEngine import manifest as manifest_module
+from wipeEngine.engine import WipeEngine
+from wipeEngine.manifest import Entry, build_manifest
+
+
+def _tree(tmp_path):
+    root = tmp_path / "tree"
+    # Names chosen so directory and file order only agree on full paths
+    for rel in ("a-b.txt", "a/x.txt", "a/y/z.bin", "a.txt", "b/c.py", "é.txt", "A.txt"):
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"secret " * (len(rel) + 1))
+    os.link(root / "a.txt", root / "b" / "hard.txt")
+    return root
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test_columns_views_and_path_order(tmp_path, monkeypatch, spill):
+    root = _tree(tmp_path)
+    monkeypatch.setattr(manifest_module, "_numpy", lambda: None)    # plain Python sums too
+    manifest = build_manifest(str(root), workers=3, spill_threshold=0 if spill else None,
+                              spill_dir=str(tmp_path))
+    assert manifest.spilled == spill
+    assert os.listdir(tmp_path) == ["tree"]     # the spill file is never visible
+
+    paths = [e["path"] for e in manifest]
+    expected = sorted(os.path.join(d, f) for d, _, files in os.walk(root) for f in files
+                      if f != "hard.txt")
+    assert paths == expected
+    assert manifest.rows == len(expected) + 1   # the hardlink keeps a row, outside the order
+    assert len(manifest.dirs) == 4 and manifest.columns["size"].itemsize == 8
+
+    entry = manifest[1]
+    assert isinstance(entry, Entry) and not hasattr(entry, "__dict__")
+    assert entry["path"] == str(root / "a-b.txt") and entry["status"] == "pending"
+    assert entry["category"] == "Text" and entry["mime"] == "text/plain"
+    a = next(e for e in manifest if e["path"].endswith("a.txt") and "aliases" in e)
+    assert a["aliases"] == [{"path": str(root / "b" / "hard.txt"), "link": "hardlink"}]
+    assert dict(a)["nlink"] == 2 and "aliases" not in entry
+    assert manifest.total_size == sum(os.path.getsize(p) for p in expected)
+
+    entry["category"] = "Document"
+    entry["status"] = "wiped"
+    assert manifest[1]["category"] == "Document" and manifest[1]["status"] == "wiped"
+    with pytest.raises(KeyError):
+        entry["size"] = 0
+
+    rest = manifest.subset(lambda e: e["path"].endswith(".txt"))
+    assert [e["path"] for e in rest] == [p for p in expected if p.endswith(".txt")]
+    assert rest.alias_count == 1 and len(manifest) == len(expected)
+
+
+def test_wipe_folder_streams_rows_and_records_status(tmp_path):
+    root = _tree(tmp_path)
+    engine = WipeEngine("1", passes=1, workers=3, generate_report=False,
+                        manifest_spill_threshold=0, journal_file=str(tmp_path / "j.jsonl"))
+    manifest = engine.scan_folder(str(root))
+    assert manifest.spilled
+    rows = engine.wipe_folder(manifest, delete=True)
+    # Journal is in completion order; the rows come back in manifest order
+    assert [r["path"] for r in rows] == [e["path"] for e in manifest][:3] + \
+        [str(root / "b" / "hard.txt")] + [e["path"] for e in manifest][3:]
+    assert len(rows) == 8 and rows[3]["alias_of"] == str(root / "a.txt")
+    assert {e["status"] for e in manifest} == {"deleted"}
+    assert [p for _, _, files in os.walk(root) for p in files] == []
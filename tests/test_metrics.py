@@ -0,0 +1,30 @@
+import json
+from wipeEngine.engine import WipeEngine
+from wipeEngine.metrics import JsonLinesSink, MemorySink, Metrics, PrometheusTextfileSink
+
+
+def test_metrics_sinks(tmp_path):
+    folder = tmp_path / "data"
+    folder.mkdir()
+    for i in range(3):
+        (folder / f"f{i}.bin").write_bytes(b"x" * (300 * 1024))
+    memory = MemorySink()
+    sinks = [memory, JsonLinesSink(str(tmp_path / "m.jsonl")),
+             PrometheusTextfileSink(str(tmp_path / "m.prom"))]
+    engine = WipeEngine("2", passes=2, chunk_size=128 * 1024, generate_report=False,
+                        journal_file=str(tmp_path / "j.jsonl"), metrics=Metrics(sinks))
+    engine.wipe_folder(str(folder))
+
+    counters = memory.summary["counters"]
+    assert counters["files"] == 3 and counters["files_failed"] == 0
+    assert counters["bytes_written"] == 3 * 2 * 300 * 1024
+    assert counters["passes"] == 6
+    assert counters["pwrite_calls"] == 3 * 2 * 3
+    assert memory.summary["histograms"]["sync_seconds"]["count"] == counters["syncs"]
+    assert all(len(e["pass_seconds"]) == 2 for e in memory.events)
+
+    lines = [json.loads(l) for l in open(tmp_path / "m.jsonl")]
+    assert [l["type"] for l in lines] == ["file"] * 3 + ["summary"]
+    prom = open(tmp_path / "m.prom").read()
+    assert "secure_wipe_bytes_written_total 1843200" in prom
+    assert 'secure_wipe_pass_seconds_bucket{le="+Inf"} 6' in prom
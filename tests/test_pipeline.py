@@ -0,0 +1,43 @@
+import threading
+import pytest
+from wipeEngine import strategies
+from wipeEngine.bufferPool import BufferPool
+from wipeEngine.pipeline import pipelined_pass
+from wipeEngine.randomSource import KeystreamSource
+
+
+def test_pipelined_pass_matches_serial_pass(tmp_path):
+    size = 10 * 64 * 1024 + 1234     # ten chunks and a tail
+    outputs = []
+    for depth in (1, 3):
+        target = tmp_path / f"depth{depth}.bin"
+        target.write_bytes(b"S" * size)
+        stats = {}
+        assert strategies.random_fill(str(target), passes=1, delete=False, chunk_size=64 * 1024,
+                                      queue_depth=depth, stats=stats,
+                                      random_source=KeystreamSource(seed=7, backend="shake"))
+        assert stats["bytes_written"] == size
+        outputs.append(target.read_bytes())
+    assert outputs[0] == outputs[1] and b"SSSS" not in outputs[0]
+
+
+def test_writer_error_propagates_and_releases_everything(tmp_path):
+    pool = BufferPool(buffer_size=4096, max_buffers=3)
+    written = []
+
+    def write_chunk(view, offset):
+        if offset >= 3 * 4096:
+            raise OSError(28, "No space left on device")
+        written.append((offset, bytes(view)))
+
+    threads = threading.active_count()
+    with pytest.raises(OSError, match="No space left"):
+        pipelined_pass(50 * 4096, pool, 4096, KeystreamSource(seed=1, backend="shake"),
+                       write_chunk, depth=3)
+    # Chunks after the failure are neither written nor generated much further
+    assert [offset for offset, _ in written] == [0, 4096, 8192]
+    assert threading.active_count() == threads
+    # Every buffer is back in the pool with no views left on it
+    assert len(pool._free) == 3
+    for buf in pool.acquire_many(3):
+        buf.close()
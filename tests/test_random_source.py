@@ -0,0 +1,36 @@
+from wipeEngine import strategies
+from wipeEngine.randomSource import KeystreamSource
+
+
+def test_seeded_keystream_is_reproducible():
+    a = KeystreamSource(seed=b"seed", backend="shake")
+    b = KeystreamSource(seed=b"seed", backend="shake")
+    assert a.randbytes(4096) == b.randbytes(4096)
+    assert a.randbytes(4096) != KeystreamSource(seed=b"other", backend="shake").randbytes(4096)
+
+
+def test_random_fill_uses_injected_source(tmp_path):
+    target = tmp_path / "secret.txt"
+    target.write_bytes(b"THIS IS A SECRET MESSAGE. DO NOT LEAK.\n")
+
+    strategies.random_fill(str(target), passes=1, delete=False,
+                           random_source=KeystreamSource(seed=7, backend="shake"))
+
+    expected = KeystreamSource(seed=7, backend="shake").randbytes(39)
+    assert target.read_bytes() == expected
+
+
+def test_threads_get_their_own_streams():
+    import threading
+    source = KeystreamSource(seed=3, backend="numpy")
+    chunks = []
+    threads = [threading.Thread(target=lambda: chunks.append(source.randbytes(1000)))
+               for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(chunks)) == 4
+    # The first thread to draw gets the same stream as a fresh source
+    assert KeystreamSource(seed=3, backend="numpy").randbytes(1000) in chunks
+    assert len(source.randbytes(13)) == 13
@@ -0,0 +1,94 @@
+import os
+import re
+import time
+from wipeEngine.engine import WipeEngine
+from wipeEngine.journal import WipeJournal
+from wipeEngine.reportGenerator import PAGE_ROWS, PDFReport, fit_text, row_status
+
+
+def _pages(pdf_file):
+    return len(re.findall(rb"/Type\s*/Page\b", open(pdf_file, "rb").read()))
+
+
+def test_long_paths_are_trimmed_to_their_cell():
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    path = "/srv/data/" + "deeply/nested/" * 20 + "customer_records_2024.csv"
+    fitted = fit_text(path, 196)
+    assert stringWidth(fitted, "Helvetica", 7) <= 196
+    assert fitted.startswith("/srv/data/") and fitted.endswith("records_2024.csv") and "..." in fitted
+    assert fit_text("short.txt", 196) == "short.txt"
+
+
+def test_report_renders_engine_journal_over_several_pages(tmp_path):
+    journal_file = str(tmp_path / "run.jsonl")
+    rows = PAGE_ROWS * 2 + 5
+    with WipeJournal(journal_file) as journal:
+        for i in range(rows):
+            journal.append({"finished": time.time(), "path": f"/data/{'x' * 300}/{i}.bin",
+                            "category": "Other", "size": 100, "deleted": i % 3 == 0,
+                            "wiped": i % 7 != 0, "sync_time": 0.01, "verified": None,
+                            "verify_rate": 0.0})
+    report = PDFReport(str(tmp_path / "report.pdf"), journal_file=journal_file)
+    report.finalize(strategy="Zero Fill", target_path="/data")
+
+    # Summary page plus three table pages; the journal is read, not copied
+    assert _pages(tmp_path / "report.pdf") == 4
+    assert sorted(os.listdir(tmp_path)) == ["report.pdf", "run.jsonl"]
+    assert report.failure_count == len(range(0, rows, 7))
+    assert report.success_count == rows - report.failure_count
+
+
+def test_engine_journal_is_per_run_and_in_state_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SECURE_WIPE_STATE_DIR", str(tmp_path / "state"))
+    monkeypatch.chdir(tmp_path)
+    folder = tmp_path / "tree"
+    folder.mkdir()
+    (folder / "a.txt").write_bytes(b"secret")
+    engine = WipeEngine("1", passes=1, report_file=str(tmp_path / "r.pdf"))
+    rows = engine.wipe_folder(str(folder), delete=False)
+    first = engine.last_journal
+    assert [row_status(r) for r in rows] == ["Wiped (Kept)"]
+    engine.wipe_folder(str(folder), delete=True)
+    assert engine.last_journal != first
+    assert os.path.dirname(first) == str(tmp_path / "state" / "journals")
+    assert sorted(os.listdir(tmp_path / "state" / "journals")) == sorted(
+        os.path.basename(p) for p in (first, engine.last_journal))
+    assert sorted(os.listdir(tmp_path)) == ["r.pdf", "state", "tree"]
+
+
+def test_finalize_with_charts_leaves_no_temp_files(tmp_path, monkeypatch):
+    import tempfile
+    monkeypatch.chdir(tmp_path)
+    temp_before = set(os.listdir(tempfile.gettempdir()))
+    report = PDFReport(str(tmp_path / "charts.pdf"))
+    start = time.time()
+    monkeypatch.setattr(time, "time", lambda: start + len(report.bucket_bytes) * 2.5)
+    for i, (status, category) in enumerate([("Success", "Text"), ("Wiped (Kept)", "Image"),
+                                            ("Failed", "Text"), ("Success", "Code")]):
+        report.log_file(f"/data/f{i}", 1000 * (i + 1), status, "Zero Fill", category)
+    titles = [title for title, _ in report.generate_charts()]
+    assert titles == ["Success vs Failure:", "Bytes wiped per category:", "Throughput over time (MB/s):"]
+
+    report.finalize(strategy="Zero Fill", target_path="/data")
+    data = open(tmp_path / "charts.pdf", "rb").read()
+    assert data.startswith(b"%PDF-") and data.rstrip().endswith(b"%%EOF")
+    assert sorted(os.listdir(tmp_path)) == ["charts.jsonl", "charts.pdf"]
+    assert set(os.listdir(tempfile.gettempdir())) <= temp_before
+
+
+def test_journal_pruning_goes_by_age_and_spares_this_process(tmp_path, monkeypatch):
+    from wipeEngine.stateDir import new_run_id, run_journal_path
+    monkeypatch.setenv("SECURE_WIPE_STATE_DIR", str(tmp_path))
+    folder = tmp_path / "journals"
+    folder.mkdir()
+    # Unpadded ids from other processes: pid 99 sorts after pid 1000 by name
+    names = ["wipe-20240101-000000-99-0.jsonl", "wipe-20240101-000000-1000-0.jsonl",
+             "wipe-20240101-000000-1000-1.jsonl", f"wipe-20240101-000000-{os.getpid():07d}-000000.jsonl"]
+    for age, name in zip((50, 40, 30, 60), names):
+        (folder / name).write_text("{}\n")
+        os.utime(folder / name, (time.time() - age, time.time() - age))
+    path = run_journal_path(new_run_id(), keep=2)
+    # Two oldest of the others go; this process's journal stays however old it is
+    assert sorted(os.listdir(folder)) == sorted(names[2:])
+    assert os.path.basename(path).split("-")[3] == f"{os.getpid():07d}"
+    assert new_run_id() < new_run_id()
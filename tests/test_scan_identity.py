@@ -0,0 +1,39 @@
+import os
+import pytest
+from wipeEngine import strategies
+from wipeEngine.engine import WipeEngine
+
+
+def _replace(path, data):
+    """Swap in a new inode at path (created first, so the inode cannot be reused)."""
+    fresh = path.with_name(path.name + ".new")
+    fresh.write_bytes(data)
+    os.replace(fresh, path)
+
+
+@pytest.mark.parametrize("small_file_limit", [0, 1024 * 1024])
+def test_file_replaced_after_scan_is_refused(tmp_path, small_file_limit):
+    folder = tmp_path / "tree"
+    folder.mkdir()
+    (folder / "kept.txt").write_bytes(b"secret" * 100)
+    swapped = folder / "swapped.txt"
+    swapped.write_bytes(b"secret" * 100)
+
+    engine = WipeEngine("1", passes=1, generate_report=False, small_file_limit=small_file_limit,
+                        journal_file=str(tmp_path / "j.jsonl"))
+    manifest = engine.scan_folder(str(folder))
+    _replace(swapped, b"not the scanned file")
+
+    rows = {os.path.basename(r["path"]): r for r in engine.wipe_folder(manifest, delete=True)}
+    assert rows["kept.txt"]["wiped"] and not (folder / "kept.txt").exists()
+    assert not rows["swapped.txt"]["wiped"] and not rows["swapped.txt"]["deleted"]
+    assert swapped.read_bytes() == b"not the scanned file"
+
+
+def test_strategy_checks_identity(tmp_path):
+    target = tmp_path / "f.bin"
+    target.write_bytes(b"secret")
+    st = os.stat(target)
+    _replace(target, b"other")
+    assert strategies.zero_fill(str(target), passes=1, identity=(st.st_dev, st.st_ino)) is False
+    assert target.read_bytes() == b"other"
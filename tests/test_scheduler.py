@@ -0,0 +1,74 @@
+import threading
+import time
+from wipeEngine.scheduler import WipeScheduler
+
+
+def test_jobs_are_pulled_from_a_generator_as_workers_free_up():
+    pulled = []
+
+    def jobs():
+        for i in range(100):
+            pulled.append(i)
+            yield {"path": f"f{i}", "size": i, "dev": i % 2}
+
+    ran = []
+    lock = threading.Lock()
+
+    def work(job):
+        with lock:
+            # Never more than the lookahead pending plus the jobs running
+            assert len(pulled) - len(ran) <= 8 + 4
+            ran.append(job["path"])
+
+    assert WipeScheduler(max_workers=4, per_device=2, lookahead=8).run(jobs(), work) is None
+    assert sorted(ran) == sorted(f"f{i}" for i in range(100))
+
+
+def test_per_device_and_global_caps():
+    lock = threading.Lock()
+    running = {}
+    peak = {"total": 0}
+
+    def work(job):
+        with lock:
+            running[job["dev"]] = running.get(job["dev"], 0) + 1
+            assert running[job["dev"]] <= 2
+            peak["total"] = max(peak["total"], sum(running.values()))
+        time.sleep(0.01)
+        with lock:
+            running[job["dev"]] -= 1
+
+    jobs = [{"path": str(i), "size": 1, "dev": i % 3} for i in range(30)]
+    WipeScheduler(max_workers=4, per_device=2).run(jobs, work)
+    assert peak["total"] <= 4
+
+
+def test_largest_first_on_one_device():
+    order = []
+    jobs = [{"path": str(s), "size": s, "dev": 0} for s in (5, 50, 1, 20)]
+    WipeScheduler(max_workers=2, per_device=1).run(jobs, lambda job: order.append(job["size"]))
+    assert order == [50, 20, 5, 1]
+
+
+def test_per_device_default_follows_device_type(monkeypatch):
+    from wipeEngine import scheduler as scheduler_module
+    monkeypatch.setattr(scheduler_module, "is_rotational", lambda dev: dev == 0)
+    scheduler = WipeScheduler(max_workers=8)
+    assert scheduler.device_limit(0) == scheduler_module.ROTATIONAL_WORKERS
+    assert scheduler.device_limit(1) == scheduler_module.SOLID_STATE_WORKERS
+    assert WipeScheduler(max_workers=8, per_device=2).device_limit(0) == 2
+
+    lock = threading.Lock()
+    running = {0: 0, 1: 0}
+    peak = {0: 0, 1: 0}
+
+    def work(job):
+        with lock:
+            running[job["dev"]] += 1
+            peak[job["dev"]] = max(peak[job["dev"]], running[job["dev"]])
+        time.sleep(0.01)
+        with lock:
+            running[job["dev"]] -= 1
+
+    scheduler.run([{"path": str(i), "size": 1, "dev": i % 2} for i in range(24)], work)
+    assert peak[0] == 1 and 1 < peak[1] <= scheduler_module.SOLID_STATE_WORKERS
@@ -0,0 +1,51 @@
+import pytest
+from wipeEngine import strategies
+from wipeEngine.engine import WipeEngine
+from wipeEngine.schemes import DOD_5220_22_M, GUTMANN, compile_scheme
+
+
+def test_compile_schemes():
+    patterns, verify_passes = compile_scheme(DOD_5220_22_M)
+    assert patterns == [b"\x00", b"\xff", None]
+    assert verify_passes == {2}
+    patterns, verify_passes = compile_scheme(GUTMANN)
+    assert len(patterns) == 35 and not verify_passes
+    assert patterns[6] == b"\x92\x49\x24" and patterns[9:25] == [bytes([b * 0x11]) for b in range(16)]
+    assert compile_scheme(["0x0f0f", "complement"])[0] == [b"\x0f\x0f", b"\xf0\xf0"]
+    for bad in ([], ["verify"], ["random", "complement"], ["0xabc"], ["0xzz"]):
+        with pytest.raises(ValueError):
+            compile_scheme(bad)
+
+
+def test_multi_byte_pattern_keeps_its_phase(tmp_path):
+    # Neither the chunk size nor the file size is a multiple of the period
+    target = tmp_path / "secret.bin"
+    target.write_bytes(b"S" * (5 * 4096 + 7))
+    func = strategies.scheme_strategy("Test", ["random", "0x924924", "verify"])
+    stats = {}
+    assert func(str(target), delete=False, chunk_size=4096, stats=stats)
+    assert stats["verified"] is True and stats["bytes_checked"] == 5 * 4096 + 7
+    assert target.read_bytes() == (b"\x92\x49\x24" * 8000)[:5 * 4096 + 7]
+
+
+def test_engine_runs_fixed_schemes(tmp_path):
+    folder = tmp_path / "tree"
+    folder.mkdir()
+    (folder / "small.txt").write_bytes(b"secret" * 100)
+    (folder / "big.bin").write_bytes(b"secret" * 50000)
+    engine = WipeEngine("3", passes=7, generate_report=False,
+                        journal_file=str(tmp_path / "j.jsonl"))
+    assert engine.passes == 3
+    rows = engine.wipe_folder(str(folder), delete=False)
+    # The scheme's own verify step runs even with engine verification off
+    assert all(r["wiped"] and r["verified"] is True for r in rows)
+    assert engine.metrics.counters["bytes_written"] == (600 + 300000) * 3
+
+    custom = strategies.register_custom(["0x55", "complement"], key="test")
+    try:
+        assert strategies.pass_patterns(custom, 9) == [b"\x55", b"\xaa"]
+        engine = WipeEngine("test", generate_report=False, journal_file=str(tmp_path / "j.jsonl"))
+        engine.wipe_folder(str(folder), delete=False)
+        assert (folder / "small.txt").read_bytes() == b"\xaa" * 600
+    finally:
+        del strategies.AVAILABLE_STRATEGIES["test"]
@@ -0,0 +1,56 @@
+import os
+from wipeEngine.engine import WipeEngine
+
+
+def test_small_files_take_batched_fast_path(tmp_path):
+    folder = tmp_path / "tree"
+    for sub in ("a", "b"):
+        (folder / sub).mkdir(parents=True)
+        for i in range(5):
+            (folder / sub / f"f{i}.txt").write_bytes(b"secret %d" % i * 100)
+    (folder / "big.bin").write_bytes(b"B" * (200 * 1024))
+    (folder / "empty").write_bytes(b"")
+
+    engine = WipeEngine("2", passes=2, workers=2, verify="full", generate_report=False,
+                        journal_file=str(tmp_path / "j.jsonl"))
+    rows = engine.wipe_folder(str(folder), delete=False)
+    assert [r["path"] for r in rows] == sorted(r["path"] for r in rows)
+    assert all(r["wiped"] and r["verified"] is not False for r in rows)
+    assert b"secret" not in (folder / "a" / "f3.txt").read_bytes()
+    # One pwrite per pass per file (big.bin fits one default chunk, empty needs none)
+    assert engine.metrics.counters["pwrite_calls"] == 10 * 2 + 2
+
+    rows = engine.wipe_folder(str(folder), delete=True)
+    assert all(r["deleted"] for r in rows)
+    assert [p for _, _, files in os.walk(folder) for p in files] == []
+
+
+
+def test_batches_stream_with_bounded_open_directories():
+    from wipeEngine.smallFiles import make_batches
+    paths = ["/a/1", "/a/2", "/a/3", "/big", "/b/1", "/c/1", "/a/4"]
+    jobs = iter({"path": p, "dev": 0, "size": 10 ** 9 if p == "/big" else 1} for p in paths)
+    items = make_batches(jobs, lambda job: job["size"] == 1, batch_files=2, open_dirs=2)
+    # Full batches leave at once; a third open directory closes the oldest
+    assert [[j["path"] for j in item["jobs"]] if "jobs" in item else item["path"] for item in items] == [
+        ["/a/1", "/a/2"], "/big", ["/a/3"], ["/b/1"], ["/c/1"], ["/a/4"]]
+
+
+def test_pattern_buffers_are_shared_between_batches(tmp_path):
+    from wipeEngine import smallFiles
+    from wipeEngine.strategies import gutmann_wipe, pass_patterns
+    patterns = pass_patterns(gutmann_wipe, None)
+    for i in range(2):
+        (tmp_path / f"f{i}.txt").write_bytes(b"secret" * 100)
+    tiles = []
+    for i in range(2):
+        path = str(tmp_path / f"f{i}.txt")
+        st = os.stat(path)
+        batch = {"dir": str(tmp_path), "dev": st.st_dev, "size": st.st_size,
+                 "jobs": [{"path": path, "dev": st.st_dev, "ino": st.st_ino, "size": st.st_size}]}
+        results = list(smallFiles.wipe_small_files(batch, patterns, delete=False, durability="none"))
+        assert [wiped for _, wiped, _ in results] == [True]
+        tiles.append(dict(smallFiles._tiles))
+    # Single-file batches reuse the tiled buffers instead of re-tiling ~35 patterns each
+    assert tiles[0] and all(tiles[1][p] is tile for p, tile in tiles[0].items())
+    assert tiles[0][b"\x55"].readonly and bytes(tiles[0][b"\x55"][:4]) == b"UUUU"
@@ -0,0 +1,34 @@
+import os
+from wipeEngine import strategies
+from wipeEngine.verify import ChunkChecksums, verify_fd
+
+SIZE = 3 * 4096 + 123
+
+
+def make_file(tmp_path):
+    target = tmp_path / "secret.bin"
+    target.write_bytes(b"SECRET" * (SIZE // 6) + b"S" * (SIZE % 6))
+    return str(target)
+
+
+def test_verified_wipes(tmp_path):
+    path = make_file(tmp_path)
+    for func in (strategies.zero_fill, strategies.random_fill):
+        for mode in ("full", "sampled", "tail"):
+            stats = {}
+            assert func(path, passes=1, delete=False, chunk_size=4096, verify=mode, stats=stats)
+            assert stats["verified"] is True
+            assert stats["bytes_checked"] > 0
+
+
+def test_mismatch_is_detected(tmp_path):
+    path = make_file(tmp_path)
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        assert not verify_fd(fd, SIZE, b"\x00", chunk_size=4096)["verified"]
+        assert not verify_fd(fd, SIZE, b"\x92\x49\x24", chunk_size=4096)["verified"]
+        checksums = ChunkChecksums()
+        checksums.add(0, memoryview(bytes(4096)))
+        assert not verify_fd(fd, SIZE, None, chunk_size=4096, checksums=checksums)["verified"]
+    finally:
+        os.close(fd)
@@ -0,0 +1,110 @@
+# wipeEngine/autotune.py
+import os
+import shutil
+import threading
+import time
+from wipeEngine.durability import PER_PASS
+from wipeEngine.extents import FULL
+from wipeEngine import strategies
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_QUEUE_DEPTH = 3
+
+CHUNK_SIZES = (64*1024, 256*1024, 1024*1024, 4*1024*1024, 16*1024*1024)
+QUEUE_DEPTHS = (1, 2, 4)
+SAMPLE_BYTES = 32 * 1024 * 1024
+# A bigger setting must beat a smaller one by this much to be picked
+MARGIN = 0.05
+
+_uuid_lock = threading.Lock()
+_uuids = None
+
+
+def _uuid_map():
+    """{st_rdev: filesystem UUID} from /dev/disk/by-uuid (Linux), read once."""
+    global _uuids
+    with _uuid_lock:
+        if _uuids is None:
+            _uuids = {}
+            folder = "/dev/disk/by-uuid"
+            if os.path.isdir(folder):
+                for name in os.listdir(folder):
+                    try:
+                        _uuids[os.stat(os.path.join(folder, name)).st_rdev] = name
+                    except OSError:
+                        pass
+        return _uuids
+
+
+def device_key(st_dev):
+    """
+    Stable name for the device behind st_dev: its filesystem UUID where the
+    system exposes one, else major:minor (tmpfs, overlay, no udev).
+    """
+    uuid = _uuid_map().get(st_dev)
+    if uuid:
+        return f"uuid:{uuid}"
+    if hasattr(os, "major"):
+        return f"dev:{os.major(st_dev)}:{os.minor(st_dev)}"
+    return f"dev:{st_dev}"    # Windows: volume serial number
+
+
+def profile_for(profiles, st_dev):
+    """Cached profile of a device, or None if it was never calibrated."""
+    if not profiles:
+        return None
+    return profiles.get(device_key(st_dev))
+
+
+def _best(rates):
+    """Smallest setting within MARGIN of the fastest one."""
+    top = max(rates.values())
+    return min(k for k, rate in rates.items() if rate >= top * (1 - MARGIN))
+
+
+def _timed_write(func, path, nbytes, **options):
+    """Bytes/s of one synced pass of `func` over the scratch file."""
+    start = time.perf_counter()
+    func(path, passes=1, delete=False, durability=PER_PASS, extent_policy=FULL, verbose=False,
+         **options)
+    return nbytes / (time.perf_counter() - start)
+
+
+def calibrate(directory, sample_bytes=SAMPLE_BYTES, chunk_sizes=CHUNK_SIZES, queue_depths=QUEUE_DEPTHS):
+    """
+    Find the chunk size and queue depth that write fastest to the device
+    holding `directory`. A `sample_bytes` scratch file is overwritten with
+    each chunk size (zero pass, fdatasync'd), then with random passes at
+    each queue depth, and removed again.
+    Returns {"chunk_size", "queue_depth", "rate", "calibrated"}.
+    """
+    if shutil.disk_usage(directory).free < 2 * sample_bytes:
+        raise OSError(f"Not enough free space in {directory} to calibrate")
+    path = os.path.join(directory, f".secure_wipe_calibrate.{os.getpid()}")
+    try:
+        with open(path, "wb") as f:
+            f.truncate(sample_bytes)
+        # Warm-up: the first pass also pays for block allocation
+        _timed_write(strategies.zero_fill, path, sample_bytes, chunk_size=chunk_sizes[0])
+        chunk_rates = {
+            c: _timed_write(strategies.zero_fill, path, sample_bytes, chunk_size=c)
+            for c in chunk_sizes
+        }
+        chunk_size = _best(chunk_rates)
+        depth_rates = {
+            d: _timed_write(strategies.random_fill, path, sample_bytes,
+                            chunk_size=chunk_size, queue_depth=d)
+            for d in queue_depths
+        }
+        queue_depth = _best(depth_rates)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return {
+        "chunk_size": chunk_size,
+        "queue_depth": queue_depth,
+        "rate": round(chunk_rates[chunk_size] / 1e6, 1),
+        "calibrated": time.strftime("%Y-%m-%d %H:%M:%S")
+    }
@@ -0,0 +1,105 @@
+# wipeEngine/bufferPool.py
+import mmap
+import threading
+from contextlib import contextmanager
+
+
+def tile_pattern(view, pattern):
+    """Fill view with a repeating byte pattern using doubling copies."""
+    n = len(view)
+    if n == 0:
+        return
+    pattern = bytes(pattern)
+    first = min(len(pattern), n)
+    view[:first] = pattern[:first]
+    filled = first
+    while filled < n:
+        step = min(filled, n - filled)
+        view[filled:filled + step] = view[:step]
+        filled += step
+
+
+class BufferPool:
+    """
+    Fixed set of page-aligned mmap buffers shared by every worker.
+
+    A buffer remembers the constant pattern it was last filled with, so
+    asking for the same pattern again costs nothing. Random data is written
+    in place by the caller (pattern=None). When all buffers are in use,
+    acquire() blocks, which keeps peak memory at buffer_size * max_buffers
+    whatever the file size or worker count.
+    """
+
+    def __init__(self, buffer_size=1024*1024, max_buffers=8):
+        # Round up to whole pages so buffers are also O_DIRECT friendly
+        self.buffer_size = -(-buffer_size // mmap.PAGESIZE) * mmap.PAGESIZE
+        self.max_buffers = max_buffers
+        self._free = []          # [(mmap, pattern)]
+        self._created = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, pattern=None):
+        """Take a buffer filled with `pattern` (bytes) or unfilled for None."""
+        with self._cond:
+            while not self._free and self._created >= self.max_buffers:
+                self._cond.wait()
+            entry = None
+            if pattern is not None:
+                for i, (buf, tag) in enumerate(self._free):
+                    if tag == pattern:
+                        entry = self._free.pop(i)
+                        break
+            if entry is None and self._free:
+                entry = self._free.pop()
+            if entry is None:
+                entry = (mmap.mmap(-1, self.buffer_size), None)
+                self._created += 1
+        buf, tag = entry
+        if pattern is not None and tag != pattern:
+            tile_pattern(memoryview(buf), pattern)
+        return buf
+
+    def acquire_many(self, count):
+        """
+        Take `count` unfilled buffers at once. Waiting for the whole set in
+        one go avoids workers deadlocking on half-acquired sets.
+        """
+        count = min(count, self.max_buffers)
+        with self._cond:
+            while len(self._free) + self.max_buffers - self._created < count:
+                self._cond.wait()
+            taken = [self._free.pop()[0] for _ in range(min(count, len(self._free)))]
+            while len(taken) < count:
+                taken.append(mmap.mmap(-1, self.buffer_size))
+                self._created += 1
+        return taken
+
+    def release(self, buf, pattern=None):
+        """Return a buffer; `pattern` is what it still holds (None if random)."""
+        with self._cond:
+            self._free.append((buf, pattern))
+            self._cond.notify_all()
+
+    @contextmanager
+    def buffer(self, pattern=None):
+        """Context manager yielding a memoryview over a pooled buffer."""
+        buf = self.acquire(pattern)
+        view = memoryview(buf)
+        try:
+            yield view
+        finally:
+            view.release()
+            self.release(buf, pattern)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(buffer_size):
+    """Shared pool for a given chunk size."""
+    with _pools_lock:
+        pool = _pools.get(buffer_size)
+        if pool is None:
+            pool = _pools[buffer_size] = BufferPool(buffer_size)
+        return pool
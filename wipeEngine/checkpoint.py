@@ -0,0 +1,92 @@
+# wipeEngine/checkpoint.py
+import json
+import os
+import threading
+import time
+
+
+class CheckpointJournal:
+    """
+    Crash-safe record of wipe progress, one JSON object per line:
+
+        {"run": {...settings...}}                 written once at the start
+        {"file": path, "pass": i, "offset": n}    pass i is durable up to n
+        {"done": path}                            file fully wiped
+        {"complete": true}                        whole run finished
+
+    Records are buffered and written + fsync'ed in batches (every
+    `flush_every` records or `flush_interval` seconds), so journaling stays
+    a small fraction of the wipe itself. Only offsets that the durability
+    policy has already synced are ever recorded.
+    """
+
+    def __init__(self, path, mode="w", flush_every=256, flush_interval=2.0):
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self._file = open(path, mode, encoding="utf-8")
+        self._pending = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _add(self, record, force=False):
+        with self._lock:
+            self._pending.append(json.dumps(record))
+            if (force or len(self._pending) >= self.flush_every
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._pending and not self._file.closed:
+            self._file.write("\n".join(self._pending) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def start_run(self, settings):
+        self._add({"run": settings}, force=True)
+
+    def progress(self, path, pass_index, offset):
+        """Pass `pass_index` of `path` is durable up to `offset`."""
+        self._add({"file": path, "pass": pass_index, "offset": offset})
+
+    def done(self, path):
+        self._add({"done": path})
+
+    def complete(self):
+        self._add({"complete": True}, force=True)
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+
+    @staticmethod
+    def load(path):
+        """
+        Read a journal back. Returns a dict with the run settings, the set
+        of finished files, {path: (pass, offset)} for partial files, and
+        whether the run completed. A torn last line is ignored.
+        """
+        state = {"settings": None, "done": set(), "partial": {}, "complete": False}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if "run" in record:
+                    state["settings"] = record["run"]
+                elif "file" in record:
+                    state["partial"][record["file"]] = (record["pass"], record["offset"])
+                elif "done" in record:
+                    state["done"].add(record["done"])
+                    state["partial"].pop(record["done"], None)
+                elif record.get("complete"):
+                    state["complete"] = True
+        return state
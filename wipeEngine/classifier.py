@@ -0,0 +1,237 @@
+# wipeEngine/classifier.py
+import json
+import mimetypes
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+HEADER_SIZE = 512    # enough for every signature below (tar's is at 257)
+CLASSIFY_BATCH = 4096    # cache misses sniffed per thread-pool round
+
+# ------------------- Extension table -------------------
+_EXTENSION_GROUPS = {
+    "Text": (".txt", ".md", ".log", ".csv", ".tsv", ".json", ".xml", ".yaml", ".yml",
+             ".ini", ".cfg", ".conf", ".rst", ".tex"),
+    "Code": (".py", ".c", ".h", ".cpp", ".hpp", ".java", ".js", ".ts", ".go", ".rs",
+             ".rb", ".php", ".sh", ".ps1", ".html", ".htm", ".css", ".sql"),
+    "Image": (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".tif", ".tiff", ".webp", ".svg",
+              ".heic", ".ico", ".psd"),
+    "Video": (".mp4", ".avi", ".mov", ".mkv", ".webm", ".wmv", ".flv", ".m4v", ".mpg", ".mpeg"),
+    "Audio": (".mp3", ".wav", ".flac", ".ogg", ".m4a", ".aac", ".wma", ".opus"),
+    "Archive": (".zip", ".rar", ".7z", ".tar", ".gz", ".tgz", ".bz2", ".xz", ".zst", ".iso"),
+    "Document": (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".odt", ".ods",
+                 ".odp", ".rtf", ".epub", ".ps"),
+    "Database": (".db", ".sqlite", ".sqlite3", ".mdb", ".accdb"),
+    "Executable": (".exe", ".dll", ".so", ".dylib", ".msi", ".jar", ".apk", ".class"),
+}
+EXTENSIONS = {ext: category for category, exts in _EXTENSION_GROUPS.items() for ext in exts}
+
+# Zip/OLE containers whose extension says more than the magic bytes do
+_CONTAINER_EXTENSIONS = {".docx", ".xlsx", ".pptx", ".odt", ".ods", ".odp", ".epub",
+                         ".jar", ".apk", ".doc", ".xls", ".ppt", ".msi"}
+
+# ------------------- Magic bytes -------------------
+# (offset, signature, category, mime)
+MAGIC = (
+    (0, b"%PDF-", "Document", "application/pdf"),
+    (0, b"\x89PNG\r\n\x1a\n", "Image", "image/png"),
+    (0, b"\xff\xd8\xff", "Image", "image/jpeg"),
+    (0, b"GIF87a", "Image", "image/gif"),
+    (0, b"GIF89a", "Image", "image/gif"),
+    (0, b"II*\x00", "Image", "image/tiff"),
+    (0, b"MM\x00*", "Image", "image/tiff"),
+    (0, b"8BPS", "Image", "image/vnd.adobe.photoshop"),
+    (0, b"\x1a\x45\xdf\xa3", "Video", "video/x-matroska"),
+    (0, b"ID3", "Audio", "audio/mpeg"),
+    (0, b"fLaC", "Audio", "audio/flac"),
+    (0, b"OggS", "Audio", "audio/ogg"),
+    (0, b"PK\x03\x04", "Archive", "application/zip"),
+    (0, b"Rar!\x1a\x07", "Archive", "application/vnd.rar"),
+    (0, b"7z\xbc\xaf\x27\x1c", "Archive", "application/x-7z-compressed"),
+    (0, b"\x1f\x8b", "Archive", "application/gzip"),
+    (0, b"BZh", "Archive", "application/x-bzip2"),
+    (0, b"\xfd7zXZ\x00", "Archive", "application/x-xz"),
+    (0, b"\x28\xb5\x2f\xfd", "Archive", "application/zstd"),
+    (257, b"ustar", "Archive", "application/x-tar"),
+    (0, b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "Document", "application/x-ole-storage"),
+    (0, b"{\\rtf", "Document", "application/rtf"),
+    (0, b"%!PS", "Document", "application/postscript"),
+    (0, b"SQLite format 3\x00", "Database", "application/vnd.sqlite3"),
+    (0, b"\x7fELF", "Executable", "application/x-executable"),
+    (0, b"MZ", "Executable", "application/x-msdownload"),
+    (0, b"\xcf\xfa\xed\xfe", "Executable", "application/x-mach-binary"),
+    (0, b"\xfe\xed\xfa\xcf", "Executable", "application/x-mach-binary"),
+    (0, b"\xca\xfe\xba\xbe", "Executable", "application/java-vm"),
+)
+
+_RIFF = {b"WEBP": ("Image", "image/webp"), b"WAVE": ("Audio", "audio/wav"),
+         b"AVI ": ("Video", "video/x-msvideo")}
+
+_mime_lock = threading.Lock()
+
+
+def _guess_mime(path):
+    # mimetypes reads the system tables on first use; do that only once
+    with _mime_lock:
+        if not mimetypes.inited:
+            mimetypes.init()
+    return mimetypes.guess_type(path)[0]
+
+
+def sniff(header):
+    """(category, mime) from the first bytes of a file, or None."""
+    for offset, signature, category, mime in MAGIC:
+        if header.startswith(signature, offset):
+            return category, mime
+    if header[:4] == b"RIFF" and header[8:12] in _RIFF:
+        return _RIFF[header[8:12]]
+    if header[4:8] == b"ftyp":
+        if header[8:11] == b"M4A":
+            return "Audio", "audio/mp4"
+        return "Video", "video/mp4"
+    return None
+
+
+def _looks_like_text(header):
+    if not header or b"\x00" in header:
+        return False
+    try:
+        header.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the header boundary is fine
+        return e.start >= len(header) - 3
+    return True
+
+
+def _read_header(path):
+    # O_NONBLOCK: a FIFO in the tree must not hang the scan
+    flags = os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_NOFOLLOW", 0) \
+        | getattr(os, "O_NONBLOCK", 0)
+    try:
+        fd = os.open(path, flags)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, HEADER_SIZE)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def classify(path):
+    """
+    Classify one file as (category, mime). Magic bytes win, except for
+    zip/OLE containers with a more specific extension (docx, jar, ...);
+    then the extension table; then a text check; else "Other".
+    """
+    ext = os.path.splitext(path)[1].lower()
+    header = _read_header(path)
+    sniffed = sniff(header) if header else None
+    if sniffed and not (ext in _CONTAINER_EXTENSIONS and sniffed[0] in ("Archive", "Document")):
+        return sniffed
+    if ext in EXTENSIONS:
+        return EXTENSIONS[ext], _guess_mime(path)
+    if header is not None and _looks_like_text(header):
+        return "Text", "text/plain"
+    return "Other", _guess_mime(path)
+
+
+# ------------------- Persistent cache -------------------
+class ClassificationCache:
+    """
+    (dev, ino, mtime_ns, size) -> (category, mime), kept in a JSON file.
+    A file whose inode, mtime and size are unchanged is not re-read on the
+    next scan. Entries not seen by the last scans are dropped past
+    `max_entries`.
+    """
+
+    def __init__(self, path, max_entries=500_000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._seen = set()
+        self._dirty = False
+        self.entries = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                print(f"⚠️ Classification cache {path} unreadable, starting fresh")
+
+    @staticmethod
+    def key(entry):
+        return f"{entry['dev']}:{entry['ino']}:{entry['mtime']}:{entry['size']}"
+
+    def get(self, entry):
+        key = self.key(entry)
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._seen.add(key)
+        return tuple(value)
+
+    def put(self, entry, value):
+        key = self.key(entry)
+        self.entries[key] = list(value)
+        self._seen.add(key)
+        self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        if len(self.entries) > self.max_entries:
+            self.entries = {k: v for k, v in self.entries.items() if k in self._seen}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, separators=(",", ":"))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+def _classify_batch(batch, cache, pool):
+    paths = [e["path"] for e in batch]
+    results = pool.map(classify, paths) if pool is not None else map(classify, paths)
+    for entry, result in zip(batch, results):
+        entry["category"], entry["mime"] = result
+        if cache is not None:
+            cache.put(entry, result)
+
+
+def classify_entries(entries, cache=None, workers=4, batch_size=CLASSIFY_BATCH):
+    """
+    Fill "category" and "mime" of manifest entries in place. Cache hits
+    cost nothing; the misses are sniffed on a thread pool (the header
+    reads release the GIL) in batches of `batch_size`, so any iterable of
+    entries (e.g. a Manifest's views) is classified without listing it.
+    """
+    misses = []
+    missed = False
+    pool = None
+    try:
+        for entry in entries:
+            cached = cache.get(entry) if cache is not None else None
+            if cached is not None:
+                entry["category"], entry["mime"] = cached
+                continue
+            misses.append(entry)
+            if len(misses) == batch_size:
+                if pool is None and workers > 1:
+                    pool = ThreadPoolExecutor(max_workers=workers)
+                _classify_batch(misses, cache, pool)
+                misses, missed = [], True
+        if misses:
+            if pool is None and workers > 1 and len(misses) > 1:
+                pool = ThreadPoolExecutor(max_workers=workers)
+            _classify_batch(misses, cache, pool)
+            missed = True
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    if missed and cache is not None:
+        cache.save()
+    return entries
@@ -0,0 +1,484 @@
+# wipeEngine/daemon.py
+import heapq
+import itertools
+import json
+import os
+import shutil
+import socket
+import socketserver
+import tempfile
+import threading
+import time
+from wipeEngine.engine import WipeEngine
+from wipeEngine.governor import IOGovernor
+from wipeEngine.metrics import Metrics
+from wipeEngine.strategies import AVAILABLE_STRATEGIES
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED = (DONE, FAILED, CANCELLED)
+
+# Finished jobs are forgotten (journal included) after this many seconds,
+# or sooner once more than MAX_FINISHED of them are kept
+FINISHED_TTL = 3600
+MAX_FINISHED = 100
+
+# Per-job options a client may set; everything else comes from the daemon;
+# "delete" is off unless the client asks for it
+JOB_OPTIONS = ("delete", "verify", "verify_percent", "durability", "chunk_size",
+               "queue_depth", "extent_policy", "small_file_limit", "io_mode", "symlink_policy")
+
+# JSON-RPC 2.0 error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+def default_socket_path():
+    """$XDG_RUNTIME_DIR/secure_wipe.sock, else one in the temp dir."""
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(base, "secure_wipe.sock")
+
+
+class RPCError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+# ------------------- Jobs -------------------
+class _EventSink:
+    """Metrics sink that turns per-file events into job progress events."""
+
+    def __init__(self, job):
+        self.job = job
+
+    def on_file(self, event):
+        job = self.job
+        with job.cond:
+            job.files_done += 1
+            job.bytes_written += event["bytes_written"]
+            job.failed += not event["wiped"]
+        job.emit({"event": "file", "path": event["path"], "wiped": event["wiped"],
+                  "files_done": job.files_done, "bytes_written": job.bytes_written})
+
+    def end_run(self, snapshot):
+        pass
+
+
+class Job:
+    """
+    One queued wipe request and the events it has produced so far. Once the
+    job has finished and no client is waiting on it, the per-file events
+    are dropped; the counters and the state events remain.
+    """
+
+    def __init__(self, job_id, path, strategy, passes, priority, options, journal_file):
+        self.id = job_id
+        self.path = path
+        self.strategy = strategy
+        self.passes = passes
+        self.priority = priority
+        self.options = options
+        self.state = QUEUED
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.files_total = 0
+        self.files_done = 0
+        self.failed = 0
+        self.bytes_written = 0
+        self.error = None
+        self.journal_file = journal_file
+        self.cancel_event = threading.Event()
+        self.events = []
+        self.waiters = 0
+        self.cond = threading.Condition()
+
+    def emit(self, event):
+        with self.cond:
+            self.events.append(dict(event, job_id=self.id, time=time.time()))
+            self.cond.notify_all()
+
+    def set_state(self, state, error=None):
+        with self.cond:
+            self.state = state
+            self.error = error
+            if state == RUNNING:
+                self.started = time.time()
+            elif state in FINISHED:
+                self.finished = time.time()
+        self.emit({"event": "state", "state": state, "error": error})
+        self.compact()
+
+    def compact(self):
+        """Drop the per-file events of a finished job nobody is waiting on."""
+        with self.cond:
+            if self.state in FINISHED and not self.waiters:
+                self.events = [e for e in self.events if e["event"] != "file"]
+
+    def summary(self):
+        with self.cond:
+            return {
+                "job_id": self.id, "path": self.path, "strategy": self.strategy,
+                "passes": self.passes, "priority": self.priority, "state": self.state,
+                "submitted": self.submitted, "started": self.started,
+                "finished": self.finished, "files_total": self.files_total,
+                "files_done": self.files_done, "failed": self.failed,
+                "bytes_written": self.bytes_written, "error": self.error
+            }
+
+
+# ------------------- Daemon -------------------
+class WipeDaemon:
+    """
+    Long-running wipe service on a Unix-domain socket (JSON-RPC 2.0, one
+    JSON message per line).
+
+    Jobs are queued by priority (higher first, then submission order) and
+    run one after another by a single dispatcher, each using the daemon's
+    `workers`, so concurrent submissions share one worker pool and one I/O
+    budget instead of competing. Imports, buffer pools, the random source
+    and device profiles stay warm between jobs. One IOGovernor paces every
+    job; its limits can be changed while jobs run.
+
+    The serial queue is deliberate: two jobs on the same disk would only
+    slow each other down. A large job holds the queue until it ends, so
+    cancel also stops a running job: files being wiped finish, the rest of
+    the job is left untouched.
+
+    Finished jobs are kept for `finished_ttl` seconds (at most
+    `max_finished` of them), then forgotten along with their journal.
+    Without `state_dir` the journals go to a temp dir that is removed on
+    shutdown.
+
+    Methods: submit, status, list, cancel, wait (streams "progress"
+    notifications until the job ends), throttle, shutdown.
+    """
+
+    def __init__(self, socket_path=None, workers=4, per_device_workers=None, defaults=None,
+                 device_profiles=None, state_dir=None, governor=None,
+                 finished_ttl=FINISHED_TTL, max_finished=MAX_FINISHED):
+        self.socket_path = socket_path or default_socket_path()
+        self.workers = workers
+        self.per_device_workers = per_device_workers
+        self.defaults = dict(defaults or {})
+        self.device_profiles = device_profiles if device_profiles is not None else {}
+        self.governor = governor if governor is not None else IOGovernor()
+        self._own_state_dir = not state_dir
+        self.state_dir = state_dir or tempfile.mkdtemp(prefix="secure_wipe_daemon_")
+        self.finished_ttl = finished_ttl
+        self.max_finished = max_finished
+        self.jobs = {}
+        self._queue = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopping = False
+        self._server = None
+        self._dispatcher = None
+
+    # ----- queue -----
+    def submit(self, path, strategy="1", passes=3, priority=0, options=None):
+        if strategy not in AVAILABLE_STRATEGIES:
+            raise RPCError(INVALID_PARAMS, f"Unknown strategy {strategy}")
+        if not isinstance(passes, int) or passes < 1:
+            raise RPCError(INVALID_PARAMS, "passes must be an integer >= 1")
+        options = dict(options or {})
+        unknown = set(options) - set(JOB_OPTIONS)
+        if unknown:
+            raise RPCError(INVALID_PARAMS, f"Unknown options: {', '.join(sorted(unknown))}")
+        if not os.path.exists(path):
+            raise RPCError(INVALID_PARAMS, f"Path not found: {path}")
+        with self._lock:
+            if self._stopping:
+                raise RPCError(SERVER_ERROR, "Daemon is shutting down")
+            self._prune()
+            job_id = next(self._ids)
+            job = Job(job_id, os.path.abspath(path), strategy, passes, priority, options,
+                      os.path.join(self.state_dir, f"job-{job_id}.jsonl"))
+            self.jobs[job.id] = job
+            job.emit({"event": "state", "state": QUEUED, "error": None})
+            heapq.heappush(self._queue, (-priority, job.id))
+            self._wakeup.notify()
+        return job.summary()
+
+    def cancel(self, job_id):
+        """Cancel a queued job, or stop a running one after its current files."""
+        job = self._job(job_id)
+        with self._lock:
+            if job.state == QUEUED:
+                job.set_state(CANCELLED)
+                return True
+            if job.state != RUNNING:
+                return False
+            job.cancel_event.set()
+        return True
+
+    def _prune(self):
+        """Forget finished jobs past the TTL or the count limit (lock held)."""
+        finished = sorted((job for job in self.jobs.values() if job.state in FINISHED),
+                          key=lambda job: job.finished)
+        expired = time.time() - self.finished_ttl
+        excess = len(finished) - self.max_finished
+        for i, job in enumerate(finished):
+            if i < excess or job.finished < expired:
+                del self.jobs[job.id]
+                try:
+                    os.remove(job.journal_file)
+                except OSError:
+                    pass
+
+    def _job(self, job_id):
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise RPCError(INVALID_PARAMS, f"Unknown job {job_id}")
+        return job
+
+    def _next_job(self):
+        with self._lock:
+            while True:
+                while self._queue:
+                    _, job_id = heapq.heappop(self._queue)
+                    job = self.jobs.get(job_id)
+                    if job is None or job.state != QUEUED:
+                        continue
+                    if self._stopping:
+                        job.set_state(CANCELLED, "daemon shut down")
+                        continue
+                    job.set_state(RUNNING)
+                    return job
+                if self._stopping:
+                    return None
+                self._wakeup.wait()
+
+    def _dispatch(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            self._run(job)
+            with self._lock:
+                self._prune()
+
+    def _run(self, job):
+        settings = dict(self.defaults)
+        settings.update(job.options)
+        delete = settings.pop("delete", False)
+        try:
+            engine = WipeEngine(
+                job.strategy,
+                passes=job.passes,
+                workers=self.workers,
+                per_device_workers=self.per_device_workers,
+                device_profiles=self.device_profiles,
+                governor=self.governor,
+                journal_file=job.journal_file,
+                generate_report=False,
+                metrics=Metrics([_EventSink(job)]),
+                progress_interval=float("inf"),   # progress goes to clients, not stdout
+                **settings
+            )
+            manifest = engine.scan_folder(job.path)
+            with job.cond:
+                job.files_total = len(manifest)
+            job.emit({"event": "scanned", "files_total": len(manifest),
+                      "bytes_total": manifest.total_size})
+            engine.wipe_folder(manifest, delete=delete, cancel_event=job.cancel_event)
+        except Exception as e:
+            job.set_state(FAILED, str(e))
+            return
+        if job.cancel_event.is_set() and job.files_done < job.files_total:
+            job.set_state(CANCELLED, f"cancelled after {job.files_done} files")
+            return
+        job.set_state(FAILED if job.failed else DONE,
+                      f"{job.failed} files failed" if job.failed else None)
+
+    # ----- RPC -----
+    def handle(self, method, params, send):
+        """Run one RPC method; `send(message)` streams notifications (wait)."""
+        if method == "submit":
+            return self.submit(params["path"], str(params.get("strategy", "1")),
+                               params.get("passes", 3), params.get("priority", 0),
+                               params.get("options"))
+        if method == "status":
+            return self._job(params["job_id"]).summary()
+        if method == "list":
+            with self._lock:
+                self._prune()
+                jobs = list(self.jobs.values())
+            return [job.summary() for job in jobs]
+        if method == "cancel":
+            return self.cancel(params["job_id"])
+        if method == "wait":
+            return self._wait(self._job(params["job_id"]), send, params.get("timeout"))
+        if method == "throttle":
+            # {"bytes_per_sec": "20M", "ops_per_sec": null}: keys given are changed
+            try:
+                limits = self.governor.set_limits(**params)
+            except (TypeError, ValueError) as e:
+                raise RPCError(INVALID_PARAMS, str(e))
+            return {"limits": limits, "throttled_seconds": round(self.governor.waited, 3)}
+        if method == "shutdown":
+            threading.Thread(target=self.stop, daemon=True).start()
+            return True
+        raise RPCError(METHOD_NOT_FOUND, f"Unknown method {method}")
+
+    def _wait(self, job, send, timeout=None):
+        """Stream the job's events as "progress" notifications until it ends."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with job.cond:
+            job.waiters += 1
+        try:
+            return self._stream(job, send, deadline)
+        finally:
+            with job.cond:
+                job.waiters -= 1
+            job.compact()
+
+    def _stream(self, job, send, deadline):
+        sent = 0
+        while True:
+            with job.cond:
+                while sent == len(job.events) and job.state not in FINISHED:
+                    left = None if deadline is None else deadline - time.monotonic()
+                    if left is not None and left <= 0:
+                        return job.summary()
+                    job.cond.wait(left)
+                events = job.events[sent:]
+                sent += len(events)
+                finished = job.state in FINISHED
+            for event in events:
+                send({"jsonrpc": "2.0", "method": "progress", "params": event})
+            if finished and sent == len(job.events):
+                return job.summary()
+
+    # ----- lifecycle -----
+    def serve_forever(self):
+        """Bind the socket (mode 0600) and serve until shutdown."""
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                raise OSError(f"A daemon is already listening on {self.socket_path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.remove(self.socket_path)    # stale socket from a crash
+            finally:
+                probe.close()
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                lock = threading.Lock()
+
+                def send(message):
+                    data = (json.dumps(message) + "\n").encode()
+                    with lock:
+                        self.wfile.write(data)
+                        self.wfile.flush()
+
+                for line in self.rfile:
+                    if line.strip():
+                        send(daemon._respond(line, send))
+
+        old_umask = os.umask(0o177)   # the socket can wipe anything we can: owner only
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+        self._dispatcher = threading.Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+        print(f"🛰️ Wipe daemon listening on {self.socket_path}")
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                os.remove(self.socket_path)
+            except OSError:
+                pass
+            if self._own_state_dir:
+                shutil.rmtree(self.state_dir, ignore_errors=True)
+
+    def _respond(self, line, send):
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError:
+                raise RPCError(PARSE_ERROR, "Invalid JSON")
+            if not isinstance(request, dict) or "method" not in request:
+                raise RPCError(INVALID_REQUEST, "Not a JSON-RPC request")
+            request_id = request.get("id")
+            params = request.get("params") or {}
+            result = self.handle(request["method"], params, send)
+            return {"jsonrpc": "2.0", "id": request_id, "result": result}
+        except RPCError as e:
+            return {"jsonrpc": "2.0", "id": request_id, "error": {"code": e.code, "message": str(e)}}
+        except (KeyError, TypeError) as e:
+            return {"jsonrpc": "2.0", "id": request_id,
+                    "error": {"code": INVALID_PARAMS, "message": f"Bad params: {e}"}}
+
+    def stop(self):
+        """Let the running job finish, cancel the queued ones, then stop serving."""
+        with self._lock:
+            self._stopping = True
+            self._wakeup.notify_all()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+        if self._server is not None:
+            self._server.shutdown()
+
+
+# ------------------- Client -------------------
+class WipeClient:
+    """Minimal JSON-RPC client for WipeDaemon."""
+
+    def __init__(self, socket_path=None, timeout=None):
+        self.socket_path = socket_path or default_socket_path()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(self.socket_path)
+        self._file = self._sock.makefile("rwb")
+        self._ids = itertools.count(1)
+
+    def call(self, method, on_notify=None, **params):
+        """Send one request; notifications before the reply go to on_notify."""
+        request_id = next(self._ids)
+        self._file.write((json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method,
+                                      "params": params}) + "\n").encode())
+        self._file.flush()
+        for line in self._file:
+            message = json.loads(line)
+            if "id" not in message:
+                if on_notify:
+                    on_notify(message["params"])
+                continue
+            if "error" in message:
+                raise RPCError(message["error"]["code"], message["error"]["message"])
+            return message["result"]
+        raise ConnectionError("Daemon closed the connection")
+
+    def submit(self, path, strategy="1", passes=3, priority=0, **options):
+        return self.call("submit", path=path, strategy=strategy, passes=passes,
+                         priority=priority, options=options)
+
+    def wait(self, job_id, on_event=None, timeout=None):
+        return self.call("wait", on_notify=on_event, job_id=job_id, timeout=timeout)
+
+    def close(self):
+        self._file.close()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
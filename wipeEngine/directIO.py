@@ -0,0 +1,90 @@
+# wipeEngine/directIO.py
+import errno
+import mmap
+import os
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+
+# How overwrite passes treat the page cache
+BUFFERED = "buffered"    # plain buffered writes (fastest on an idle host)
+DIRECT = "direct"        # O_DIRECT for aligned chunks; falls back to DONTNEED
+DONTNEED = "dontneed"    # buffered, but synced ranges are dropped from the cache
+
+IO_MODES = (BUFFERED, DIRECT, DONTNEED)
+
+# Offsets, lengths and buffers of O_DIRECT writes are multiples of this.
+# Page-sized also covers 512-byte sector devices; BufferPool buffers are
+# page-aligned mmaps.
+ALIGNMENT = mmap.PAGESIZE
+
+_O_DIRECT = getattr(os, "O_DIRECT", 0)
+
+
+def dontneed(fd, offset=0, length=0):
+    """Drop cached pages of [offset, offset + length) (0 = to the end); no-op where unsupported."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, offset, length, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
+
+
+class DirectIO:
+    """
+    O_DIRECT switched on for one open descriptor (Linux). Aligned chunks go
+    straight to the device; unaligned ones (the file's tail, a retried short
+    write) are written with O_DIRECT briefly cleared, so they pass through
+    the page cache and are dropped after the pass is synced.
+    """
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.flags = fcntl.fcntl(fd, fcntl.F_GETFL)
+        self.unaligned_bytes = 0
+
+    @classmethod
+    def enable(cls, fd):
+        """A DirectIO for fd, or None if this OS or filesystem has no O_DIRECT (e.g. tmpfs)."""
+        if not _O_DIRECT or fcntl is None:
+            return None
+        direct = cls(fd)
+        try:
+            fcntl.fcntl(fd, fcntl.F_SETFL, direct.flags | _O_DIRECT)
+        except OSError:
+            return None
+        return direct
+
+    def _buffered_pwrite(self, view, offset):
+        fcntl.fcntl(self.fd, fcntl.F_SETFL, self.flags)
+        try:
+            written = os.pwrite(self.fd, view, offset)
+        finally:
+            fcntl.fcntl(self.fd, fcntl.F_SETFL, self.flags | _O_DIRECT)
+        self.unaligned_bytes += written
+        return written
+
+    def pwrite(self, view, offset):
+        if offset % ALIGNMENT:
+            return self._buffered_pwrite(view, offset)
+        head = len(view) - len(view) % ALIGNMENT
+        if head == 0:
+            return self._buffered_pwrite(view, offset)
+        try:
+            if head < len(view):
+                # Aligned blocks direct, then only the sub-block remainder buffered
+                written = os.pwrite(self.fd, view[:head], offset)
+                if written < head:
+                    return written
+                return written + self._buffered_pwrite(view[head:], offset + head)
+            return os.pwrite(self.fd, view, offset)
+        except OSError as e:
+            # Buffer not aligned in memory: take the buffered path for this one
+            if e.errno != errno.EINVAL:
+                raise
+            return self._buffered_pwrite(view, offset)
+
+    def disable(self):
+        fcntl.fcntl(self.fd, fcntl.F_SETFL, self.flags)
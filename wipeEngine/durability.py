@@ -0,0 +1,131 @@
+# wipeEngine/durability.py
+import ctypes
+import os
+import time
+from wipeEngine.directIO import dontneed
+
+# How each overwrite pass reaches the disk
+NONE = "none"          # leave it to the page cache (fastest, no assurance)
+PER_PASS = "pass"      # fdatasync after every pass
+RANGE = "range"        # sync_file_range windows during the pass, fdatasync at its end
+FINAL = "final"        # one fdatasync after the last pass
+
+POLICIES = (NONE, PER_PASS, RANGE, FINAL)
+
+# Bytes between mid-pass durable points (sync_file_range windows)
+DURABLE_WINDOW = 64 * 1024 * 1024
+
+# <linux/fs.h> sync_file_range flags
+_SFR_WAIT_BEFORE = 1
+_SFR_WRITE = 2
+_SFR_WAIT_AFTER = 4
+
+_sync_file_range = None
+if hasattr(os, "fdatasync"):
+    try:
+        _libc = ctypes.CDLL(None, use_errno=True)
+        _sync_file_range = _libc.sync_file_range
+        _sync_file_range.argtypes = [ctypes.c_int, ctypes.c_int64, ctypes.c_int64, ctypes.c_uint]
+        _sync_file_range.restype = ctypes.c_int
+    except (OSError, AttributeError):
+        _sync_file_range = None
+
+
+def datasync(fd):
+    """fdatasync where available, fsync elsewhere (macOS, Windows)."""
+    if hasattr(os, "fdatasync"):
+        os.fdatasync(fd)
+    else:
+        os.fsync(fd)
+
+
+class Syncer:
+    """
+    Apply a durability policy to one open file and time every sync.
+    The strategy calls wrote() after each chunk, end_pass() after each pass
+    and finish() once all passes are written. `on_durable(offset)` is called
+    whenever a synced window makes the pass durable up to offset; those
+    windows are synced with fdatasync, since sync_file_range does not
+    flush the device's write cache and a resumed pass (random ones are not
+    re-checked) trusts the offset.
+    Under PER_PASS such windows are only synced when `on_durable` is set
+    (a checkpointed run), so an interrupted pass resumes from its last
+    window instead of from the start; NONE and FINAL never record one.
+    With `drop_cache`, every synced range (and the file after each pass)
+    is dropped from the page cache with POSIX_FADV_DONTNEED.
+    """
+
+    def __init__(self, fd, policy=PER_PASS, window=None, on_durable=None,
+                 drop_cache=False):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown durability policy: {policy}")
+        self.fd = fd
+        self.policy = policy
+        self.window = window or DURABLE_WINDOW
+        self.on_durable = on_durable
+        self.drop_cache = drop_cache
+        self.sync_time = 0.0
+        self.syncs = 0
+        self.latencies = []      # seconds per sync call, for the metrics histogram
+        self._window_start = 0
+        self._window_end = 0
+        # Mid-pass durable points: always for RANGE, for PER_PASS when checkpointed
+        self._ranged = policy == RANGE or (policy == PER_PASS and on_durable is not None)
+
+    def _timed(self, func, *args):
+        start = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - start
+        self.sync_time += elapsed
+        self.latencies.append(elapsed)
+        self.syncs += 1
+
+    def _flush_range(self):
+        length = self._window_end - self._window_start
+        if length <= 0:
+            return
+        if _sync_file_range is not None and self.on_durable is None:
+            flags = _SFR_WAIT_BEFORE | _SFR_WRITE | _SFR_WAIT_AFTER
+
+            def sfr():
+                if _sync_file_range(self.fd, self._window_start, length, flags) != 0:
+                    err = ctypes.get_errno()
+                    raise OSError(err, os.strerror(err))
+            self._timed(sfr)
+        else:
+            # A resume point must survive power loss: sync_file_range leaves
+            # the data in the drive's write cache, fdatasync flushes it
+            self._timed(datasync, self.fd)
+        if self.drop_cache:
+            dontneed(self.fd, self._window_start, length)
+        self._window_start = self._window_end
+        if self.on_durable is not None:
+            self.on_durable(self._window_end)
+
+    def wrote(self, offset, length):
+        """Record a written range; RANGE flushes every `window` bytes."""
+        if not self._ranged:
+            return
+        if offset != self._window_end:
+            self._flush_range()
+            self._window_start = offset
+        self._window_end = offset + length
+        if self._window_end - self._window_start >= self.window:
+            self._flush_range()
+
+    def end_pass(self):
+        if self.policy == RANGE:
+            self._flush_range()
+        # PER_PASS: the fdatasync below covers the rest of the pass
+        self._window_start = self._window_end = 0
+        if self.policy in (PER_PASS, RANGE):
+            self._timed(datasync, self.fd)
+        if self.drop_cache:
+            # Unsynced pages (none/final policies) are only queued for writeback
+            dontneed(self.fd)
+
+    def finish(self):
+        if self.policy == FINAL:
+            self._timed(datasync, self.fd)
+            if self.drop_cache:
+                dontneed(self.fd)
@@ -1,90 +1,490 @@
 # wipeEngine/engine.py
 import os
-from wipeEngine.strategies import AVAILABLE_STRATEGIES
-from wipeEngine.utils import classify_file
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
+import threading
+import time
+from array import array
+from wipeEngine.strategies import AVAILABLE_STRATEGIES, pass_patterns
+from wipeEngine.manifest import (DELETED, FAILED, SKIP, SYMLINK_POLICIES, UNLINK, WIPED,
+                                 Manifest, build_manifest)
+from wipeEngine.classifier import ClassificationCache
+from wipeEngine.scheduler import WipeScheduler
+from wipeEngine.durability import PER_PASS, POLICIES
+from wipeEngine.directIO import BUFFERED, IO_MODES
+from wipeEngine.governor import io_priority
+from wipeEngine.verify import MODES as VERIFY_MODES
+from wipeEngine.extents import EXTENTS, FULL, POLICIES as EXTENT_POLICIES
+from wipeEngine.journal import JournalView, WipeJournal
+from wipeEngine.checkpoint import CheckpointJournal
+from wipeEngine.stateDir import new_run_id, run_journal_path
+from wipeEngine.freeSpace import wipe_free_space
+from wipeEngine.autotune import (DEFAULT_CHUNK_SIZE, DEFAULT_QUEUE_DEPTH, calibrate,
+                                 device_key, profile_for)
+from wipeEngine.metrics import Metrics, ProgressView, profiled
+from wipeEngine.smallFiles import SMALL_FILE_LIMIT, make_batches, wipe_small_files
 from wipeEngine import strategies
 
+_FAST_PATH = hasattr(os, "pwrite")
+
 class WipeEngine:
-    def __init__(self, strategy_key, passes=3, chunk_size=1024*1024):
+    def __init__(self, strategy_key, passes=3, chunk_size=None,
+                 workers=4, per_device_workers=None, largest_first=True,
+                 durability=PER_PASS, report_file="wipe_report.pdf",
+                 journal_file=None, generate_report=True,
+                 verify=None, verify_percent=10, queue_depth=None,
+                 extent_policy=EXTENTS, device_profiles=None, metrics=None,
+                 profile=None, profile_output=None, progress_interval=1.0,
+                 classification_cache=None, small_file_limit=SMALL_FILE_LIMIT,
+                 symlink_policy=UNLINK, io_mode=BUFFERED, governor=None,
+                 manifest_spill_threshold=None, manifest_spill_dir=None):
         if strategy_key not in AVAILABLE_STRATEGIES:
             raise ValueError("Invalid strategy key")
+        if durability not in POLICIES:
+            raise ValueError(f"Invalid durability policy {durability}")
+        if verify is not None and verify not in VERIFY_MODES:
+            raise ValueError(f"Invalid verification mode {verify}")
+        if extent_policy not in EXTENT_POLICIES:
+            raise ValueError(f"Invalid extent policy {extent_policy}")
+        if symlink_policy not in SYMLINK_POLICIES:
+            raise ValueError(f"Invalid symlink policy {symlink_policy}")
+        if io_mode not in IO_MODES:
+            raise ValueError(f"Invalid I/O mode {io_mode}")
         self.strategy_key = strategy_key
         self.strategy_name, self.strategy_func = AVAILABLE_STRATEGIES[strategy_key]
-        self.passes = passes
+        # Compiled schemes (DoD, Gutmann, custom) fix their own pass count
+        fixed = getattr(self.strategy_func, "patterns", None)
+        self.passes = len(fixed) if fixed else passes
         self.chunk_size = chunk_size
+        self.durability = durability
+        self.workers = workers
+        self.report_file = report_file
+        # None: a new journal per run under the state dir (see wipeEngine.stateDir)
+        self.journal_file = journal_file
+        self.last_journal = None
+        # False = report-free mode: reportlab is never imported
+        self.generate_report = generate_report
+        # Read-back check after wiping: None, "full", "sampled" or "tail"
+        self.verify = verify
+        self.verify_percent = verify_percent
+        # Buffers generated ahead of the writer for random passes (1 = serial)
+        self.queue_depth = queue_depth
+        # {device_key: {"chunk_size", "queue_depth", ...}} from calibrate();
+        # used wherever chunk_size / queue_depth are left as None
+        self.device_profiles = device_profiles if device_profiles is not None else {}
+        # "extents": skip holes of sparse files, "full": overwrite [0, size)
+        self.extent_policy = extent_policy
+        # Per-file/per-pass numbers for the sinks (see wipeEngine.metrics)
+        self.metrics = metrics if metrics is not None else Metrics()
+        # None, "cprofile" or "tracemalloc" around each wipe_folder() run
+        self.profile = profile
+        self.profile_output = profile_output
+        # Seconds between console progress lines
+        self.progress_interval = progress_interval
+        # JSON file memoising file categories by (dev, ino, mtime, size)
+        self.classification_cache = classification_cache
+        # Files up to this size are wiped in per-directory batches (0 = off)
+        self.small_file_limit = small_file_limit
+        # "skip", "unlink" or "follow" (see wipeEngine.manifest)
+        self.symlink_policy = symlink_policy
+        # "buffered", "direct" (O_DIRECT) or "dontneed" (see wipeEngine.directIO)
+        self.io_mode = io_mode
+        # Shared bytes/s + ops/s budget and ionice class (see wipeEngine.governor)
+        self.governor = governor
+        # Scans of more files than this keep their manifest in a mapped temp file
+        self.manifest_spill_threshold = manifest_spill_threshold
+        self.manifest_spill_dir = manifest_spill_dir
+        self._cancel = None     # cancel Event of the run in progress
+        self.scheduler = WipeScheduler(
+            max_workers=workers,
+            per_device=per_device_workers,
+            largest_first=largest_first
+        )
+
+    # ------------------- Device tuning -------------------
+    def tuning(self, st_dev):
+        """
+        (chunk_size, queue_depth) for files on st_dev: explicit settings
+        first, then the device's calibrated profile, then the defaults.
+        """
+        profile = profile_for(self.device_profiles, st_dev) or {}
+        chunk_size = self.chunk_size or profile.get("chunk_size") or DEFAULT_CHUNK_SIZE
+        queue_depth = self.queue_depth or profile.get("queue_depth") or DEFAULT_QUEUE_DEPTH
+        if self.governor is not None:
+            chunk_size = self.governor.chunk_cap(chunk_size)
+        return chunk_size, queue_depth
+
+    def calibrate(self, directory, **options):
+        """Measure the device holding `directory` and cache its profile; returns (key, profile)"""
+        key = device_key(os.stat(directory).st_dev)
+        print(f"🧪 Calibrating {key} in {directory} ...")
+        profile = calibrate(directory, **options)
+        self.device_profiles[key] = profile
+        print(f"✅ {key}: chunk size {profile['chunk_size']} bytes, queue depth "
+              f"{profile['queue_depth']} ({profile['rate']} MB/s)")
+        return key, profile
+
+    def cancel(self):
+        """
+        Stop the current wipe_folder() run (callable from any thread): files
+        already being wiped finish, the others are left untouched and get no
+        row. A checkpointed run keeps its checkpoint for resume(). Returns
+        False, and changes nothing, when no run is in progress.
+        """
+        event = self._cancel
+        if event is None:
+            return False
+        event.set()
+        return True
 
     # ------------------- Scan folder -------------------
     def scan_folder(self, folder_path):
-        """Scan folder and return list of files with metadata"""
-        files_list = []
-        if os.path.isfile(folder_path):
-            files_list.append(folder_path)
-        else:
-            for root, dirs, files in os.walk(folder_path):
-                for f in files:
-                    files_list.append(os.path.join(root, f))
-        report = []
-        for fpath in files_list:
-            size = os.path.getsize(fpath)
-            category = classify_file(fpath)
-            report.append({"path": fpath, "size": size, "category": category})
-        return report
+        """Scan folder once and return a Manifest of files with metadata"""
+        return build_manifest(folder_path, workers=self.workers, cache=self._cache(),
+                              symlink_policy=self.symlink_policy,
+                              spill_threshold=self.manifest_spill_threshold,
+                              spill_dir=self.manifest_spill_dir)
+
+    def _cache(self):
+        if not self.classification_cache:
+            return None
+        return ClassificationCache(self.classification_cache)
 
     # ------------------- Wipe folder -------------------
-    def wipe_folder(self, folder_path, strategy_func=None, delete=True, hexdump_func=None):
-        """Wipe folder or file and generate PDF report at the end"""
+    def wipe_folder(self, folder_path, strategy_func=None, delete=True, hexdump_func=None,
+                    evidence_func=None, checkpoint_file=None, cancel_event=None, _resume_state=None):
+        """
+        Wipe folder or file and generate PDF report at the end.
+        `folder_path` may be a Manifest from scan_folder(), which avoids a
+        second walk and wipes exactly the files that were shown.
+        `evidence_func(path)` (e.g. fileManager.utils.sample_evidence) is
+        called before and after the wipe; its samples go into the report rows.
+        With `checkpoint_file`, finished files and durable offsets are
+        journaled so an interrupted run can be continued with resume(); the
+        checkpoint is removed once a run completes with no failed file.
+        Returns a JournalView: the result rows in manifest order (aliases
+        after their file, then the symlinks), read back from the journal.
+        See cancel() to stop a run from another thread, or pass a
+        `cancel_event` (threading.Event) owned by the caller, which may be
+        set before the run even starts.
+        """
         if strategy_func is None:
             strategy_func = self.strategy_func
+        cancel = cancel_event if cancel_event is not None else threading.Event()
+        self._cancel = cancel
 
         # Prepare target files
-        if os.path.isfile(folder_path):
-            targets = [folder_path]
+        if isinstance(folder_path, Manifest):
+            manifest = folder_path
         else:
-            targets = []
-            for root, dirs, files in os.walk(folder_path):
-                for f in files:
-                    targets.append(os.path.join(root, f))
+            manifest = self.scan_folder(folder_path)
+        # The extents policy skips holes, so progress and ETA count allocated data only
+        per_pass = manifest.total_data if self.extent_policy == EXTENTS else manifest.total_size
+        view = ProgressView(len(manifest), per_pass * self.passes, self.progress_interval)
 
-        # Prepare report data
-        report_data = []
+        # Every result is streamed to the journal as soon as it is known;
+        # only its offset is kept, per manifest row
+        if _resume_state and _resume_state["settings"].get("journal_file"):
+            journal_file = _resume_state["settings"]["journal_file"]
+        else:
+            journal_file = self.journal_file or run_journal_path(new_run_id())
+        self.last_journal = journal_file
+        journal = WipeJournal(journal_file, mode="a" if _resume_state else "w")
+        offsets = array("q", [-1]) * manifest.rows
+        alias_offsets = {}
+        link_offsets = array("q")
 
-        for fpath in targets:
-            size = os.path.getsize(fpath)
-            category = classify_file(fpath)
+        checkpoint = None
+        partial = {}
+        if checkpoint_file:
+            if _resume_state:
+                checkpoint = CheckpointJournal(checkpoint_file, mode="a")
+                partial = _resume_state["partial"]
+            else:
+                checkpoint = CheckpointJournal(checkpoint_file)
+                checkpoint.start_run({
+                    "root": manifest.root,
+                    "strategy_key": self.strategy_key,
+                    "passes": self.passes,
+                    "chunk_size": self.chunk_size,
+                    "durability": self.durability,
+                    "extent_policy": self.extent_policy,
+                    "symlink_policy": self.symlink_policy,
+                    "io_mode": self.io_mode,
+                    "journal_file": journal_file,
+                    "delete": delete
+                })
+
+        def sample(func, fpath, *args):
+            # Evidence is best effort: a file gone or unreadable since the
+            # scan gets no sample and fails (with its row) in the wipe itself
+            try:
+                return func(fpath, *args)
+            except OSError as e:
+                print(f"⚠️ No evidence for {fpath}: {e}")
+                return None
 
-            # 🔎 BEFORE WIPE HEXDUMP
+        def before(job):
+            # 🔎 BEFORE WIPE HEXDUMP / EVIDENCE
+            fpath = job["path"]
             if hexdump_func:
-                hexdump_func(fpath, f"--- BEFORE WIPE ({fpath}) ---")
+                sample(hexdump_func, fpath, f"--- BEFORE WIPE ({fpath}) ---")
+            return sample(evidence_func, fpath) if evidence_func else None
 
-            try:
-                strategy_func(fpath, delete=delete)
-                deleted = delete
-            except Exception as e:
-                print(f"❌ Failed to wipe {fpath}: {e}")
-                deleted = False
+        def finish(job, wiped, stats, started, queued, evidence_before):
+            fpath = job["path"]
+            deleted = delete and wiped
+            if checkpoint and wiped:
+                checkpoint.done(fpath)
 
             # 🔎 AFTER WIPE HEXDUMP (if not deleted)
             if hexdump_func and not deleted:
-                hexdump_func(fpath, f"--- AFTER WIPE ({fpath}) ---")
-            elif deleted:
+                sample(hexdump_func, fpath, f"--- AFTER WIPE ({fpath}) ---")
+            elif hexdump_func:
                 print(f"--- AFTER WIPE ({fpath}) ---")
                 print("File has been removed ✅")
+            evidence_after = sample(evidence_func, fpath) if evidence_func and not deleted else None
 
-            report_data.append({
+            row = {
+                "finished": time.time(),
                 "path": fpath,
-                "category": category,
-                "size": size,
-                "deleted": deleted
-            })
+                "category": job["category"],
+                "size": job["size"],
+                "deleted": deleted,
+                "wiped": wiped,
+                "sync_time": stats.get("sync_time", 0.0),
+                "verified": stats.get("verified"),
+                "verify_rate": stats.get("verify_rate", 0.0)
+            }
+            if evidence_func:
+                row["evidence_before"] = evidence_before
+                row["evidence_after"] = evidence_after
+            offsets[job.row] = journal.append(row)
+            manifest.set_status(job.row, DELETED if deleted else WIPED if wiped else FAILED)
+            self.metrics.record_file(fpath, wiped, time.perf_counter() - started, queued, stats)
+            view.update(stats.get("bytes_written", 0), wiped)
+            if "aliases" in job:
+                alias_offsets[job.row] = [journal.append(alias_row(row, alias))
+                                          for alias in job["aliases"]]
+
+        def alias_row(row, alias):
+            # 🔗 Other paths to the same inode: already overwritten, only unlinked
+            apath = alias["path"]
+            unlinked = False
+            if row["deleted"]:
+                try:
+                    os.unlink(apath)
+                    unlinked = True
+                except FileNotFoundError:
+                    unlinked = True
+                except OSError as e:
+                    print(f"⚠️ Could not unlink {apath}: {e}")
+            if checkpoint and row["wiped"]:
+                checkpoint.done(apath)
+            arow = {key: value for key, value in row.items() if not key.startswith("evidence_")}
+            arow.update(path=apath, deleted=unlinked, alias_of=row["path"], link=alias["link"],
+                        sync_time=0.0)
+            return arow
+
+        def symlink_rows():
+            # Symlinks that were not followed: removed per policy, targets untouched
+            for link in manifest.symlinks:
+                unlinked = False
+                if delete and manifest.symlink_policy != SKIP:
+                    try:
+                        os.unlink(link["path"])
+                        unlinked = True
+                    except OSError as e:
+                        print(f"⚠️ Could not unlink {link['path']}: {e}")
+                row = {
+                    "finished": time.time(),
+                    "path": link["path"],
+                    "category": "Symlink",
+                    "size": 0,
+                    "deleted": unlinked,
+                    "wiped": False,
+                    "skipped": True,
+                    "target": link["target"],
+                    "sync_time": 0.0,
+                    "verified": None,
+                    "verify_rate": 0.0
+                }
+                link_offsets.append(journal.append(row))
 
-        # Generate PDF once at the end
-        self._generate_pdf(report_data)
+        def wipe_one(job):
+            started = time.perf_counter()
+            fpath = job["path"]
+            evidence_before = before(job)
 
-        return report_data
+            stats = {}
+            resume_options = {}
+            if checkpoint:
+                start_pass, start_offset = partial.get(fpath, (0, 0))
+                resume_options = {
+                    "start_pass": start_pass,
+                    "start_offset": start_offset,
+                    "progress": lambda p, o: checkpoint.progress(fpath, p, o)
+                }
+            chunk_size, queue_depth = self.tuning(job["dev"])
+            try:
+                wiped = strategy_func(
+                    fpath,
+                    delete=delete,
+                    passes=self.passes,
+                    chunk_size=chunk_size,
+                    durability=self.durability,
+                    identity=(job["dev"], job["ino"]),
+                    verify=self.verify,
+                    verify_percent=self.verify_percent,
+                    queue_depth=queue_depth,
+                    extent_policy=self.extent_policy,
+                    io_mode=self.io_mode,
+                    governor=self.governor,
+                    stats=stats,
+                    verbose=False,  # the progress view replaces per-pass lines
+                    **resume_options
+                ) is not False
+            except Exception as e:
+                print(f"❌ Failed to wipe {fpath}: {e}")
+                wiped = False
+            finish(job, wiped, stats, started, started - run_start, evidence_before)
+
+        def wipe_batch(batch):
+            # ⚡ Small files: one directory fd, one open and one pwrite per pass each
+            queued = time.perf_counter() - run_start
+            evidence = {job["path"]: before(job) for job in batch["jobs"]}
+            started = time.perf_counter()
+            for job, wiped, stats in wipe_small_files(batch, patterns, delete=delete,
+                                                      durability=self.durability,
+                                                      verify=self.verify,
+                                                      verify_passes=verify_passes,
+                                                      io_mode=self.io_mode,
+                                                      governor=self.governor,
+                                                      limit=self.small_file_limit):
+                finish(job, wiped, stats, started, queued, evidence[job["path"]])
+                started = time.perf_counter()
+
+        # Small files are batched per directory; the rest go one job per file.
+        # Entries and batches are made as the workers take them, not up front
+        patterns = pass_patterns(strategy_func, self.passes)
+        verify_passes = getattr(strategy_func, "verify_passes", ())
+        work = make_batches(manifest, lambda job: self._small(job, patterns) and job["path"] not in partial)
+
+        run_start = time.perf_counter()
+        throttled = self.governor.waited if self.governor is not None else 0.0
+        try:
+            # Worker threads start inside and inherit the ionice class
+            with io_priority(self._ioprio()), profiled(self.profile, self.profile_output) as wrap:
+                # Batches are dicts, single files are manifest Entry views
+                run_item = wrap(lambda item: None if cancel.is_set() else
+                                wipe_batch(item) if isinstance(item, dict) else wipe_one(item))
+                self.scheduler.run(work, run_item)
+            cancelled = cancel.is_set()
+            if cancelled:
+                print(f"🛑 Cancelled: {view.total_files - view.files} files left untouched")
+            else:
+                symlink_rows()
+                if checkpoint:
+                    checkpoint.complete()
+        finally:
+            self._cancel = None
+            journal.close()
+            if checkpoint:
+                checkpoint.close()
+            view.finish()
+            self.metrics.end_run()
+            if self.governor is not None and self.governor.waited > throttled:
+                print(f"⏱️ Throttled for {self.governor.waited - throttled:.1f}s to stay within "
+                      f"{self.governor.limits}")
+
+        # Nothing left to resume: a clean run leaves no checkpoint behind
+        if checkpoint and not view.failed and not cancelled:
+            os.remove(checkpoint_file)
+
+        # Generate PDF once at the end, streamed from the journal
+        if self.generate_report:
+            self._generate_pdf(journal_file, manifest.root)
+
+        # Report rows come back in manifest order whatever the run order was
+        ordered = array("q")
+        for row in manifest.order:
+            if offsets[row] >= 0:
+                ordered.append(offsets[row])
+                ordered.extend(alias_offsets.get(row, ()))
+        ordered.extend(link_offsets)
+        return JournalView(journal_file, ordered)
+
+    def _ioprio(self):
+        return self.governor.ioprio if self.governor is not None else None
+
+    def _small(self, job, patterns):
+        """True if a job can take the small-file fast path."""
+        if patterns is None or not self.small_file_limit or not _FAST_PATH:
+            return False
+        if job["size"] > self.small_file_limit:
+            return False
+        # Sparse files keep the extent-aware path
+        return self.extent_policy == FULL or job.get("allocated", job["size"]) >= job["size"]
+
+    # ------------------- Resume -------------------
+    def resume(self, checkpoint_file, strategy_func=None, hexdump_func=None, evidence_func=None):
+        """
+        Continue an interrupted wipe_folder() run from its checkpoint file.
+        Finished files are skipped and partially wiped files restart at their
+        last durable pass/offset (the durable part is re-checked first).
+        The run's own strategy, passes, chunk size and durability are used.
+        """
+        state = CheckpointJournal.load(checkpoint_file)
+        settings = state["settings"]
+        if settings is None or state["complete"]:
+            print("✅ Nothing to resume: checkpoint is complete or empty")
+            return []
+
+        self.strategy_key = settings["strategy_key"]
+        self.strategy_name, self.strategy_func = AVAILABLE_STRATEGIES[self.strategy_key]
+        self.passes = settings["passes"]
+        self.chunk_size = settings["chunk_size"]
+        self.durability = settings["durability"]
+        self.extent_policy = settings.get("extent_policy", FULL)
+        self.symlink_policy = settings.get("symlink_policy", UNLINK)
+        self.io_mode = settings.get("io_mode", BUFFERED)
+
+        manifest = self.scan_folder(settings["root"])
+        remaining = manifest.subset(lambda e: e["path"] not in state["done"])
+        print(f"♻️ Resuming: {len(state['done'])} files done, {len(remaining)} left")
+        return self.wipe_folder(
+            remaining,
+            strategy_func=strategy_func,
+            delete=settings["delete"],
+            hexdump_func=hexdump_func,
+            evidence_func=evidence_func,
+            checkpoint_file=checkpoint_file,
+            _resume_state=state
+        )
+
+    # ------------------- Free space -------------------
+    def wipe_free_space(self, mount_point, reserve_bytes=256*1024*1024,
+                        filler_size=1024*1024*1024, streams=None):
+        """
+        Overwrite the free space of the filesystem holding `mount_point`
+        with this engine's strategy (see wipeEngine.freeSpace).
+        """
+        chunk_size, queue_depth = self.tuning(os.stat(mount_point).st_dev)
+        with io_priority(self._ioprio()):
+            return wipe_free_space(
+                mount_point,
+                self.strategy_func,
+                reserve_bytes=reserve_bytes,
+                filler_size=filler_size,
+                streams=streams or self.workers,
+                passes=self.passes,
+                chunk_size=chunk_size,
+                durability=self.durability,
+                verify=self.verify,
+                verify_percent=self.verify_percent,
+                queue_depth=queue_depth,
+                io_mode=self.io_mode,
+                governor=self.governor,
+                extent_policy=FULL  # fillers are fallocated: SEEK_DATA would skip them
+            )
 
     def run_wipe(self,file_path, strategy="1", delete=True, hexdump_func=None):
         """
@@ -109,28 +509,10 @@ class WipeEngine:
         else:
             print("File has been removed after wipe ✅")
     # ------------------- PDF Generation -------------------
-    def _generate_pdf(self, file_reports, output_file="wipe_report.pdf"):
-        styles = getSampleStyleSheet()
-        doc = SimpleDocTemplate(output_file, pagesize=A4)
-        elements = []
-
-        elements.append(Paragraph("🔒 Secure Wipe Report", styles['Title']))
-        elements.append(Spacer(1, 12))
-
-        # Table header
-        data = [["Path", "Category", "Size (bytes)", "Deleted"]]
-        for r in file_reports:
-            data.append([
-                r["path"], r["category"], str(r["size"]), "Yes" if r["deleted"] else "No"
-            ])
-
-        table = Table(data, colWidths=[250, 100, 80, 50])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.gray),
-            ('TEXTCOLOR',(0,0),(-1,0),colors.whitesmoke),
-            ('GRID', (0,0), (-1,-1), 1, colors.black),
-            ('ALIGN',(2,1),(-1,-1),'RIGHT'),
-        ]))
-
-        elements.append(table)
-        doc.build(elements)
+    def _generate_pdf(self, journal_file, target_path, output_file=None):
+        """Render the run's journal as a PDF; memory stays at one page of rows"""
+        # Imported here so scanning and wiping never pay for reportlab
+        from wipeEngine.reportGenerator import PDFReport
+
+        report = PDFReport(output_file or self.report_file, journal_file=journal_file)
+        report.finalize(strategy=self.strategy_name, target_path=target_path)
@@ -0,0 +1,46 @@
+# wipeEngine/extents.py
+import errno
+import os
+
+# Which byte ranges a strategy overwrites
+FULL = "full"         # [0, size) like before; holes become real blocks
+EXTENTS = "extents"   # only allocated data extents; sparse files stay sparse
+POLICIES = (FULL, EXTENTS)
+
+
+def data_extents(fd, size):
+    """
+    Return the allocated data ranges of an open file as [(start, end), ...]
+    using SEEK_DATA/SEEK_HOLE. Falls back to the whole file where the
+    platform or filesystem cannot report holes.
+    """
+    if size == 0:
+        return []
+    if not hasattr(os, "SEEK_DATA"):
+        return [(0, size)]
+    ranges = []
+    offset = 0
+    try:
+        while offset < size:
+            try:
+                start = os.lseek(fd, offset, os.SEEK_DATA)
+            except OSError as e:
+                if e.errno == errno.ENXIO:    # no data after offset
+                    break
+                raise
+            end = min(os.lseek(fd, start, os.SEEK_HOLE), size)
+            if end <= start:
+                break
+            ranges.append((start, end))
+            offset = end
+    except OSError as e:
+        if e.errno in (errno.EINVAL, errno.EOPNOTSUPP):
+            return [(0, size)]
+        raise
+    return ranges
+
+
+def allocated_size(st):
+    """Bytes actually allocated on disk for a stat result."""
+    blocks = getattr(st, "st_blocks", None)
+    return st.st_size if blocks is None else blocks * 512
@@ -0,0 +1,128 @@
+# wipeEngine/freeSpace.py
+import os
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from wipeEngine.extents import FULL
+
+FILLER_DIR = ".secure_wipe_fill"
+
+
+def _free_bytes(path):
+    return shutil.disk_usage(path).free
+
+
+def _preallocate(fd, size):
+    """Reserve `size` bytes up front so the overwrite cannot hit ENOSPC."""
+    if hasattr(os, "posix_fallocate"):
+        os.posix_fallocate(fd, 0, size)
+    else:
+        os.ftruncate(fd, size)
+
+
+class _Progress:
+    """Thread-safe byte counter printing at most once per `interval`."""
+
+    def __init__(self, total, interval=1.0):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.start = time.monotonic()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, nbytes):
+        with self._lock:
+            self.done += nbytes
+            now = time.monotonic()
+            if now - self._last >= self.interval:
+                self._last = now
+                self.print_line(now)
+
+    def print_line(self, now=None):
+        elapsed = (now or time.monotonic()) - self.start
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        pct = 100.0 * self.done / self.total if self.total else 100.0
+        print(f"🧹 Free space: {self.done / 1e6:.0f}/{self.total / 1e6:.0f} MB "
+              f"({pct:.1f}%) at {rate / 1e6:.1f} MB/s")
+
+
+def wipe_free_space(mount_point, strategy_func, reserve_bytes=256*1024*1024,
+                    filler_size=1024*1024*1024, streams=2, min_filler=1024*1024,
+                    **strategy_options):
+    """
+    Overwrite the unallocated space of the filesystem holding `mount_point`.
+
+    Filler files of up to `filler_size` are preallocated (fallocate) in a
+    hidden directory and overwritten with `strategy_func` on `streams`
+    parallel workers, until only `reserve_bytes` remain free. The fillers
+    are then removed. Fillers are written in full (extent_policy="full"),
+    since their unwritten preallocated blocks read as holes to SEEK_DATA.
+    Memory use is that of the strategy's buffer pool,
+    whatever the amount of free space.
+    Returns {"fillers", "bytes_written", "elapsed", "rate"}.
+    """
+    strategy_options["extent_policy"] = FULL
+    fill_dir = os.path.join(mount_point, f"{FILLER_DIR}.{os.getpid()}")
+    os.makedirs(fill_dir, exist_ok=False)
+    target = max(0, _free_bytes(mount_point) - reserve_bytes)
+    progress = _Progress(target)
+    alloc_lock = threading.Lock()
+    fillers = []
+    failures = []
+
+    def next_filler():
+        """Allocate the next filler under a lock; None once the reserve is reached."""
+        with alloc_lock:
+            size = min(filler_size, _free_bytes(mount_point) - reserve_bytes)
+            if size < min_filler:
+                return None
+            path = os.path.join(fill_dir, f"fill_{len(fillers):06d}")
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o600)
+            try:
+                _preallocate(fd, size)
+            except OSError:
+                os.close(fd)
+                os.remove(path)
+                return None
+            os.close(fd)
+            fillers.append(path)
+            return path, size
+
+    def stream():
+        while not failures:
+            filler = next_filler()
+            if filler is None:
+                return
+            path, size = filler
+            if strategy_func(path, delete=False, **strategy_options) is False:
+                failures.append(path)
+                return
+            progress.add(size)
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, streams)) as pool:
+            for future in [pool.submit(stream) for _ in range(max(1, streams))]:
+                future.result()
+    finally:
+        for path in fillers:
+            try:
+                os.remove(path)
+            except OSError as e:
+                print(f"⚠️ Could not remove filler {path}: {e}")
+        try:
+            os.rmdir(fill_dir)
+        except OSError as e:
+            print(f"⚠️ Could not remove {fill_dir}: {e}")
+
+    progress.print_line()
+    if failures:
+        raise OSError(f"Free-space wipe failed on {failures[0]}")
+    elapsed = time.monotonic() - progress.start
+    return {
+        "fillers": len(fillers),
+        "bytes_written": progress.done,
+        "elapsed": elapsed,
+        "rate": progress.done / elapsed if elapsed > 0 else 0.0
+    }
@@ -0,0 +1,267 @@
+# wipeEngine/governor.py
+import ctypes
+import datetime
+import os
+import platform
+import threading
+import time
+from contextlib import contextmanager
+
+# A bucket holds this many seconds of its rate, so short pauses (a sync,
+# a scheduler hand-off) can be caught up without exceeding the average
+BURST_SECONDS = 0.25
+# Throttled writes are cut to at most this share of a second's byte budget,
+# so a low limit means small steady writes instead of long bursts and stalls
+CHUNK_SECONDS = 0.1
+MIN_CHUNK = 64 * 1024
+
+_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+
+
+def parse_rate(value):
+    """None, a number, or a string such as "50M" / "200K" (binary units) per second."""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    text = str(value).strip().upper().removesuffix("/S").removesuffix("B")
+    if not text or text in ("NONE", "NULL", "0"):
+        return None
+    unit = text[-1] if text[-1] in _UNITS else ""
+    return float(text[:len(text) - len(unit)]) * _UNITS[unit]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Callers reserve what they need and sleep off
+    any debt, so a request larger than the burst still goes through and
+    concurrent callers queue up fairly behind each other's reservations.
+    rate=None means unlimited.
+    """
+
+    def __init__(self, rate=None, burst_seconds=BURST_SECONDS):
+        self.burst_seconds = burst_seconds
+        self._lock = threading.Lock()
+        self._stamp = time.monotonic()
+        self.rate = rate
+        self._tokens = self.capacity
+
+    @property
+    def capacity(self):
+        return self.rate * self.burst_seconds if self.rate else 0.0
+
+    def _refill(self, now):
+        if self.rate:
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def set_rate(self, rate):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self._tokens = min(self._tokens, self.capacity)
+
+    def reserve(self, amount):
+        """Take `amount` tokens; returns the seconds the caller must wait."""
+        with self._lock:
+            if not self.rate:
+                return 0.0
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= amount
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+
+# ------------------- Scheduling windows -------------------
+def _minutes(text):
+    hours, _, minutes = text.partition(":")
+    return int(hours) * 60 + int(minutes or 0)
+
+
+class Window:
+    """
+    Daily time range ("22:00-06:00" wraps past midnight) with optional
+    limits of its own; keys left out keep the governor's base limits.
+    """
+
+    def __init__(self, spec):
+        if isinstance(spec, str):
+            spec = {"time": spec}
+        start, _, end = spec["time"].partition("-")
+        self.start, self.end = _minutes(start), _minutes(end)
+        self.limits = {key: parse_rate(spec[key]) for key in ("bytes_per_sec", "ops_per_sec")
+                       if key in spec}
+
+    def contains(self, minute):
+        if self.start <= self.end:
+            return self.start <= minute < self.end
+        return minute >= self.start or minute < self.end
+
+    def seconds_until_open(self, now):
+        minute = now.hour * 60 + now.minute
+        wait = (self.start - minute) % (24 * 60)
+        return wait * 60 - now.second
+
+
+# ------------------- I/O priority -------------------
+IOPRIO_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+# (ioprio_set, ioprio_get) syscall numbers
+_IOPRIO_SYSCALLS = {"x86_64": (251, 252), "aarch64": (30, 31), "i686": (289, 290),
+                    "i386": (289, 290), "armv7l": (314, 315), "ppc64le": (273, 274),
+                    "s390x": (282, 283), "riscv64": (30, 31)}
+_libc = None
+
+
+def _syscall(number, *args):
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(None, use_errno=True)
+    result = _libc.syscall(number, *args)
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return result
+
+
+def parse_ioprio(spec):
+    """ionice-style "idle", "best-effort[:0-7]" or "realtime[:0-7]" -> ioprio value."""
+    name, _, level = spec.partition(":")
+    if name not in IOPRIO_CLASSES:
+        raise ValueError(f"Unknown I/O priority class {name}")
+    level = int(level or 4)
+    if not 0 <= level <= 7:
+        raise ValueError(f"I/O priority level must be 0-7, got {level}")
+    return IOPRIO_CLASSES[name] << _IOPRIO_CLASS_SHIFT | (0 if name == "idle" else level)
+
+
+@contextmanager
+def io_priority(spec):
+    """
+    Run the block under an ionice class (Linux; a no-op elsewhere). The
+    priority is per thread and inherited by threads started inside the
+    block, i.e. every worker of a run; the old one is restored afterwards.
+    """
+    numbers = _IOPRIO_SYSCALLS.get(platform.machine()) if spec else None
+    if numbers is None or not platform.system() == "Linux":
+        if spec:
+            print(f"⚠️ I/O priority {spec} not supported here, ignoring it")
+        yield
+        return
+    value = parse_ioprio(spec)
+    set_nr, get_nr = numbers
+    try:
+        previous = _syscall(get_nr, _IOPRIO_WHO_PROCESS, 0)
+        _syscall(set_nr, _IOPRIO_WHO_PROCESS, 0, value)
+    except OSError as e:
+        print(f"⚠️ Could not set I/O priority {spec}: {e}")
+        yield
+        return
+    try:
+        yield
+    finally:
+        try:
+            _syscall(set_nr, _IOPRIO_WHO_PROCESS, 0, previous)
+        except OSError:
+            pass
+
+
+# ------------------- Governor -------------------
+class IOGovernor:
+    """
+    Shared I/O budget for every worker and pass of one engine (or of all
+    jobs of the daemon): a token bucket on bytes/s and one on ops/s.
+    throttle() is called before each write or read-back chunk and sleeps
+    just long enough to keep the average at the limits. With `windows`,
+    I/O only runs inside those daily windows, each optionally with its
+    own limits. set_limits() changes the base limits while wiping.
+    """
+
+    def __init__(self, bytes_per_sec=None, ops_per_sec=None, windows=None, ioprio=None,
+                 burst_seconds=BURST_SECONDS):
+        if ioprio:
+            parse_ioprio(ioprio)    # fail early on a bad setting
+        self.ioprio = ioprio
+        self.windows = [Window(w) for w in windows or ()]
+        self.limits = {"bytes_per_sec": parse_rate(bytes_per_sec),
+                       "ops_per_sec": parse_rate(ops_per_sec)}
+        self.bytes = TokenBucket(self.limits["bytes_per_sec"], burst_seconds)
+        self.ops = TokenBucket(self.limits["ops_per_sec"], burst_seconds)
+        self.waited = 0.0
+        self._lock = threading.Lock()
+        self._active = None     # window whose limits are applied
+
+    def set_limits(self, **limits):
+        """Change bytes_per_sec / ops_per_sec (None = unlimited) at runtime."""
+        with self._lock:
+            for key, value in limits.items():
+                if key not in self.limits:
+                    raise ValueError(f"Unknown limit {key}")
+                self.limits[key] = parse_rate(value)
+            self._apply(self._active)
+        return dict(self.limits)
+
+    def _apply(self, window):
+        effective = dict(self.limits)
+        if window is not None:
+            effective.update(window.limits)
+        self.bytes.set_rate(effective["bytes_per_sec"])
+        self.ops.set_rate(effective["ops_per_sec"])
+        self._active = window
+
+    def _wait_for_window(self):
+        """Sleep until a window is open and switch to its limits; returns seconds slept."""
+        slept = 0.0
+        while True:
+            now = datetime.datetime.now()
+            minute = now.hour * 60 + now.minute
+            window = next((w for w in self.windows if w.contains(minute)), None)
+            if window is not None:
+                with self._lock:
+                    if window is not self._active:
+                        self._apply(window)
+                return slept
+            pause = min(w.seconds_until_open(now) for w in self.windows)
+            pause = max(1, min(pause, 60))
+            time.sleep(pause)
+            slept += pause
+
+    def chunk_cap(self, chunk_size):
+        """Chunk size that keeps throttled writes small and steady."""
+        rate = self.bytes.rate
+        if not rate:
+            return chunk_size
+        cap = max(MIN_CHUNK, int(rate * CHUNK_SECONDS) // MIN_CHUNK * MIN_CHUNK)
+        return min(chunk_size, cap)
+
+    def throttle(self, nbytes, ops=1, waits=None):
+        """
+        Account one I/O of `nbytes`; blocks while over budget or outside the
+        windows. A request larger than chunk_cap() is paid for in slices, so
+        a limit changed while it waits applies to the rest of it.
+        """
+        waited = self._wait_for_window() if self.windows else 0.0
+        delay = self.ops.reserve(ops)
+        left = nbytes
+        while True:
+            piece = self.chunk_cap(left)
+            delay = max(delay, self.bytes.reserve(piece))
+            left -= piece
+            if delay > 0:
+                time.sleep(delay)
+                waited += delay
+                delay = 0.0
+            if left <= 0:
+                break
+        if waited:
+            with self._lock:
+                self.waited += waited
+            if waits is not None:
+                waits["throttle_wait"] = waits.get("throttle_wait", 0.0) + waited
+        return waited
+
+
+def make_governor(bytes_per_sec=None, ops_per_sec=None, windows=None, ioprio=None):
+    """An IOGovernor for these settings, or None when none is set (full speed)."""
+    if not (parse_rate(bytes_per_sec) or parse_rate(ops_per_sec) or windows or ioprio):
+        return None
+    return IOGovernor(bytes_per_sec, ops_per_sec, windows, ioprio)
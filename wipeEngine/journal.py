@@ -0,0 +1,104 @@
+# wipeEngine/journal.py
+import json
+import os
+import threading
+
+
+def read_records(path):
+    """Stream the records of a journal file (e.g. a finished run's) one dict at a time."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def read_pages(path, page_size):
+    """Stream the records of a journal file in lists of at most page_size."""
+    page = []
+    for record in read_records(path):
+        page.append(record)
+        if len(page) == page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+class WipeJournal:
+    """
+    Append-only JSON-lines log of per-file wipe results.
+
+    Records are written as they happen and never kept in memory; reports
+    stream them back with records() or pages() in fixed-size batches, or
+    in any other order through a JournalView of their byte offsets.
+    """
+
+    def __init__(self, path, mode="w"):
+        self.path = path
+        self._file = open(path, mode + "b")
+        self._lock = threading.Lock()
+        self._offset = self._file.seek(0, os.SEEK_END)
+        self.count = 0
+
+    def append(self, record):
+        """Write one result (a JSON-serialisable dict); returns its byte offset."""
+        line = (json.dumps(record, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            offset = self._offset
+            self._file.write(line)
+            self._offset += len(line)
+            self.count += 1
+        return offset
+
+    def flush(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def records(self):
+        """Stream every record back from disk, one dict at a time."""
+        self.flush()
+        return read_records(self.path)
+
+    def pages(self, page_size):
+        """Stream records in lists of at most page_size."""
+        self.flush()
+        return read_pages(self.path, page_size)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JournalView:
+    """
+    Sequence of journal records read back on demand from their byte
+    offsets, in the order the offsets are given (e.g. manifest order,
+    while the journal itself is in completion order). Only the offsets
+    are held in memory. Valid until the journal file is rewritten.
+    """
+
+    def __init__(self, path, offsets):
+        self.path = path
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def __getitem__(self, index):
+        with open(self.path, "rb") as f:
+            f.seek(self.offsets[index])
+            return json.loads(f.readline())
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            for offset in self.offsets:
+                f.seek(offset)
+                yield json.loads(f.readline())
@@ -0,0 +1,429 @@
+# wipeEngine/manifest.py
+import heapq
+import mmap
+import os
+import tempfile
+from array import array
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from wipeEngine.classifier import classify_entries
+from wipeEngine.extents import allocated_size
+
+
+# Symlink policies: what wiping a tree does with the symlinks inside it
+SKIP = "skip"        # leave links alone (reported as skipped)
+UNLINK = "unlink"    # remove the link itself when deleting; never touch the target
+FOLLOW = "follow"    # also wipe the regular file a link points to, even outside the tree
+SYMLINK_POLICIES = (SKIP, UNLINK, FOLLOW)
+
+# Per-file status column, updated by wipe_folder()
+PENDING, WIPED, DELETED, FAILED = range(4)
+STATUSES = ("pending", "wiped", "deleted", "failed")
+
+# One typed column per stat field; a row costs ~60 bytes plus its name
+COLUMNS = {
+    "parent": "I",      # index into Manifest.dirs
+    "size": "q",
+    "allocated": "q",
+    "dev": "Q",
+    "ino": "Q",
+    "mtime": "q",
+    "nlink": "I",
+    "category": "B",    # index into Manifest.categories
+    "mime": "H",        # index into Manifest.mimes (0 = None)
+    "status": "B"
+}
+
+_np = False    # numpy module once loaded, None if unavailable
+
+
+def _numpy():
+    """Import numpy on first use; column sums fall back to plain Python."""
+    global _np
+    if _np is False:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = None
+    return _np
+
+
+class Entry:
+    """
+    Read-mostly view of one manifest row with the old dict interface
+    (entry["path"], .get(), dict(entry)). Only category, mime and status
+    can be assigned; they are written back to the columns.
+    """
+
+    __slots__ = ("manifest", "row")
+
+    _GETTERS = {
+        "path": lambda m, r: m.path(r),
+        "size": lambda m, r: m.columns["size"][r],
+        "allocated": lambda m, r: m.columns["allocated"][r],
+        "category": lambda m, r: m.categories[m.columns["category"][r]],
+        "mime": lambda m, r: m.mimes[m.columns["mime"][r]],
+        "dev": lambda m, r: m.columns["dev"][r],
+        "ino": lambda m, r: m.columns["ino"][r],
+        "mtime": lambda m, r: m.columns["mtime"][r],
+        "nlink": lambda m, r: m.columns["nlink"][r],
+        "status": lambda m, r: STATUSES[m.columns["status"][r]],
+        "aliases": lambda m, r: m.aliases[r]
+    }
+
+    def __init__(self, manifest, row):
+        self.manifest = manifest
+        self.row = row
+
+    def __getitem__(self, key):
+        return self._GETTERS[key](self.manifest, self.row)
+
+    def __setitem__(self, key, value):
+        m = self.manifest
+        if key == "category":
+            m.columns["category"][self.row] = m.intern(m.categories, value)
+        elif key == "mime":
+            m.columns["mime"][self.row] = m.intern(m.mimes, value)
+        elif key == "status":
+            m.columns["status"][self.row] = STATUSES.index(value)
+        else:
+            raise KeyError(f"{key} is read-only")
+
+    def __contains__(self, key):
+        return key in self._GETTERS and (key != "aliases" or self.row in self.manifest.aliases)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def keys(self):
+        return [key for key in self._GETTERS if key in self]
+
+    def __repr__(self):
+        return f"Entry({dict(self)!r})"
+
+
+class Manifest:
+    """
+    Files found under `root` by a single traversal, one entry per inode,
+    stored column-wise so multi-million-file trees stay small: each
+    directory path is kept once in `dirs`, a file is its parent index plus
+    its name in one byte blob, and the stat fields (path, size, allocated,
+    category, mime, dev, ino, mtime, nlink, status) are typed arrays.
+    Iterating yields Entry views in path order. Further paths to the same
+    inode (hardlinks, followed symlinks) are listed in the entry's
+    "aliases" as {"path", "link"} and are not overwritten again.
+    Symlinks that are not followed go to `symlinks` as {"path", "target"}.
+    spill() moves the columns to a memory-mapped temporary file.
+    """
+
+    def __init__(self, root, symlinks=None, symlink_policy=UNLINK):
+        self.root = root
+        self.symlinks = symlinks or []
+        self.symlink_policy = symlink_policy
+        self.dirs = []
+        self.columns = {name: array(code) for name, code in COLUMNS.items()}
+        self.names = bytearray()
+        self.name_start = array("Q", [0])     # row i's name is names[start[i]:start[i + 1]]
+        self.categories = ["Other"]             # filled in by classify_entries()
+        self.mimes = [None]
+        self.aliases = {}                       # row -> [{"path", "link"}], sorted by path
+        self.order = array("I")                 # rows to wipe, in path order
+        self.spilled = False
+
+    # ------------------- Building -------------------
+    @staticmethod
+    def intern(table, value):
+        """Index of value in a small lookup table, appended if new."""
+        try:
+            return table.index(value)
+        except ValueError:
+            table.append(value)
+            return len(table) - 1
+
+    def add_dir(self, path):
+        self.dirs.append(path)
+        return len(self.dirs) - 1
+
+    def add(self, parent, name, st):
+        """Append one file row from its stat result; returns the row."""
+        c = self.columns
+        c["parent"].append(parent)
+        c["size"].append(st.st_size)
+        c["allocated"].append(allocated_size(st))
+        c["dev"].append(st.st_dev)
+        c["ino"].append(st.st_ino)
+        c["mtime"].append(st.st_mtime_ns)
+        c["nlink"].append(st.st_nlink)
+        c["category"].append(0)
+        c["mime"].append(0)
+        c["status"].append(PENDING)
+        self.names += os.fsencode(name)
+        self.name_start.append(len(self.names))
+        return len(c["size"]) - 1
+
+    def add_alias(self, row, path, link):
+        self.aliases.setdefault(row, []).append({"path": path, "link": link})
+
+    # ------------------- Reading -------------------
+    @property
+    def rows(self):
+        """Rows stored, including hardlink rows folded into an alias."""
+        return len(self.columns["size"])
+
+    def name(self, row):
+        return os.fsdecode(bytes(self.names[self.name_start[row]:self.name_start[row + 1]]))
+
+    def path(self, row):
+        return os.path.join(self.dirs[self.columns["parent"][row]], self.name(row))
+
+    def __iter__(self):
+        for row in self.order:
+            yield Entry(self, row)
+
+    def __len__(self):
+        return len(self.order)
+
+    def __getitem__(self, index):
+        return Entry(self, self.order[index])
+
+    def set_status(self, row, status):
+        self.columns["status"][row] = status
+
+    def subset(self, predicate):
+        """Manifest of the entries passing predicate(entry), sharing this one's columns."""
+        other = Manifest.__new__(Manifest)
+        other.__dict__.update(self.__dict__)
+        other.order = array("I", (row for row in self.order if predicate(Entry(self, row))))
+        keep = set(other.order) if self.aliases else ()
+        other.aliases = {row: a for row, a in self.aliases.items() if row in keep}
+        return other
+
+    def _sum(self, name):
+        column = self.columns[name]
+        np = _numpy()
+        if np is not None and len(self.order):
+            # Zero-copy views of the arrays (or of the mmap once spilled)
+            values = np.frombuffer(column, dtype=np.int64)
+            return int(values[np.frombuffer(self.order, dtype=np.uint32)].sum())
+        return sum(column[row] for row in self.order)
+
+    @property
+    def total_size(self):
+        return self._sum("size")
+
+    @property
+    def total_allocated(self):
+        return self._sum("allocated")
+
+    @property
+    def total_data(self):
+        """Bytes one extent-aware pass overwrites: min(size, allocated) per file."""
+        size, allocated = self.columns["size"], self.columns["allocated"]
+        np = _numpy()
+        if np is not None and len(self.order):
+            rows = np.frombuffer(self.order, dtype=np.uint32)
+            return int(np.minimum(np.frombuffer(size, dtype=np.int64)[rows],
+                                  np.frombuffer(allocated, dtype=np.int64)[rows]).sum())
+        return sum(min(size[row], allocated[row]) for row in self.order)
+
+    @property
+    def alias_count(self):
+        return sum(len(a) for a in self.aliases.values())
+
+    @property
+    def bytes_saved(self):
+        """Bytes per pass not rewritten thanks to the inode index."""
+        size = self.columns["size"]
+        return sum(size[row] * len(a) for row, a in self.aliases.items())
+
+    # ------------------- Spilling -------------------
+    def spill(self, directory=None):
+        """
+        Move the columns, names and order into an unlinked temporary file
+        mapped into memory, so the kernel can page them out under pressure.
+        The manifest keeps working as before (status stays writable).
+        """
+        if self.spilled or not self.rows:
+            return
+        parts = dict(self.columns, name_start=self.name_start, order=self.order)
+        layout = {}
+        handle = tempfile.TemporaryFile(prefix="wipe-manifest-", dir=directory)
+        with handle:
+            for key, column in parts.items():
+                handle.seek(-handle.tell() % 8, os.SEEK_CUR)   # keep every column 8-byte aligned
+                layout[key] = (handle.tell(), len(column) * column.itemsize, column.typecode)
+                column.tofile(handle)
+            names_at = handle.tell()
+            handle.write(self.names or b"\0")
+            handle.flush()
+            self._map = mmap.mmap(handle.fileno(), 0)
+        view = memoryview(self._map)
+        for key, (offset, length, code) in layout.items():
+            parts[key] = view[offset:offset + length].cast(code)
+        self.name_start = parts.pop("name_start")
+        self.order = parts.pop("order")
+        self.columns = parts
+        self.names = view[names_at:names_at + len(self.names)]
+        self.spilled = True
+
+
+def _scan_dir(path, symlink_policy=UNLINK):
+    """
+    List one directory; returns (files as (name, stat), symlinks,
+    followed links as (link path, target, stat), subdirectories as (name, path)).
+    """
+    files, links, follows, subdirs = [], [], [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_symlink():
+                        # Directory links are never entered (no cycles, no escaping the tree)
+                        if symlink_policy == FOLLOW and entry.is_file():
+                            target = os.path.realpath(entry.path)
+                            follows.append((entry.path, target, os.stat(target)))
+                        else:
+                            links.append({"path": entry.path, "target": os.readlink(entry.path)})
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry.name, entry.path))
+                        continue
+                    if entry.is_file(follow_symlinks=False):
+                        files.append((entry.name, entry.stat(follow_symlinks=False)))
+                except OSError as e:
+                    print(f"⚠️ Skipping {entry.path}: {e}")
+    except OSError as e:
+        print(f"⚠️ Cannot read {path}: {e}")
+    return files, links, follows, subdirs
+
+
+def _tree_order(manifest, root_dir, ranges, children):
+    """
+    Rows in full-path order without sorting paths: a depth-first walk
+    that merges each directory's sorted files with its sorted
+    subdirectories (keyed name + separator, as in the full path).
+    """
+    def items(d):
+        start, end = ranges.get(d, (0, 0))
+        subdirs = children.get(d, ())
+        j = 0
+        for row in range(start, end):
+            name = manifest.name(row)
+            while j < len(subdirs) and subdirs[j][0] < name:
+                yield subdirs[j][1], True
+                j += 1
+            yield row, False
+        for _, child in subdirs[j:]:
+            yield child, True
+
+    stack = [items(root_dir)]
+    while stack:
+        item = next(stack[-1], None)
+        if item is None:
+            stack.pop()
+        elif item[1]:
+            stack.append(items(item[0]))
+        else:
+            yield item[0]
+
+
+def _index_inodes(manifest, rows, follows):
+    """
+    Keep one row per (dev, ino). The first path in order is written; other
+    hardlinks and the symlinks followed to it become its aliases. Targets
+    of followed links that are not in the tree get rows of their own.
+    Returns those extra rows.
+    """
+    dev, ino, nlink = (manifest.columns[k] for k in ("dev", "ino", "nlink"))
+    wanted = {(st.st_dev, st.st_ino) for _, _, st in follows}
+    primaries = {}
+    for row in rows:
+        # Only multi-link inodes and link targets need a key at all
+        if nlink[row] < 2 and not wanted:
+            manifest.order.append(row)
+            continue
+        key = (dev[row], ino[row])
+        if nlink[row] < 2 and key not in wanted:
+            manifest.order.append(row)
+            continue
+        primary = primaries.get(key)
+        if primary is None:
+            primaries[key] = row
+            manifest.order.append(row)
+        else:
+            manifest.add_alias(primary, manifest.path(row), "hardlink")
+
+    outside = []
+    external_dirs = {}
+    for via, target, st in sorted(follows, key=lambda f: (f[1], f[0])):
+        key = (st.st_dev, st.st_ino)
+        if key not in primaries:
+            directory, name = os.path.split(target)
+            if directory not in external_dirs:
+                external_dirs[directory] = manifest.add_dir(directory)
+            primaries[key] = manifest.add(external_dirs[directory], name, st)
+            outside.append(primaries[key])
+        manifest.add_alias(primaries[key], via, "symlink")
+    for aliases in manifest.aliases.values():
+        aliases.sort(key=lambda a: a["path"])
+    return outside
+
+
+def build_manifest(root, workers=4, cache=None, symlink_policy=UNLINK,
+                   spill_threshold=None, spill_dir=None):
+    """
+    Walk `root` once with os.scandir, listing subdirectories in parallel,
+    index the files by inode so each is overwritten once, then classify
+    them (a ClassificationCache skips unchanged ones). Manifests of more
+    than `spill_threshold` files are spilled to a mapped file in `spill_dir`.
+    """
+    if symlink_policy not in SYMLINK_POLICIES:
+        raise ValueError(f"Unknown symlink policy {symlink_policy}")
+    manifest = Manifest(root, symlink_policy=symlink_policy)
+    follows = []
+    tree = []
+    if os.path.islink(root) and not os.path.isdir(root):
+        if symlink_policy == FOLLOW and os.path.isfile(root):
+            target = os.path.realpath(root)
+            follows.append((root, target, os.stat(target)))
+        else:
+            manifest.symlinks.append({"path": root, "target": os.readlink(root)})
+    elif os.path.isfile(root):
+        directory, name = os.path.split(root)
+        tree = [manifest.add(manifest.add_dir(directory), name, os.stat(root))]
+    else:
+        ranges, children = {}, {}
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            running = {pool.submit(_scan_dir, root, symlink_policy): manifest.add_dir(root)}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    d = running.pop(future)
+                    files, links, found, subdirs = future.result()
+                    # A directory's rows are contiguous and sorted by name
+                    files.sort(key=lambda f: f[0])
+                    start = manifest.rows
+                    for name, st in files:
+                        manifest.add(d, name, st)
+                    ranges[d] = (start, manifest.rows)
+                    manifest.symlinks.extend(links)
+                    follows.extend(found)
+                    subdirs.sort()
+                    children[d] = []
+                    for name, path in subdirs:
+                        child = manifest.add_dir(path)
+                        children[d].append((name + os.sep, child))
+                        running[pool.submit(_scan_dir, path, symlink_policy)] = child
+        tree = _tree_order(manifest, 0, ranges, children)
+
+    outside = _index_inodes(manifest, tree, follows)
+    if outside:
+        # Targets outside the tree join the path order like any other file
+        merged = heapq.merge(((manifest.path(r), r) for r in manifest.order),
+                             ((manifest.path(r), r) for r in outside))
+        manifest.order = array("I", (row for _, row in merged))
+    manifest.symlinks.sort(key=lambda e: e["path"])
+    classify_entries(manifest, cache, workers)
+    if spill_threshold is not None and len(manifest) > spill_threshold:
+        manifest.spill(spill_dir)
+    return manifest
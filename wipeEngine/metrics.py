@@ -0,0 +1,325 @@
+# wipeEngine/metrics.py
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the latency histogram buckets; the last is +Inf
+LATENCY_BOUNDS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (not thread-safe; Metrics holds the lock)."""
+
+    def __init__(self, bounds=LATENCY_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = 0
+        while i < len(self.bounds) and value > self.bounds[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self):
+        return {"bounds": list(self.bounds), "counts": list(self.counts),
+                "sum": self.sum, "count": self.count}
+
+
+class Metrics:
+    """
+    Counters and latency histograms for wipe runs, fed once per file from
+    the strategies' stats dict (nothing is recorded inside the write loop).
+    Every file event is also handed to the sinks, and end_run() gives them
+    the cumulative snapshot.
+    """
+
+    COUNTERS = ("files", "files_failed", "bytes_written", "passes", "pwrite_calls", "syncs")
+    HISTOGRAMS = ("file_seconds", "pass_seconds", "sync_seconds",
+                  "queue_wait_seconds", "buffer_wait_seconds", "throttle_wait_seconds")
+
+    def __init__(self, sinks=()):
+        self.sinks = list(sinks)
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.histograms = {name: Histogram() for name in self.HISTOGRAMS}
+        self.started = time.time()
+        self._lock = threading.Lock()
+        for sink in self.sinks:
+            if hasattr(sink, "bind"):
+                sink.bind(self)
+
+    def record_file(self, path, wiped, elapsed, queue_wait, stats):
+        """Account one wiped (or failed) file; `stats` is the strategy's stats dict."""
+        event = {
+            "type": "file",
+            "path": path,
+            "wiped": wiped,
+            "seconds": elapsed,
+            "queue_wait": queue_wait,
+            "bytes_written": stats.get("bytes_written", 0),
+            "pass_seconds": stats.get("pass_times", []),
+            "pwrite_calls": stats.get("pwrite_calls", 0),
+            "syncs": stats.get("syncs", 0),
+            "sync_seconds": stats.get("sync_time", 0.0),
+            "buffer_wait": stats.get("buffer_wait", 0.0),
+            "throttle_wait": stats.get("throttle_wait", 0.0)
+        }
+        with self._lock:
+            c, h = self.counters, self.histograms
+            c["files"] += 1
+            c["files_failed"] += not wiped
+            c["bytes_written"] += event["bytes_written"]
+            c["passes"] += len(event["pass_seconds"])
+            c["pwrite_calls"] += event["pwrite_calls"]
+            c["syncs"] += event["syncs"]
+            h["file_seconds"].observe(elapsed)
+            h["queue_wait_seconds"].observe(queue_wait)
+            h["buffer_wait_seconds"].observe(event["buffer_wait"])
+            h["throttle_wait_seconds"].observe(event["throttle_wait"])
+            for seconds in event["pass_seconds"]:
+                h["pass_seconds"].observe(seconds)
+            for seconds in stats.get("sync_latencies", ()):
+                h["sync_seconds"].observe(seconds)
+            sinks = list(self.sinks)
+        for sink in sinks:
+            sink.on_file(event)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "type": "summary",
+                "elapsed": time.time() - self.started,
+                "counters": dict(self.counters),
+                "histograms": {k: h.snapshot() for k, h in self.histograms.items()}
+            }
+
+    def end_run(self):
+        """Hand the snapshot at the end of a run to every sink."""
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink.end_run(snapshot)
+        return snapshot
+
+
+# ------------------- Sinks -------------------
+class MemorySink:
+    """Keeps every event and the final summary in memory (tests, embedding)."""
+
+    def __init__(self):
+        self.events = []
+        self.summary = None
+        self._lock = threading.Lock()
+
+    def on_file(self, event):
+        with self._lock:
+            self.events.append(event)
+
+    def end_run(self, snapshot):
+        self.summary = snapshot
+
+
+class JsonLinesSink:
+    """One JSON line per file, then a summary line per run (file reopened lazily)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+        self._lock = threading.Lock()
+
+    def _write(self, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line)
+
+    def on_file(self, event):
+        self._write(event)
+
+    def end_run(self, snapshot):
+        self._write(snapshot)
+        with self._lock:
+            self._file.close()
+            self._file = None
+
+
+class PrometheusTextfileSink:
+    """
+    Prometheus text exposition for node_exporter's textfile collector.
+    Rewritten atomically at most every `interval` seconds and at the end.
+    """
+
+    def __init__(self, path, prefix="secure_wipe", interval=10.0):
+        self.path = path
+        self.metrics = None
+        self.prefix = prefix
+        self.interval = interval
+        self._last = time.monotonic()
+
+    def on_file(self, event):
+        if self.metrics is not None and time.monotonic() - self._last >= self.interval:
+            self._last = time.monotonic()
+            self.write(self.metrics.snapshot())
+
+    def bind(self, metrics):
+        """Called by Metrics so the file can also be refreshed mid-run."""
+        self.metrics = metrics
+
+    def end_run(self, snapshot):
+        self.write(snapshot)
+
+    def render(self, snapshot):
+        p = self.prefix
+        lines = []
+        for name, value in snapshot["counters"].items():
+            lines.append(f"# TYPE {p}_{name}_total counter")
+            lines.append(f"{p}_{name}_total {value}")
+        for name, h in snapshot["histograms"].items():
+            lines.append(f"# TYPE {p}_{name} histogram")
+            cumulative = 0
+            for bound, count in zip(h["bounds"] + ["+Inf"], h["counts"]):
+                cumulative += count
+                lines.append(f'{p}_{name}_bucket{{le="{bound}"}} {cumulative}')
+            lines.append(f"{p}_{name}_sum {h['sum']}")
+            lines.append(f"{p}_{name}_count {h['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, snapshot):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render(snapshot))
+        os.replace(tmp, self.path)
+
+
+def make_sinks(specs):
+    """Build sinks from config strings: "memory", "jsonl:<path>" or "prom:<path>"."""
+    sinks = []
+    for spec in specs or ():
+        kind, _, path = spec.partition(":")
+        if kind == "memory":
+            sinks.append(MemorySink())
+        elif kind == "jsonl":
+            sinks.append(JsonLinesSink(path))
+        elif kind == "prom":
+            sinks.append(PrometheusTextfileSink(path))
+        else:
+            raise ValueError(f"Unknown metrics sink: {spec}")
+    return sinks
+
+
+# ------------------- Console progress -------------------
+class ProgressView:
+    """
+    Thread-safe progress line printed at most once per `interval` seconds,
+    instead of one line per pass per file.
+    """
+
+    def __init__(self, total_files, total_bytes, interval=1.0, stream=None):
+        self.total_files = total_files
+        self.total_bytes = total_bytes
+        self.interval = interval
+        self.stream = stream or sys.stdout
+        self.files = 0
+        self.failed = 0
+        self.bytes = 0
+        self.start = time.monotonic()
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def update(self, nbytes, wiped=True):
+        with self._lock:
+            self.files += 1
+            self.failed += not wiped
+            self.bytes += nbytes
+            now = time.monotonic()
+            if now - self._last >= self.interval:
+                self._last = now
+                self._print(now)
+
+    def finish(self):
+        with self._lock:
+            self._print(time.monotonic())
+
+    def _print(self, now):
+        elapsed = now - self.start
+        rate = self.bytes / elapsed if elapsed > 0 else 0.0
+        pct = 100.0 * self.bytes / self.total_bytes if self.total_bytes else 100.0
+        eta = (self.total_bytes - self.bytes) / rate if rate > 0 else 0.0
+        failed = f", {self.failed} failed" if self.failed else ""
+        print(f"⏳ {self.files}/{self.total_files} files{failed}, "
+              f"{self.bytes / 1e6:.0f}/{self.total_bytes / 1e6:.0f} MB ({pct:.1f}%) "
+              f"at {rate / 1e6:.1f} MB/s, ETA {eta:.0f}s", file=self.stream, flush=True)
+
+
+# ------------------- Profiling -------------------
+class _ThreadProfiles:
+    """cProfile only sees the thread it was enabled on: keep one per worker."""
+
+    def __init__(self):
+        import cProfile
+        self._cls = cProfile.Profile
+        self._local = threading.local()
+        self.profiles = []
+        self._lock = threading.Lock()
+
+    def wrap(self, func):
+        def profiled_call(*args, **kwargs):
+            profile = getattr(self._local, "profile", None)
+            if profile is None:
+                profile = self._local.profile = self._cls()
+                with self._lock:
+                    self.profiles.append(profile)
+            profile.enable()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.disable()
+        return profiled_call
+
+
+@contextmanager
+def profiled(mode=None, output=None, top=15):
+    """
+    Optional profiling around a run. Yields a wrapper for the per-file
+    function (identity when off):
+      "cprofile"    merged per-thread cProfile stats, dumped to `output`
+                    (default wipe_profile.pstats), top functions printed
+      "tracemalloc" top allocation sites and the peak, written to `output`
+                    (default wipe_tracemalloc.txt) and printed
+    """
+    if mode is None:
+        yield lambda func: func
+    elif mode == "cprofile":
+        import pstats
+        profiles = _ThreadProfiles()
+        try:
+            yield profiles.wrap
+        finally:
+            if profiles.profiles:
+                stats = pstats.Stats(profiles.profiles[0])
+                for profile in profiles.profiles[1:]:
+                    stats.add(profile)
+                stats.dump_stats(output or "wipe_profile.pstats")
+                stats.sort_stats("cumulative").print_stats(top)
+    elif mode == "tracemalloc":
+        import tracemalloc
+        tracemalloc.start()
+        try:
+            yield lambda func: func
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            lines = [f"peak {peak / 1e6:.1f} MB, still allocated {current / 1e6:.1f} MB"]
+            lines += [str(s) for s in snapshot.statistics("lineno")[:top]]
+            with open(output or "wipe_tracemalloc.txt", "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            print("\n".join(lines))
+    else:
+        raise ValueError(f"Unknown profile mode: {mode}")
@@ -0,0 +1,81 @@
+# wipeEngine/pipeline.py
+import queue
+import threading
+import time
+
+_STOP = None
+
+
+def pipelined_pass(size, pool, chunk_size, random_source, write_chunk,
+                   depth=3, start=0, checksums=None, waits=None):
+    """
+    Write one random pass over [start, size) with generation and I/O overlapped.
+
+    The calling thread fills up to `depth` pooled buffers ahead while a
+    writer thread hands the previous ones to `write_chunk(view, offset)`
+    (pwrite + durability bookkeeping), strictly in order. The random source
+    and the write syscalls release the GIL for their bulk work, so the CPU
+    and the device are busy at the same time instead of taking turns.
+    With a `waits` dict, the seconds the generator spent waiting for a free
+    buffer ("buffer_wait") and the writer for a full one ("writer_wait")
+    are added to it.
+    """
+    buffers = pool.acquire_many(depth)
+    tail_length = (size - start) % chunk_size
+    # Full and tail views per slot are sliced once, not per chunk
+    slots = []
+    for buf in buffers:
+        full = memoryview(buf)[:chunk_size]
+        slots.append((full, full[:tail_length]))
+    free = queue.Queue()
+    for index in range(len(slots)):
+        free.put(index)
+    ready = queue.Queue(maxsize=len(slots))
+    errors = []
+    writer_wait = [0.0]
+
+    def writer():
+        while True:
+            begin = time.perf_counter()
+            item = ready.get()
+            writer_wait[0] += time.perf_counter() - begin
+            if item is _STOP:
+                return
+            index, chunk, offset = item
+            try:
+                if not errors:
+                    write_chunk(chunk, offset)
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                free.put(index)
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    buffer_wait = 0.0
+    try:
+        offset = start
+        while offset < size and not errors:
+            begin = time.perf_counter()
+            index = free.get()
+            buffer_wait += time.perf_counter() - begin
+            full, tail = slots[index]
+            chunk = full if size - offset >= chunk_size else tail
+            random_source.fill(chunk)
+            if checksums is not None:
+                checksums.add(offset, chunk)
+            ready.put((index, chunk, offset))
+            offset += len(chunk)
+    finally:
+        ready.put(_STOP)
+        thread.join()
+        for full, tail in slots:
+            tail.release()
+            full.release()
+        for buf in buffers:
+            pool.release(buf)
+        if waits is not None:
+            waits["buffer_wait"] = waits.get("buffer_wait", 0.0) + buffer_wait
+            waits["writer_wait"] = waits.get("writer_wait", 0.0) + writer_wait[0]
+    if errors:
+        raise errors[0]
@@ -0,0 +1,144 @@
+# wipeEngine/randomSource.py
+import hashlib
+import itertools
+import os
+import threading
+
+
+class RandomSource:
+    """Base class for random overwrite data. Subclasses implement fill()."""
+    name = "base"
+
+    def fill(self, view):
+        """Fill a writable buffer (bytearray/memoryview) in place."""
+        raise NotImplementedError
+
+    def randbytes(self, n):
+        """Return n random bytes."""
+        buf = bytearray(n)
+        self.fill(memoryview(buf))
+        return bytes(buf)
+
+
+class OSRandomSource(RandomSource):
+    """One os.urandom call per chunk (the original random_fill behaviour)."""
+    name = "os.urandom"
+
+    def fill(self, view):
+        view[:] = os.urandom(len(view))
+
+
+class KeystreamSource(RandomSource):
+    """
+    Seed once from the OS CSPRNG, then expand a fast keystream.
+
+    Backends: AES-256-CTR from `cryptography`, NumPy's PCG64 raw output,
+    and SHAKE-128 in counter mode from hashlib. "auto" picks the first of
+    AUTO_BACKENDS that is installed; SHAKE is slower than os.urandom, so
+    it is only used when asked for. Each thread draws from its own stream
+    (a distinct CTR nonce / PCG64 spawn key / SHAKE prefix), so workers
+    generate in parallel without sharing a lock. Passing an explicit
+    `seed` makes the streams reproducible (useful for tests).
+    """
+
+    BACKENDS = ("aes-ctr", "numpy", "shake")
+    AUTO_BACKENDS = ("aes-ctr", "numpy")
+
+    def __init__(self, seed=None, backend="auto"):
+        if seed is None:
+            seed = os.urandom(32)
+        elif isinstance(seed, int):
+            seed = seed.to_bytes(32, "little")
+        self.seed = hashlib.sha256(bytes(seed)).digest()
+        self._streams = itertools.count()
+        self._local = threading.local()
+
+        if backend == "auto":
+            if not any(self._setup(candidate) for candidate in self.AUTO_BACKENDS):
+                raise ValueError("No fast keystream backend installed")
+        elif backend not in self.BACKENDS or not self._setup(backend):
+            raise ValueError(f"Keystream backend unavailable: {backend}")
+        self.name = f"keystream/{self.backend}"
+
+    def _setup(self, backend):
+        """Try to initialise a backend; False if its dependency is missing."""
+        if backend == "aes-ctr":
+            try:
+                from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+            except ImportError:
+                return False
+            self._cipher = lambda nonce: Cipher(algorithms.AES(self.seed), modes.CTR(nonce)).encryptor()
+            self._zeros = bytes(1024 * 1024)
+        elif backend == "numpy":
+            try:
+                import numpy as np
+            except ImportError:
+                return False
+            self._np = np
+        self.backend = backend
+        return True
+
+    def _stream(self):
+        """This thread's generator state, created on its first fill()."""
+        state = getattr(self._local, "state", None)
+        if state is None:
+            index = next(self._streams)
+            if self.backend == "aes-ctr":
+                # High 8 bytes of the counter block: stream, low 8: block counter
+                state = (self._cipher(index.to_bytes(8, "big") + bytes(8)),
+                         memoryview(bytearray(len(self._zeros) + 15)))
+            elif self.backend == "numpy":
+                np = self._np
+                seq = np.random.SeedSequence(int.from_bytes(self.seed, "little"), spawn_key=(index,))
+                state = np.random.PCG64(seq)
+            else:
+                state = [self.seed + index.to_bytes(8, "little"), 0]
+            self._local.state = state
+        return state
+
+    def fill(self, view):
+        n = len(view)
+        state = self._stream()
+        if self.backend == "aes-ctr":
+            # Encrypting zeros with CTR yields the raw keystream. update_into
+            # wants 15 spare bytes of output room, so only the last piece of
+            # the view goes through the thread's scratch buffer
+            encryptor, scratch = state
+            pos = 0
+            while pos < n:
+                step = min(len(self._zeros), n - pos)
+                if n - pos >= step + 15:
+                    encryptor.update_into(self._zeros[:step], view[pos:pos + step + 15])
+                else:
+                    encryptor.update_into(self._zeros[:step], scratch)
+                    view[pos:pos + step] = scratch[:step]
+                pos += step
+        elif self.backend == "numpy":
+            words = n // 8
+            if words:
+                self._np.frombuffer(view[:words * 8], dtype=self._np.uint64)[:] = state.random_raw(words)
+            if n % 8:
+                view[words * 8:] = int(state.random_raw()).to_bytes(8, "little")[:n % 8]
+        else:
+            prefix, counter = state
+            state[1] += 1
+            view[:] = hashlib.shake_128(prefix + counter.to_bytes(8, "little")).digest(n)
+
+
+_default_source = None
+_default_lock = threading.Lock()
+
+
+def default_source():
+    """
+    Process-wide random source, seeded once on first use: a keystream if
+    a fast backend is installed, else os.urandom per chunk.
+    """
+    global _default_source
+    with _default_lock:
+        if _default_source is None:
+            try:
+                _default_source = KeystreamSource()
+            except ValueError:
+                _default_source = OSRandomSource()
+        return _default_source
@@ -1,97 +1,319 @@
 import datetime
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.styles import getSampleStyleSheet
-import matplotlib.pyplot as plt
 import os
-import tempfile
+import time
+from wipeEngine.journal import WipeJournal, read_pages, read_records
+
+# reportlab is imported inside the functions that render, so importing this
+# module (e.g. from index.py) stays cheap.
+
+A4 = (595.2755905511812, 841.8897637795277)   # reportlab.lib.pagesizes.A4
+MARGIN = 36
+ROW_HEIGHT = 16
+PAGE_ROWS = 45      # table rows per page; also the journal batch size
+MAX_BUCKETS = 60    # points kept for the throughput-over-time chart
+WIPED_STATUSES = ("Success", "Wiped (Kept)")
+CELL_PADDING = 12   # reportlab's default left + right cell padding
+
+
+def row_status(row):
+    """Report status of one wipe_folder() journal row."""
+    if row.get("status"):
+        return row["status"]    # logged through PDFReport.log_file()
+    if row.get("skipped"):
+        return "Unlinked" if row["deleted"] else "Skipped"
+    if not row["wiped"]:
+        return "Failed"
+    if row.get("alias_of"):
+        # Same inode as an earlier row: not counted twice in the charts
+        return "Link (Removed)" if row["deleted"] else "Link (Kept)"
+    return "Success" if row["deleted"] else "Wiped (Kept)"
+
+
+def fit_text(text, width, font="Helvetica", size=7):
+    """
+    Trim text to `width` points by cutting out its middle, so a long path
+    keeps its root and file name and stays inside its table cell.
+    """
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    if stringWidth(text, font, size) <= width:
+        return text
+    head, tail = text[:len(text) // 2], text[len(text) // 2:]
+    while head or tail:
+        if len(head) >= len(tail):
+            head = head[:-1]
+        else:
+            tail = tail[1:]
+        fitted = f"{head}...{tail}"
+        if stringWidth(fitted, font, size) <= width:
+            return fitted
+    return ""
+
+
+def draw_table_page(pdf, header, rows, col_widths, header_color):
+    """Draw one page worth of rows as a table at the top of the page"""
+    from reportlab.platypus import Table, TableStyle
+    from reportlab.lib import colors
+
+    # Fixed row heights keep PAGE_ROWS rows on a page, so cells are trimmed to fit
+    rows = [[fit_text(str(cell), width - CELL_PADDING) for cell, width in zip(row, col_widths)]
+            for row in rows]
+    table = Table([header] + rows, colWidths=col_widths, rowHeights=ROW_HEIGHT)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0,0), (-1,0), header_color),
+        ('TEXTCOLOR',(0,0),(-1,0),colors.white),
+        ('GRID', (0,0), (-1,-1), 0.5, colors.black),
+        ('FONTSIZE', (0,0), (-1,-1), 7),
+        ('VALIGN',(0,0),(-1,-1),'TOP')
+    ]))
+    _, height = table.wrapOn(pdf, A4[0] - 2 * MARGIN, A4[1] - 2 * MARGIN)
+    table.drawOn(pdf, MARGIN, A4[1] - MARGIN - height)
+
+
+def render_table_pages(pdf, journal_file, header, to_row, col_widths,
+                       header_color=None, page_rows=PAGE_ROWS):
+    """
+    Stream journal records into table pages, `page_rows` at a time.
+    Only one page of rows is held in memory while rendering.
+    """
+    if header_color is None:
+        from reportlab.lib import colors
+        header_color = colors.darkblue
+    for page in read_pages(journal_file, page_rows):
+        draw_table_page(pdf, header, [to_row(r) for r in page], col_widths, header_color)
+        pdf.showPage()
+
+
+def render_evidence_pages(pdf, journal_file):
+    """Append before/after hex samples, streamed from the journal"""
+    width, height = A4
+    y = None
+    for record in read_records(journal_file):
+        if not record.get("evidence_before") and not record.get("evidence_after"):
+            continue
+        before, after = record.get("evidence_before"), record.get("evidence_after")
+        lines = [("Helvetica-Bold", fit_text(record["path"], width - 2 * MARGIN, "Helvetica-Bold", 8))]
+        for title, samples in (("before", before), ("after", after)):
+            if samples is None:
+                lines.append(("Courier", f"  {title}: (file removed)"))
+                continue
+            for sample in samples:
+                # 64-byte windows split in two lines of 32 bytes
+                hex_bytes = sample["hex"].split(" ")
+                for k in range(0, max(len(hex_bytes), 1), 32):
+                    prefix = f"  {title:<6} {sample['offset'] + k:010x} " if k == 0 else " " * 19
+                    lines.append(("Courier", prefix + " ".join(hex_bytes[k:k + 32])))
+        if y is None or y - 10 * len(lines) < MARGIN:
+            if y is not None:
+                pdf.showPage()
+            y = height - MARGIN
+            pdf.setFont("Helvetica-Bold", 12)
+            pdf.drawString(MARGIN, y, "Before/after evidence samples")
+            y -= 20
+        for font, text in lines:
+            pdf.setFont(font, 6 if font == "Courier" else 8)
+            pdf.drawString(MARGIN, y, text)
+            y -= 10
+        y -= 6
+    if y is not None:
+        pdf.showPage()
+
+
+def _clock(timestamp):
+    if not timestamp:
+        return "-"
+    return datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
 
 class PDFReport:
-    def __init__(self, output_file="wipe_report.pdf"):
+    """
+    Summary page, charts and a table of one run's results. With
+    `journal_file` the rows are read from that wipe_folder() journal, so
+    a run is recorded once; without it, log_file() writes them to a
+    journal next to the PDF.
+    """
+
+    def __init__(self, output_file="wipe_report.pdf", journal_file=None):
         self.output_file = output_file
-        self.logs = []
+        self.journal = None
+        if journal_file is None:
+            # Results stream to disk; only the summary counters stay in memory
+            self.journal = WipeJournal(os.path.splitext(output_file)[0] + ".jsonl")
+            journal_file = self.journal.path
+        self.journal_file = journal_file
         self.total_size = 0
         self.success_count = 0
         self.failure_count = 0
+        self.link_count = 0
+        self.category_bytes = {}
+        # Throughput histogram: MAX_BUCKETS buckets that widen as the run grows
+        self.start_time = None
+        self.bucket_width = 1.0
+        self.bucket_bytes = []
 
-    def log_file(self, file_path, size, status, strategy):
-        """Log each file deletion"""
-        timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.logs.append({
-            "time": timestamp,
+    def log_file(self, file_path, size, status, strategy, category="Other", evidence=None,
+                 verified=None, verify_rate=None):
+        """Log each file deletion; evidence is (before, after) sample lists"""
+        before, after = evidence or (None, None)
+        row = {
+            "finished": time.time(),
             "path": file_path,
             "size": size,
             "status": status,
-            "strategy": strategy
-        })
-        self.total_size += size if status == "Success" else 0
+            "strategy": strategy,
+            "category": category,
+            "evidence_before": before,
+            "evidence_after": after,
+            "verified": verified,
+            "verify_rate": verify_rate
+        }
+        self.journal.append(row)
+        self._count(row)
+
+    def _count(self, row):
+        status = row_status(row)
         if status == "Success":
+            self.total_size += row["size"]
+        if status in WIPED_STATUSES:
             self.success_count += 1
-        else:
+            self.category_bytes[row["category"]] = self.category_bytes.get(row["category"], 0) + row["size"]
+            if row.get("finished"):
+                self._add_throughput(row["finished"], row["size"])
+        elif status == "Failed":
             self.failure_count += 1
+        else:
+            self.link_count += 1
+
+    def _add_throughput(self, now, size):
+        if self.start_time is None:
+            self.start_time = now
+        bucket = int((now - self.start_time) / self.bucket_width)
+        while bucket >= MAX_BUCKETS:
+            # Halve the resolution: merge neighbouring buckets pairwise
+            self.bucket_bytes = [sum(self.bucket_bytes[k:k + 2])
+                                 for k in range(0, len(self.bucket_bytes), 2)]
+            self.bucket_width *= 2
+            bucket = int((now - self.start_time) / self.bucket_width)
+        if bucket >= len(self.bucket_bytes):
+            self.bucket_bytes.extend([0] * (bucket + 1 - len(self.bucket_bytes)))
+        self.bucket_bytes[bucket] += size
 
     def generate_charts(self):
-        """Generate a pie chart for success vs failure and save to a temp file"""
-        plt.figure(figsize=(4,4))
-        plt.pie(
-            [self.success_count, self.failure_count],
-            labels=["Success", "Failure"],
-            autopct="%1.1f%%",
-            colors=["green", "red"]
-        )
-        temp_file = os.path.join(tempfile.gettempdir(), "chart_temp.png")
-        plt.savefig(temp_file, bbox_inches='tight')
-        plt.close()
-        return temp_file
+        """Build vector charts (reportlab Drawings) for the summary page"""
+        from reportlab.graphics.shapes import Drawing, String
+        from reportlab.graphics.charts.piecharts import Pie
+        from reportlab.graphics.charts.barcharts import VerticalBarChart
+        from reportlab.graphics.charts.lineplots import LinePlot
+        from reportlab.lib import colors
+
+        charts = []
+
+        if self.success_count + self.failure_count:
+            drawing = Drawing(220, 200)
+            pie = Pie()
+            pie.x, pie.y, pie.width, pie.height = 30, 20, 150, 150
+            pie.data = [self.success_count, self.failure_count]
+            total = self.success_count + self.failure_count
+            pie.labels = [f"Success {100 * self.success_count / total:.1f}%",
+                          f"Failure {100 * self.failure_count / total:.1f}%"]
+            pie.slices[0].fillColor = colors.green
+            pie.slices[1].fillColor = colors.red
+            drawing.add(pie)
+            charts.append(("Success vs Failure:", drawing))
+
+        if self.category_bytes:
+            drawing = Drawing(260, 200)
+            bars = VerticalBarChart()
+            bars.x, bars.y, bars.width, bars.height = 50, 30, 190, 150
+            names = sorted(self.category_bytes)
+            bars.data = [[self.category_bytes[n] for n in names]]
+            bars.categoryAxis.categoryNames = names
+            bars.valueAxis.valueMin = 0
+            bars.bars[0].fillColor = colors.darkblue
+            drawing.add(bars)
+            charts.append(("Bytes wiped per category:", drawing))
+
+        if len(self.bucket_bytes) > 1:
+            drawing = Drawing(480, 180)
+            plot = LinePlot()
+            plot.x, plot.y, plot.width, plot.height = 50, 30, 400, 130
+            plot.data = [[(i * self.bucket_width, b / self.bucket_width / 1e6)
+                          for i, b in enumerate(self.bucket_bytes)]]
+            plot.lines[0].strokeColor = colors.darkblue
+            plot.xValueAxis.valueMin = 0
+            plot.yValueAxis.valueMin = 0
+            drawing.add(plot)
+            drawing.add(String(250, 5, "seconds since start", fontSize=8, textAnchor="middle"))
+            charts.append(("Throughput over time (MB/s):", drawing))
+
+        return charts
 
     def finalize(self, strategy, target_path):
-        """Build PDF report"""
-        pdf = SimpleDocTemplate(self.output_file, pagesize=A4)
-        elements = []
-        styles = getSampleStyleSheet()
+        """Build PDF report: a summary page, then the journal in page batches"""
+        from reportlab.pdfgen import canvas
+
+        if self.journal is not None:
+            self.journal.close()
+        else:
+            # An engine journal: one streaming pass for the summary counters
+            for row in read_records(self.journal_file):
+                self._count(row)
+
+        pdf = canvas.Canvas(self.output_file, pagesize=A4, pageCompression=1)
+        width, height = A4
+        y = height - MARGIN - 18
 
         # Title
-        elements.append(Paragraph(f"Secure Wiping Report", styles['Title']))
-        elements.append(Spacer(1, 12))
-        elements.append(Paragraph(f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", styles['Normal']))
-        elements.append(Paragraph(f"Path wiped: {target_path}", styles['Normal']))
-        elements.append(Paragraph(f"Wipe strategy: {strategy}", styles['Normal']))
-        elements.append(Spacer(1, 12))
-
-        # Summary
-        elements.append(Paragraph(f"Total files wiped: {self.success_count + self.failure_count}", styles['Normal']))
-        elements.append(Paragraph(f"Files successfully wiped: {self.success_count}", styles['Normal']))
-        elements.append(Paragraph(f"Files failed to wipe: {self.failure_count}", styles['Normal']))
-        elements.append(Paragraph(f"Total size freed: {self.total_size} bytes", styles['Normal']))
-        elements.append(Spacer(1, 12))
-
-        # Charts
-        chart_file = self.generate_charts()
-        if os.path.exists(chart_file):
-            elements.append(Paragraph("Success vs Failure:", styles['Heading3']))
-            elements.append(Image(chart_file, width=200, height=200))
-            elements.append(Spacer(1, 12))
-            # Do NOT delete yet; ReportLab reads it during build
-            # os.remove(chart_file)
-
-        # Table of logs
-        data = [["Time", "File Path", "Size (bytes)", "Status", "Strategy"]]
-        for log in self.logs:
-            data.append([log["time"], log["path"], str(log["size"]), log["status"], log["strategy"]])
-
-        table = Table(data, colWidths=[100, 250, 80, 80, 80])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.darkblue),
-            ('TEXTCOLOR',(0,0),(-1,0),colors.white),
-            ('GRID', (0,0), (-1,-1), 0.5, colors.black),
-            ('VALIGN',(0,0),(-1,-1),'TOP')
-        ]))
-        elements.append(table)
+        pdf.setFont("Helvetica-Bold", 18)
+        pdf.drawCentredString(width / 2, y, "Secure Wiping Report")
+        y -= 30
 
-        # Build PDF
-        pdf.build(elements)
+        # Run details and summary
+        pdf.setFont("Helvetica", 10)
+        lines = [
+            f"Date: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            f"Path wiped: {fit_text(str(target_path), width - 2 * MARGIN - 60, size=10)}",
+            f"Wipe strategy: {strategy}",
+            "",
+            f"Total files wiped: {self.success_count + self.failure_count}",
+            f"Files successfully wiped: {self.success_count}",
+            f"Files failed to wipe: {self.failure_count}",
+            f"Links and skipped entries: {self.link_count}",
+            f"Total size freed: {self.total_size} bytes",
+        ]
+        for line in lines:
+            pdf.drawString(MARGIN, y, line)
+            y -= 14
+        y -= 12
+
+        # Charts, drawn as vectors straight onto the page (no temp files)
+        from reportlab.graphics import renderPDF
 
-        # Now safe to delete chart
-        if os.path.exists(chart_file):
-            os.remove(chart_file)
+        x = MARGIN
+        row_height = 0
+        for title, drawing in self.generate_charts():
+            if x + drawing.width > width - MARGIN:
+                x = MARGIN
+                y -= row_height + 40
+                row_height = 0
+            pdf.setFont("Helvetica-Bold", 12)
+            pdf.drawString(x, y, title)
+            renderPDF.draw(drawing, pdf, x, y - drawing.height - 6)
+            x += drawing.width + 20
+            row_height = max(row_height, drawing.height)
+        pdf.showPage()
+
+        # Table of logs, streamed from the journal
+        render_table_pages(
+            pdf,
+            self.journal_file,
+            ["Time", "File Path", "Size (bytes)", "Status", "Sync (s)", "Verified"],
+            lambda row: [_clock(row.get("finished")), row["path"], str(row["size"]), row_status(row),
+                         f"{row.get('sync_time') or 0.0:.3f}",
+                         {True: "Yes", False: "FAILED"}.get(row.get("verified"), "-")],
+            [90, 208, 55, 60, 40, 40]
+        )
+        render_evidence_pages(pdf, self.journal_file)
+
+        # Build PDF
+        pdf.save()
@@ -0,0 +1,142 @@
+# wipeEngine/scheduler.py
+import heapq
+import itertools
+import os
+import threading
+
+# Concurrent files per device when per_device is left to the device type:
+# a spinning disk loses more to seeking between files than it gains, an
+# SSD/NVMe (or tmpfs, or anything without a sysfs queue) wants several
+# requests in flight
+ROTATIONAL_WORKERS = 1
+SOLID_STATE_WORKERS = 4
+# Jobs pulled ahead of the workers; largest_first picks among these
+LOOKAHEAD = 1024
+
+
+def is_rotational(st_dev):
+    """True if st_dev is a spinning disk according to sysfs (Linux); False otherwise."""
+    if not hasattr(os, "major"):
+        return False
+    base = f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}"
+    # A partition has no queue of its own; its parent disk does
+    for path in (base + "/queue/rotational", base + "/../queue/rotational"):
+        try:
+            with open(path) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return False
+
+
+class WipeScheduler:
+    """
+    Run one job per file on a shared worker pool.
+
+    Jobs are grouped by backing device (st_dev) so each device only sees
+    `per_device` concurrent writers, while `max_workers` caps the whole pool.
+    per_device=None picks it per device: 1 for rotational disks, more for
+    SSD/NVMe. Jobs are pulled from their iterable as workers free up, at
+    most `lookahead` ahead; with `largest_first` the biggest pending job
+    of a free device is picked next, so a huge file does not end up alone
+    on the critical path.
+    """
+
+    def __init__(self, max_workers=4, per_device=None, largest_first=True, lookahead=LOOKAHEAD):
+        if max_workers < 1 or (per_device is not None and per_device < 1):
+            raise ValueError("Worker counts must be >= 1")
+        self.max_workers = max_workers
+        self.per_device = per_device
+        self.largest_first = largest_first
+        self.lookahead = max(lookahead, max_workers)
+        self._limits = {}
+
+    def device_limit(self, dev):
+        """Concurrent jobs allowed on device `dev`."""
+        if self.per_device is not None:
+            return self.per_device
+        if dev not in self._limits:
+            self._limits[dev] = ROTATIONAL_WORKERS if is_rotational(dev) else SOLID_STATE_WORKERS
+        return self._limits[dev]
+
+    def run(self, jobs, func):
+        """
+        Run func(job) for every job dict (needs "size" and "dev" keys).
+        `jobs` may be any iterable, e.g. a generator over a manifest; it is
+        only advanced under the scheduler's lock. Results are not kept:
+        func records its own.
+        """
+        # Single worker: keep the plain sequential loop (and its order)
+        if self.max_workers == 1:
+            for job in jobs:
+                func(job)
+            return
+
+        jobs = iter(jobs)
+        pending = {}    # dev -> heap of (-size or 0, arrival, job)
+        active = {}
+        limits = {}
+        arrivals = itertools.count()
+        state = {"pending": 0, "exhausted": False}
+        cond = threading.Condition()
+        errors = []
+
+        def fill():
+            while not state["exhausted"] and state["pending"] < self.lookahead:
+                job = next(jobs, None)
+                if job is None:
+                    state["exhausted"] = True
+                    break
+                dev = job["dev"]
+                if dev not in limits:
+                    limits[dev] = self.device_limit(dev)
+                    active[dev] = 0
+                key = -job["size"] if self.largest_first else 0
+                heapq.heappush(pending.setdefault(dev, []), (key, next(arrivals), job))
+                state["pending"] += 1
+
+        def next_job():
+            best = None
+            for dev, queue in pending.items():
+                if not queue or active[dev] >= limits[dev]:
+                    continue
+                if best is None or queue[0][:2] < pending[best][0][:2]:
+                    best = dev
+            if best is None:
+                return None
+            active[best] += 1
+            state["pending"] -= 1
+            return best, heapq.heappop(pending[best])[2]
+
+        def worker():
+            while True:
+                with cond:
+                    while True:
+                        if errors:
+                            return
+                        fill()
+                        picked = next_job()
+                        if picked is not None:
+                            break
+                        if state["exhausted"] and not state["pending"]:
+                            return
+                        cond.wait()
+                dev, job = picked
+                try:
+                    func(job)
+                except BaseException as e:
+                    with cond:
+                        errors.append(e)
+                finally:
+                    with cond:
+                        active[dev] -= 1
+                        cond.notify_all()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.max_workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        if errors:
+            raise errors[0]
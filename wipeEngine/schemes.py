@@ -0,0 +1,72 @@
+# wipeEngine/schemes.py
+# Overwrite schemes as declarative pass lists. A step is one of:
+#   "0x00", "0xff", ...   a constant byte
+#   "0x924924", ...       a repeating multi-byte pattern (hex, whole bytes)
+#   "random"              fresh random data
+#   "complement"          the bitwise complement of the previous constant pass
+#   "verify"              read the previous pass back before going on
+# bytes objects are accepted for patterns as well. compile_scheme() turns a
+# list into what the pass executor runs: one pattern per write pass.
+
+RANDOM_STEP = "random"
+COMPLEMENT = "complement"
+VERIFY = "verify"
+
+# DoD 5220.22-M (E): a character, its complement, random, then a read-back
+DOD_5220_22_M = ("0x00", COMPLEMENT, RANDOM_STEP, VERIFY)
+
+# Peter Gutmann, "Secure Deletion of Data from Magnetic and Solid-State Memory" (1996)
+GUTMANN = (
+    (RANDOM_STEP,) * 4
+    + ("0x55", "0xaa", "0x924924", "0x492492", "0x249249")
+    + tuple(f"0x{b:02x}" for b in range(0x00, 0x100, 0x11))
+    + ("0x924924", "0x492492", "0x249249", "0x6db6db", "0xb6db6d", "0xdb6db6")
+    + (RANDOM_STEP,) * 4
+)
+
+
+def parse_step(step):
+    """A step as bytes (constant pattern), None (random), COMPLEMENT or VERIFY."""
+    if isinstance(step, (bytes, bytearray)):
+        if not step:
+            raise ValueError("Empty pattern in scheme")
+        return bytes(step)
+    if not isinstance(step, str):
+        raise ValueError(f"Invalid scheme step: {step!r}")
+    text = step.strip().lower()
+    if text == RANDOM_STEP:
+        return None
+    if text in (COMPLEMENT, VERIFY):
+        return text
+    digits = text[2:] if text.startswith("0x") else text
+    if not digits or len(digits) % 2:
+        raise ValueError(f"Invalid scheme step: {step!r} (use hex bytes such as 0xff)")
+    try:
+        return bytes.fromhex(digits)
+    except ValueError:
+        raise ValueError(f"Invalid scheme step: {step!r} (use hex bytes such as 0xff)") from None
+
+
+def compile_scheme(steps):
+    """
+    Compile a pass list into (patterns, verify_passes): one entry per write
+    pass (bytes, or None for random) and the indices of the passes to read
+    back. Complements are resolved here, so the executor only writes.
+    """
+    patterns = []
+    verify_passes = set()
+    for step in steps:
+        parsed = parse_step(step)
+        if parsed == COMPLEMENT:
+            if not patterns or patterns[-1] is None:
+                raise ValueError("'complement' must follow a constant pattern pass")
+            patterns.append(bytes(b ^ 0xFF for b in patterns[-1]))
+        elif parsed == VERIFY:
+            if not patterns:
+                raise ValueError("'verify' must follow a write pass")
+            verify_passes.add(len(patterns) - 1)
+        else:
+            patterns.append(parsed)
+    if not patterns:
+        raise ValueError("A scheme needs at least one write pass")
+    return patterns, frozenset(verify_passes)
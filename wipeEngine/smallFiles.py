@@ -0,0 +1,192 @@
+# wipeEngine/smallFiles.py
+import os
+import stat
+import threading
+import time
+from wipeEngine.bufferPool import tile_pattern
+from wipeEngine.directIO import BUFFERED, dontneed
+from wipeEngine.durability import FINAL, NONE, datasync
+from wipeEngine.randomSource import default_source
+from wipeEngine.verify import drop_cache
+
+SMALL_FILE_LIMIT = 64 * 1024   # files up to this size take the fast path
+BATCH_FILES = 256              # files handed to one worker at a time
+OPEN_DIRS = 64                 # directories batched at once while streaming
+MAX_TILES = 64                 # constant-pattern buffers kept between batches
+
+_OPEN_FLAGS = (os.O_RDWR | getattr(os, "O_NOFOLLOW", 0) | getattr(os, "O_CLOEXEC", 0)
+               | getattr(os, "O_BINARY", 0))
+_DIR_FD = os.open in os.supports_dir_fd and os.unlink in os.supports_dir_fd
+
+_tiles = {}                    # pattern -> read-only tiled buffer
+_tiles_lock = threading.Lock()
+_scratch = threading.local()   # per-thread buffer for random passes
+
+
+def make_batches(jobs, is_small=None, batch_files=BATCH_FILES, open_dirs=OPEN_DIRS):
+    """
+    Scheduler items for a stream of jobs: jobs failing is_small(job) pass
+    through as they are, the others are grouped by parent directory into
+    batches of at most `batch_files` files: {"dir", "dev", "size", "jobs"}.
+    A generator: a batch is yielded once full, and with more than
+    `open_dirs` directories in progress the oldest one is cut short, so a
+    manifest walked in path order never holds more than
+    open_dirs * batch_files jobs at once.
+    """
+    groups = {}
+
+    def close(key):
+        directory, dev = key
+        part = groups.pop(key)
+        return {"dir": directory, "dev": dev, "jobs": part, "size": sum(j["size"] for j in part)}
+
+    for job in jobs:
+        if is_small is not None and not is_small(job):
+            yield job
+            continue
+        key = (os.path.dirname(job["path"]), job["dev"])
+        group = groups.get(key)
+        if group is None:
+            if len(groups) >= open_dirs:
+                yield close(next(iter(groups)))
+            group = groups[key] = []
+        group.append(job)
+        if len(group) >= batch_files:
+            yield close(key)
+    for key in list(groups):
+        yield close(key)
+
+
+def _tiled(pattern, size):
+    """
+    Read-only buffer of at least `size` bytes tiled with `pattern`, built
+    once and shared by every batch and thread.
+    """
+    with _tiles_lock:
+        tile = _tiles.get(pattern)
+        if tile is None or len(tile) < size:
+            if len(_tiles) >= MAX_TILES:
+                _tiles.clear()
+            buf = bytearray(size)
+            tile_pattern(memoryview(buf), pattern)
+            tile = _tiles[pattern] = memoryview(buf).toreadonly()
+        return tile
+
+
+def _random_buffer(size):
+    """This thread's scratch buffer for random passes, grown to `size`."""
+    buf = getattr(_scratch, "buf", None)
+    if buf is None or len(buf) < size:
+        buf = _scratch.buf = memoryview(bytearray(size))
+    return buf
+
+
+def _open_dir(directory):
+    if not _DIR_FD:
+        return None
+    flags = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_CLOEXEC", 0)
+    return os.open(directory or ".", flags)
+
+
+def wipe_small_files(batch, patterns, delete=True, durability="pass", verify=None,
+                     random_source=None, limit=SMALL_FILE_LIMIT, verify_passes=(),
+                     io_mode=BUFFERED, governor=None):
+    """
+    Wipe a batch of small files from one directory with as few syscalls as
+    possible: open relative to the directory fd (O_NOFOLLOW), fstat, one
+    pwrite per pass, the syncs the durability policy asks for, an optional
+    pread read-back (after the last pass, and after each of `verify_passes`),
+    and unlink by directory fd. No path is resolved twice. Outside BUFFERED
+    `io_mode`, kept files are dropped from the page cache once written
+    (a few KiB are not worth O_DIRECT's alignment rules). A `governor`
+    (IOGovernor) paces every pwrite and pread.
+
+    Yields (job, wiped, stats) per file, as soon as each file is done.
+    """
+    if random_source is None and None in patterns:
+        random_source = default_source()
+    # Constant patterns come tiled from a shared cache, random data goes
+    # into a per-thread buffer: nothing is allocated per batch
+    constants = {pattern: _tiled(pattern, limit) for pattern in patterns if pattern is not None}
+    random_buf = _random_buffer(limit) if None in patterns else None
+    dir_fd = _open_dir(batch["dir"])
+    try:
+        for job in batch["jobs"]:
+            stats = {}
+            try:
+                _wipe_one(job, dir_fd, patterns, constants, random_buf, random_source,
+                          delete, durability, verify, verify_passes, limit, stats,
+                          drop=io_mode != BUFFERED, governor=governor)
+                wiped = stats.get("verified") is not False
+                if not wiped:
+                    print(f"❌ Verification failed for {job['path']}")
+            except OSError as e:
+                print(f"❌ Failed to wipe {job['path']}: {e}")
+                wiped = False
+            yield job, wiped, stats
+    finally:
+        if dir_fd is not None:
+            os.close(dir_fd)
+
+
+def _wipe_one(job, dir_fd, patterns, constants, random_buf, random_source,
+              delete, durability, verify, verify_passes, limit, stats, drop=False, governor=None):
+    name = os.path.basename(job["path"]) if dir_fd is not None else job["path"]
+    fd = os.open(name, _OPEN_FLAGS, dir_fd=dir_fd)
+    syncs = 0
+    sync_latencies = []
+    pass_times = []
+    try:
+        st = os.fstat(fd)
+        if not stat.S_ISREG(st.st_mode):
+            raise OSError(f"{job['path']} is not a regular file")
+        if (st.st_dev, st.st_ino) != (job["dev"], job["ino"]):
+            raise OSError(f"{job['path']} changed since it was scanned")
+        size = st.st_size
+        if size > limit:
+            raise OSError(f"{job['path']} grew past the small-file limit")
+        view = None
+        for i, pattern in enumerate(patterns):
+            start = time.perf_counter()
+            if pattern is None:
+                view = random_buf[:size]
+                random_source.fill(view)
+            else:
+                view = constants[pattern][:size]
+            if governor is not None and size:
+                governor.throttle(size, waits=stats)
+            if size and os.pwrite(fd, view, 0) != size:
+                raise OSError(f"Short write on {job['path']}")
+            last = i == len(patterns) - 1
+            if size and (durability not in (NONE, FINAL) or (durability == FINAL and last)):
+                sync_start = time.perf_counter()
+                datasync(fd)
+                sync_latencies.append(time.perf_counter() - sync_start)
+                syncs += 1
+            pass_times.append(time.perf_counter() - start)
+            if size and (i in verify_passes or (verify and last)):
+                if durability != NONE:
+                    drop_cache(fd)
+                if governor is not None:
+                    governor.throttle(size, waits=stats)
+                start = time.perf_counter()
+                stats["verified"] = os.pread(fd, size, 0) == view
+                elapsed = time.perf_counter() - start
+                stats["bytes_checked"] = stats.get("bytes_checked", 0) + size
+                stats["verify_time"] = stats.get("verify_time", 0.0) + elapsed
+                stats["verify_rate"] = size / elapsed if elapsed > 0 else 0.0
+                if not stats["verified"]:
+                    break
+        if drop and not delete:
+            # Deleted files leave the cache with their inode; kept ones are dropped here
+            dontneed(fd)
+    finally:
+        os.close(fd)
+    stats["bytes_written"] = size * len(pass_times)
+    stats["pwrite_calls"] = len(pass_times) if size else 0
+    stats["syncs"] = syncs
+    stats["sync_latencies"] = sync_latencies
+    stats["sync_time"] = sum(sync_latencies)
+    stats["pass_times"] = pass_times
+    if delete and stats.get("verified") is not False:
+        os.unlink(name, dir_fd=dir_fd)
@@ -0,0 +1,74 @@
+# wipeEngine/stateDir.py
+import itertools
+import os
+import time
+
+APP_NAME = "secure_wipe"
+# Run journals kept in <state dir>/journals; older ones are removed
+KEEP_JOURNALS = 20
+
+_runs = itertools.count()
+
+
+def state_dir():
+    """
+    Per-user directory for run state (journals, checkpoint, classification
+    cache), created on first use: $SECURE_WIPE_STATE_DIR, else
+    $XDG_STATE_HOME/secure_wipe (~/.local/state/secure_wipe), or
+    %LOCALAPPDATA%\\secure_wipe on Windows.
+    """
+    base = os.environ.get("SECURE_WIPE_STATE_DIR")
+    if not base:
+        if os.name == "nt":
+            root = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        else:
+            root = os.environ.get("XDG_STATE_HOME") or os.path.join(os.path.expanduser("~"), ".local", "state")
+        base = os.path.join(root, APP_NAME)
+    os.makedirs(base, exist_ok=True)
+    return base
+
+
+def state_path(name):
+    """Path of a state file (e.g. the checkpoint) inside state_dir()."""
+    return os.path.join(state_dir(), name)
+
+
+def new_run_id():
+    """
+    Sortable id for one wipe run: start time, pid and a per-process
+    counter, zero-padded so names sort in start order.
+    """
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid():07d}-{next(_runs):06d}"
+
+
+def _journal_pid(name):
+    """pid field of a wipe-<time>-<pid>-<n>.jsonl name, or None."""
+    parts = name.split("-")
+    return int(parts[3]) if len(parts) == 5 and parts[3].isdigit() else None
+
+
+def run_journal_path(run_id, keep=KEEP_JOURNALS):
+    """
+    Journal file for a run. Only the `keep` most recently written run
+    journals are kept; journals of this process (runs still writing, or
+    backing a returned JournalView) are never removed.
+    """
+    folder = os.path.join(state_dir(), "journals")
+    os.makedirs(folder, exist_ok=True)
+    old = []
+    for entry in os.scandir(folder):
+        if entry.name.startswith("wipe-") and entry.name.endswith(".jsonl"):
+            try:
+                old.append((entry.stat().st_mtime, entry.name))
+            except OSError:
+                continue
+    old.sort()
+    pid = os.getpid()
+    for _, name in old[:max(0, len(old) - keep + 1)]:
+        if _journal_pid(name) == pid:
+            continue
+        try:
+            os.remove(os.path.join(folder, name))
+        except OSError:
+            pass
+    return os.path.join(folder, f"wipe-{run_id}.jsonl")
@@ -1,59 +1,294 @@
+import math
 import os
+import time
+from wipeEngine.bufferPool import get_pool
+from wipeEngine.directIO import ALIGNMENT, BUFFERED, DIRECT, DONTNEED, DirectIO
+from wipeEngine.pipeline import pipelined_pass
+from wipeEngine.durability import FINAL, NONE, PER_PASS, Syncer
+from wipeEngine.extents import EXTENTS, FULL, data_extents
+from wipeEngine.randomSource import default_source
+from wipeEngine.schemes import DOD_5220_22_M, GUTMANN, compile_scheme
+from wipeEngine.verify import FULL as FULL_READ_BACK, ChunkChecksums, drop_cache, verify_fd
 
-def zero_fill(file_path, passes=1, delete=True, chunk_size=1024*1024):
-    """Overwrite file with zeros safely in chunks"""
+ZERO = b"\x00"
+RANDOM = None   # pass pattern meaning "fresh random data"
+
+def _pwrite(fd, view, offset):
+    """os.pwrite with a seek+write fallback for platforms without it."""
+    if hasattr(os, "pwrite"):
+        return os.pwrite(fd, view, offset)
+    os.lseek(fd, offset, os.SEEK_SET)
+    return os.write(fd, view)
+
+def _clip(ranges, start, end):
+    """The parts of sorted (start, end) ranges that fall inside [start, end)."""
+    return [(max(a, start), min(b, end)) for a, b in ranges if b > start and a < end]
+
+def _write_chunk(fd, chunk, offset, syncer=None, direct=None, governor=None, waits=None):
+    """
+    pwrite a whole chunk (retrying short writes) and tell the syncer;
+    returns the call count. With `direct` (a DirectIO) the write bypasses
+    the page cache when it is aligned; a `governor` (IOGovernor) is asked
+    for budget before every call and its waits are added to `waits`.
+    Each call is cut to the governor's current chunk_cap(), so a limit
+    lowered mid-pass takes effect at the next write, not the next file.
+    """
+    written = 0
+    calls = 0
+    while written < len(chunk):
+        piece = chunk[written:] if written else chunk
+        if governor is not None:
+            piece = piece[:governor.chunk_cap(len(piece))]
+            governor.throttle(len(piece), waits=waits)
+        if direct is not None:
+            written += direct.pwrite(piece, offset + written)
+        else:
+            written += _pwrite(fd, piece, offset + written)
+        calls += 1
+    if syncer is not None:
+        syncer.wrote(offset, written)
+    return calls
+
+def _chunk_layout(pattern, start, chunk_size, align=1):
+    """
+    (fill pattern, chunk length) for a pass region starting at `start`.
+    A multi-byte pattern is rotated to the phase of `start` and the length
+    is a multiple of its period, so the pattern runs on unbroken across
+    chunks while every buffer still starts at its (page-aligned) beginning.
+    With `align` (O_DIRECT) the length is also a multiple of that.
+    """
+    period = len(pattern) if pattern else 1
+    unit = math.lcm(period, align)
+    if chunk_size >= unit:
+        length = chunk_size // unit * unit
+    else:
+        length = max(period, chunk_size // period * period)
+    if period == 1:
+        return pattern, length
+    phase = start % period
+    return pattern[phase:] + pattern[:phase], length
+
+def _write_pass(fd, size, view, random_source=None, syncer=None, checksums=None, start=0,
+                direct=None, governor=None, waits=None):
+    """
+    Write len(view)-sized chunks over [start, size) (one pass or one extent).
+    The full-chunk and tail views are sliced once, so the loop itself does
+    not allocate; with a random_source each chunk is refilled in place.
+    `checksums` (ChunkChecksums) records each chunk for later verification.
+    Returns the number of pwrite calls.
+    """
+    chunk_size = len(view)
+    tail = view[:(size - start) % chunk_size]
+    offset = start
+    calls = 0
+    while offset < size:
+        chunk = view if size - offset >= chunk_size else tail
+        if random_source is not None:
+            random_source.fill(chunk)
+        if checksums is not None:
+            checksums.add(offset, chunk)
+        calls += _write_chunk(fd, chunk, offset, syncer, direct, governor, waits)
+        offset += len(chunk)
+    tail.release()
+    return calls
+
+def _run_passes(file_path, patterns, label, delete=True, chunk_size=1024*1024,
+                random_source=None, durability=PER_PASS, identity=None,
+                verify=None, verify_percent=10, start_pass=0, start_offset=0,
+                progress=None, queue_depth=1, extent_policy=FULL, stats=None, verbose=True,
+                verify_passes=(), io_mode=BUFFERED, governor=None):
+    """
+    Open the file once and run every pass through the same descriptor.
+    `patterns` holds one entry per pass: constant bytes (one byte or a
+    repeating pattern), or RANDOM.
+    With `identity` = (st_dev, st_ino) from a scan, a file that was replaced
+    since the scan is refused instead of overwritten.
+    The durability policy decides how each pass is synced; timings, byte
+    and syscall counts go into the optional `stats` dict for the report and
+    wipeEngine.metrics. `verbose`=False drops the per-pass console lines.
+    With `verify` (a wipeEngine.verify mode) the last pass is read back
+    before the file is deleted; a mismatch fails the wipe. Passes listed
+    in `verify_passes` (a compiled scheme's "verify" steps) are read back
+    right after they are written, in `verify` mode or else in full.
+    `progress(pass_index, offset)` is told each time a pass becomes durable
+    up to an offset; `start_pass`/`start_offset` resume from such a point.
+    With `queue_depth` > 1, random passes longer than a chunk generate the
+    next buffers while the previous ones are written (see pipeline.py).
+    With `extent_policy` = EXTENTS only the allocated data ranges are
+    overwritten, so sparse and preallocated files keep their holes.
+    `io_mode` (see wipeEngine/directIO.py) keeps the passes out of the
+    page cache: DIRECT writes aligned chunks with O_DIRECT, falling back
+    to DONTNEED (drop each synced range) where the filesystem refuses it.
+    A shared `governor` (wipeEngine.governor.IOGovernor) paces every write
+    and read-back chunk to its bytes/s and ops/s budget.
+    """
     if not os.path.isfile(file_path):
         print(f"❌ File not found: {file_path}")
         return False
+    if random_source is None and RANDOM in patterns:
+        random_source = default_source()
+    pool = get_pool(chunk_size)
+    passes = len(patterns)
     try:
-        size = os.path.getsize(file_path)
-        for i in range(passes):
-            with open(file_path, "r+b") as f:
-                f.seek(0)
-                written = 0
-                while written < size:
-                    write_size = min(chunk_size, size - written)
-                    f.write(b"\x00" * write_size)
-                    written += write_size
-            print(f"✅ Zero fill pass {i+1}/{passes} completed for {file_path}")
+        fd = os.open(file_path, os.O_RDWR | getattr(os, "O_BINARY", 0))
+        try:
+            st = os.fstat(fd)
+            if identity is not None and (st.st_dev, st.st_ino) != tuple(identity):
+                raise OSError(f"{file_path} changed since it was scanned")
+            size = st.st_size
+            ranges = data_extents(fd, size) if extent_policy == EXTENTS else [(0, size)]
+            start_offset = min(start_offset, size)
+            if start_offset and start_pass < passes and patterns[start_pass] is not RANDOM:
+                # Re-check the part of the interrupted pass the journal calls durable
+                durable = _clip(ranges, 0, start_offset)
+                if not verify_fd(fd, start_offset, patterns[start_pass], chunk_size=chunk_size,
+                                 ranges=durable, governor=governor)["verified"]:
+                    start_offset = 0
+            direct = DirectIO.enable(fd) if io_mode == DIRECT else None
+            mode = DIRECT if direct is not None else (BUFFERED if io_mode == BUFFERED else DONTNEED)
+            align = ALIGNMENT if direct is not None else 1
+            current = [start_pass]
+            on_durable = (lambda offset: progress(current[0], offset)) if progress else None
+            syncer = Syncer(fd, durability, on_durable=on_durable, drop_cache=mode != BUFFERED)
+            checksums = None
+            written = 0
+            calls = [0]
+            waits = {}
+            pass_times = []
+
+            def write_chunk(chunk, offset):
+                calls[0] += _write_chunk(fd, chunk, offset, syncer, direct, governor, waits)
+
+            result = None
+
+            def read_back(pattern):
+                if durability != NONE:
+                    drop_cache(fd)
+                checked = verify_fd(fd, size, pattern, mode=verify or FULL_READ_BACK,
+                                    percent=verify_percent, chunk_size=chunk_size,
+                                    checksums=checksums, ranges=ranges, governor=governor)
+                if mode != BUFFERED:
+                    drop_cache(fd)   # the mmap read-back must not leave the file cached
+                return checked
+
+            for i in range(start_pass, passes):
+                pass_start = time.perf_counter()
+                pattern = patterns[i]
+                current[0] = i
+                last = i == passes - 1
+                check = i in verify_passes or (verify and last)
+                checksums = ChunkChecksums() if check and pattern is RANDOM else None
+                begin = start_offset if i == start_pass else 0
+                for start, end in _clip(ranges, begin, size):
+                    fill, length = _chunk_layout(pattern, start, chunk_size, align)
+                    if pattern is RANDOM and queue_depth > 1 and end - start > length:
+                        pipelined_pass(end, pool, length, random_source, write_chunk,
+                                       depth=queue_depth, start=start,
+                                       checksums=checksums, waits=waits)
+                    else:
+                        with pool.buffer(fill) as buf:
+                            view = buf[:length]
+                            source = random_source if pattern is RANDOM else None
+                            calls[0] += _write_pass(fd, end, view, source, syncer,
+                                                    checksums, start=start, direct=direct,
+                                                    governor=governor, waits=waits)
+                            view.release()
+                    written += end - start
+                syncer.end_pass()
+                if progress and durability != NONE and (durability != FINAL or last):
+                    progress(i + 1, 0)
+                pass_times.append(time.perf_counter() - pass_start)
+                if verbose:
+                    print(f"✅ {label} pass {i+1}/{passes} completed for {file_path}")
+                if check and not last:
+                    result = read_back(pattern)
+                    if not result["verified"]:
+                        break
+            syncer.finish()
+            if direct is not None:
+                direct.disable()
+
+            if passes and (verify or passes - 1 in verify_passes) \
+                    and (result is None or result["verified"]):
+                result = read_back(patterns[-1])
+        finally:
+            os.close(fd)
+        if stats is not None:
+            stats["bytes_written"] = written
+            stats["sync_time"] = syncer.sync_time
+            stats["syncs"] = syncer.syncs
+            stats["sync_latencies"] = syncer.latencies
+            stats["pwrite_calls"] = calls[0]
+            stats["pass_times"] = pass_times
+            stats["buffer_wait"] = waits.get("buffer_wait", 0.0)
+            stats["throttle_wait"] = waits.get("throttle_wait", 0.0)
+            stats["io_mode"] = mode
+            if direct is not None:
+                stats["unaligned_bytes"] = direct.unaligned_bytes
+            if result is not None:
+                stats.update(result)
+        if result is not None and not result["verified"]:
+            print(f"❌ Verification failed for {file_path}")
+            return False
         if delete:
             os.remove(file_path)
-            print(f"🗑️ File deleted: {file_path}")
+            if verbose:
+                print(f"🗑️ File deleted: {file_path}")
         return True
     except Exception as e:
-        print(f"❌ Failed zero fill {file_path}: {e}")
+        print(f"❌ Failed {label.lower()} {file_path}: {e}")
         return False
 
-def random_fill(file_path, passes=3, delete=True, chunk_size=1024*1024):
+def zero_fill(file_path, passes=1, delete=True, chunk_size=1024*1024, **options):
+    """Overwrite file with zeros safely in chunks"""
+    return _run_passes(file_path, [ZERO] * passes, "Zero fill", delete=delete,
+                       chunk_size=chunk_size, **options)
+
+def random_fill(file_path, passes=3, delete=True, chunk_size=1024*1024, random_source=None,
+                **options):
     """Overwrite file with random bytes safely in chunks"""
-    if not os.path.isfile(file_path):
-        print(f"❌ File not found: {file_path}")
-        return False
-    try:
-        size = os.path.getsize(file_path)
-        for i in range(passes):
-            with open(file_path, "r+b") as f:
-                f.seek(0)
-                written = 0
-                while written < size:
-                    write_size = min(chunk_size, size - written)
-                    f.write(os.urandom(write_size))
-                    written += write_size
-            print(f"✅ Random fill pass {i+1}/{passes} completed for {file_path}")
-        if delete:
-            os.remove(file_path)
-            print(f"🗑️ File deleted: {file_path}")
-        return True
-    except Exception as e:
-        print(f"❌ Failed random fill {file_path}: {e}")
-        return False
+    return _run_passes(file_path, [RANDOM] * passes, "Random fill", delete=delete,
+                       chunk_size=chunk_size, random_source=random_source, **options)
+
+def scheme_strategy(label, steps):
+    """
+    Compile a declarative pass list (see wipeEngine/schemes.py) into a
+    strategy function. The pass count is fixed by the scheme, so `passes`
+    is ignored; `patterns` and `verify_passes` are exposed on the function.
+    """
+    patterns, verify_passes = compile_scheme(steps)
+
+    def strategy(file_path, delete=True, chunk_size=1024*1024, passes=None, **options):
+        return _run_passes(file_path, patterns, label, delete=delete, chunk_size=chunk_size,
+                           verify_passes=verify_passes, **options)
+
+    strategy.patterns = patterns
+    strategy.verify_passes = verify_passes
+    strategy.__doc__ = f"{label}: {len(patterns)} passes"
+    return strategy
 
-def doD_wipe(file_path, delete=True):
-    """3-pass DoD style overwrite"""
-    return random_fill(file_path, passes=3, delete=delete)
+doD_wipe = scheme_strategy("DoD 5220.22-M", DOD_5220_22_M)
+gutmann_wipe = scheme_strategy("Gutmann", GUTMANN)
+
+def pass_patterns(strategy_func, passes):
+    """The per-pass patterns a built-in or compiled strategy writes, or None for custom ones."""
+    if strategy_func is zero_fill:
+        return [ZERO] * passes
+    if strategy_func is random_fill:
+        return [RANDOM] * passes
+    return getattr(strategy_func, "patterns", None)
 
 AVAILABLE_STRATEGIES = {
     "1": ("Zero Fill", zero_fill),
     "2": ("Random Fill", random_fill),
-    "3": ("DoD Wipe (3-pass)", doD_wipe)
+    "3": ("DoD 5220.22-M (0x00, 0xFF, random, verify)", doD_wipe),
+    "4": ("Gutmann (35-pass)", gutmann_wipe)
 }
+
+CUSTOM_KEY = "5"
+
+def register_custom(steps, key=CUSTOM_KEY):
+    """Add a scheme from the config ("custom_scheme") to AVAILABLE_STRATEGIES."""
+    func = scheme_strategy("Custom", steps)
+    AVAILABLE_STRATEGIES[key] = (f"Custom ({len(func.patterns)}-pass)", func)
+    return func
@@ -0,0 +1,155 @@
+# wipeEngine/verify.py
+import mmap
+import os
+import random
+import time
+import zlib
+from array import array
+
+# Verification modes
+FULL = "full"          # read back every byte
+SAMPLED = "sampled"    # read back a percentage of the chunks
+TAIL = "tail"          # read back only the last chunk
+MODES = (FULL, SAMPLED, TAIL)
+
+_np = False    # numpy module once loaded, None if unavailable
+
+
+def _numpy():
+    """Import numpy on first use (keeps engine import time low)."""
+    global _np
+    if _np is False:
+        try:
+            import numpy
+            _np = numpy
+        except ImportError:
+            _np = None
+    return _np
+
+
+class ChunkChecksums:
+    """CRC32 of every chunk written by the last (random) pass."""
+
+    def __init__(self):
+        self.offsets = array("Q")
+        self.lengths = array("I")
+        self.crcs = array("I")
+
+    def add(self, offset, view):
+        self.offsets.append(offset)
+        self.lengths.append(len(view))
+        self.crcs.append(zlib.crc32(view))
+
+    def __len__(self):
+        return len(self.offsets)
+
+
+def _constant_ok(chunk, byte):
+    """True if every byte of chunk equals `byte` (vectorised)."""
+    np = _numpy()
+    if np is not None:
+        arr = np.frombuffer(chunk, dtype=np.uint8)
+        return not np.count_nonzero(arr if byte == 0 else arr != byte)
+    return bytes(chunk).count(byte) == len(chunk)
+
+
+def _pick(count, mode, percent, seed):
+    """Indices of the chunks to check for a mode."""
+    if count == 0:
+        return []
+    if mode == FULL:
+        return range(count)
+    if mode == TAIL:
+        return [count - 1]
+    k = max(1, min(count, round(count * percent / 100)))
+    return sorted(random.Random(seed).sample(range(count), k))
+
+
+def _chunks(ranges, chunk_size):
+    """(offset, length) of every chunk_size piece of the (start, end) ranges."""
+    for start, end in ranges:
+        for offset in range(start, end, chunk_size):
+            yield offset, min(chunk_size, end - offset)
+
+
+def verify_fd(fd, size, expected, mode=FULL, percent=10, chunk_size=1024*1024, checksums=None,
+              ranges=None, governor=None):
+    """
+    Read the file back through mmap and compare it with the last pass.
+    `expected` is the constant pattern (bytes) of that pass, or None for a
+    random pass, in which case `checksums` (ChunkChecksums) is compared.
+    `ranges` limits a constant check to the (start, end) extents written.
+    A `governor` (IOGovernor) paces the reads like the writes.
+    Returns {"verified", "bytes_checked", "verify_time", "verify_rate"}.
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown verification mode: {mode}")
+    start = time.perf_counter()
+    checked = 0
+    ok = True
+    if size:
+        mm = mmap.mmap(fd, size, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        try:
+            if expected is None:
+                if checksums is None:
+                    raise ValueError("Random passes need chunk checksums to verify")
+                for k in _pick(len(checksums), mode, percent, size):
+                    offset, length = checksums.offsets[k], checksums.lengths[k]
+                    if governor is not None:
+                        governor.throttle(length)
+                    chunk = view[offset:offset + length]
+                    ok = zlib.crc32(chunk) == checksums.crcs[k]
+                    chunk.release()
+                    checked += length
+                    if not ok:
+                        break
+            else:
+                expected = bytes(expected)
+                period = len(expected)
+                if period > 1:
+                    # Reference long enough for any chunk at any pattern phase
+                    reps = (chunk_size + period) // period + 1
+                    reference = memoryview(expected * reps)
+                if ranges is None:
+                    ranges = [(0, size)]
+                count = sum(-(-(end - start) // chunk_size) for start, end in ranges)
+                wanted = iter(_pick(count, mode, percent, size))
+                k = next(wanted, None)
+                for index, (offset, length) in enumerate(_chunks(ranges, chunk_size)):
+                    if k is None:
+                        break
+                    if index != k:
+                        continue
+                    k = next(wanted, None)
+                    if governor is not None:
+                        governor.throttle(length)
+                    chunk = view[offset:offset + length]
+                    if period == 1:
+                        ok = _constant_ok(chunk, expected[0])
+                    else:
+                        phase = offset % period
+                        ok = chunk == reference[phase:phase + len(chunk)]
+                    checked += len(chunk)
+                    chunk.release()
+                    if not ok:
+                        break
+        finally:
+            view.release()
+            mm.close()
+    elapsed = time.perf_counter() - start
+    return {
+        "verified": ok,
+        "bytes_checked": checked,
+        "verify_time": elapsed,
+        "verify_rate": checked / elapsed if elapsed > 0 else 0.0
+    }
+
+
+def drop_cache(fd):
+    """Ask the kernel to drop cached pages so the read-back hits the device."""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except OSError:
+            pass
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Run the wipe daemon or talk to it.
+
+    python wipectl.py serve
+    python wipectl.py submit /path/to/data --strategy 2 --passes 3 --priority 5 --delete --wait
+    python wipectl.py status 3 | list | cancel 3 | wait 3 | shutdown   # cancel also stops a running job
+    python wipectl.py throttle --bytes-per-sec 20M        # while jobs run
+"""
+import argparse
+import json
+import sys
+from configManager.configManager import ConfigManager
+from wipeEngine.daemon import JOB_OPTIONS, RPCError, WipeClient, WipeDaemon
+from wipeEngine.governor import IOGovernor
+from wipeEngine.strategies import register_custom
+
+# ------------------- Helpers -------------------
+def print_event(event):
+    """One console line per progress event"""
+    kind = event["event"]
+    if kind == "file":
+        mark = "✅" if event["wiped"] else "❌"
+        print(f"{mark} [{event['job_id']}] {event['path']} ({event['files_done']} files, "
+              f"{event['bytes_written'] / 1e6:.1f} MB written)")
+    elif kind == "scanned":
+        print(f"📊 [{event['job_id']}] {event['files_total']} files, {event['bytes_total']} bytes")
+    else:
+        print(f"ℹ️ [{event['job_id']}] {event['state']}" + (f": {event['error']}" if event.get("error") else ""))
+
+def serve(cfg, args):
+    if cfg.get_option("custom_scheme"):
+        register_custom(cfg.get_option("custom_scheme"))
+    defaults = {key: cfg.get_option(key) for key in JOB_OPTIONS if key != "delete"}
+    defaults = {key: value for key, value in defaults.items() if value is not None}
+    daemon = WipeDaemon(
+        socket_path=args.socket or cfg.get_option("daemon_socket"),
+        workers=cfg.get_option("workers"),
+        per_device_workers=cfg.get_option("per_device_workers"),
+        defaults=defaults,
+        device_profiles=dict(cfg.get_option("device_profiles") or {}),
+        governor=IOGovernor(cfg.get_option("max_bytes_per_sec"), cfg.get_option("max_ops_per_sec"),
+                            cfg.get_option("io_windows"), cfg.get_option("ioprio"))
+    )
+    daemon.serve_forever()
+
+# ------------------- Main Execution -------------------
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--socket", help="daemon socket path")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("serve", help="run the daemon in the foreground")
+    submit = commands.add_parser("submit", help="queue a wipe job")
+    submit.add_argument("path")
+    submit.add_argument("--strategy", default="1", help="strategy key (see index.py)")
+    submit.add_argument("--passes", type=int, default=3)
+    submit.add_argument("--priority", type=int, default=0, help="higher runs first")
+    submit.add_argument("--delete", action="store_true", help="remove files after wiping (default: keep)")
+    submit.add_argument("--verify", choices=["full", "sampled", "tail"])
+    submit.add_argument("--io-mode", choices=["buffered", "direct", "dontneed"],
+                        help="page cache handling (see wipeEngine/directIO.py)")
+    submit.add_argument("--symlink-policy", choices=["skip", "unlink", "follow"],
+                        help="symlinks inside the tree (default: the daemon's config)")
+    submit.add_argument("--wait", action="store_true", help="stream progress until the job ends")
+    for name in ("status", "cancel", "wait"):
+        commands.add_parser(name).add_argument("job_id", type=int)
+    commands.add_parser("list")
+    throttle = commands.add_parser("throttle", help="show or change the I/O budget of running jobs")
+    throttle.add_argument("--bytes-per-sec", help='e.g. 50M, or "none" for unlimited')
+    throttle.add_argument("--ops-per-sec", help='e.g. 500, or "none" for unlimited')
+    commands.add_parser("shutdown")
+    args = parser.parse_args()
+
+    cfg = ConfigManager()
+    if args.command == "serve":
+        serve(cfg, args)
+        return 0
+
+    with WipeClient(args.socket or cfg.get_option("daemon_socket")) as client:
+        try:
+            if args.command == "submit":
+                options = {"delete": args.delete}
+                if args.verify:
+                    options["verify"] = args.verify
+                if args.io_mode:
+                    options["io_mode"] = args.io_mode
+                if args.symlink_policy:
+                    options["symlink_policy"] = args.symlink_policy
+                job = client.submit(args.path, args.strategy, args.passes, args.priority, **options)
+                print(f"📥 Job {job['job_id']} queued for {job['path']}")
+                if not args.wait:
+                    return 0
+                job = client.wait(job["job_id"], on_event=print_event)
+            elif args.command == "wait":
+                job = client.wait(args.job_id, on_event=print_event)
+            elif args.command in ("status", "cancel"):
+                job = client.call(args.command, job_id=args.job_id)
+            elif args.command == "throttle":
+                limits = {key: value for key, value in (("bytes_per_sec", args.bytes_per_sec),
+                                                        ("ops_per_sec", args.ops_per_sec))
+                          if value is not None}
+                job = client.call("throttle", **limits)
+            else:
+                job = client.call(args.command)
+        except RPCError as e:
+            print(f"❌ {e}")
+            return 1
+    print(json.dumps(job, indent=2))
+    return 0 if not isinstance(job, dict) or job.get("state") != "failed" else 1
+
+if __name__ == "__main__":
+    sys.exit(main())